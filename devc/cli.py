@@ -22,17 +22,19 @@ import builtins
 import functools
 import signal
 import sys
-from typing import cast
+from typing import cast, TYPE_CHECKING
 
-from devc_cli_plugin_system.command import add_subparsers_on_demand
-from devc_cli_plugin_system.command import CommandExtension
-from devc_cli_plugin_system.interactive_creation.interactive_creation import user_selected_extension
+from devc_cli_plugin_system.completion_cache import complete_from_cache
+from devc_cli_plugin_system.completion_cache import is_completion_requested
+from devc_cli_plugin_system.completion_cache import update_completion_cache
 from devc.utils.console import print_error, print_signal
+from devc.utils.forwarding import is_forwarding_enabled
 from devc.utils.logging import setup_logging
+from devc.utils.profiling import enable_profiling, PROFILE_FORMATS, span
 from devc_cli_plugin_system.constants import PLUGIN_SYSTEM_CONSTANTS, EXTENSION_GROUPS
-from devc.utils.interaction_providers.questionary_interaction_provider import (
-    QuestionaryInteractionProvider,
-)
+
+if TYPE_CHECKING:
+    from devc_cli_plugin_system.command import CommandExtension
 
 
 def main(
@@ -40,9 +42,34 @@ def main(
     script_name: str = "devc",
     argv: list[str] | None = None,
     description: str | None = None,
-    extension: CommandExtension | None = None,
+    extension: "CommandExtension | None" = None,
 ) -> int:
     """Entry point for the dev-json command line tool."""
+    if extension is None:
+        # answer shell completion without loading any plugin if the argument tree is cached,
+        # does not return in that case
+        complete_from_cache(script_name, exclude=["-h", "--help"])
+
+    if extension is None and argv is None and is_forwarding_enabled(sys.argv[1:]):
+        # run by a warm `devc serve` daemon if one is running, the daemon calls main with argv
+        from devc.core.serve_client import forward_to_server
+
+        rc = forward_to_server(sys.argv[1:])
+        if rc is not None:
+            return rc
+
+    # the plugin system is imported after the completion fast path on purpose
+    from devc_cli_plugin_system.command import add_subparsers_on_demand
+    from devc_cli_plugin_system.interactive_creation.interactive_creation import (
+        user_selected_extension,
+    )
+
+    # profiling has to be enabled before any plugin is loaded, so look for the flag up front
+    profile_parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    _add_profile_arguments(profile_parser)
+    profile_args, _ = profile_parser.parse_known_args(args=argv)
+    profiler = enable_profiling() if profile_args.profile else None
+
     # setup the logger once globally
     logger = setup_logging()
     if description is None:
@@ -72,22 +99,24 @@ def main(
         default="INFO",
         help="Set logging verbosity",
     )
+    _add_profile_arguments(parser)
 
     # add arguments for command extension(s)
     if extension:
         extension.add_arguments(parser, script_name)
     else:
         # get command entry points as needed
-        subparser = add_subparsers_on_demand(
-            parser,
-            script_name,
-            PLUGIN_SYSTEM_CONSTANTS.COMMAND_IDENTIFIER,
-            EXTENSION_GROUPS.COMMAND_GROUP,
-            # hide the special commands in the help
-            hide_extensions=["extension_points", "extensions"],
-            required=False,
-            argv=argv,
-        )
+        with span("setup parser"):
+            subparser = add_subparsers_on_demand(
+                parser,
+                script_name,
+                PLUGIN_SYSTEM_CONSTANTS.COMMAND_IDENTIFIER,
+                EXTENSION_GROUPS.COMMAND_GROUP,
+                # hide the special commands in the help
+                hide_extensions=["extension_points", "extensions"],
+                required=False,
+                argv=argv,
+            )
 
     # register argcomplete hook if available
     try:
@@ -96,10 +125,13 @@ def main(
         logger.debug(f"Argcomplete could not be imported. Error when importing: {e}")
         pass
     else:
+        if extension is None and is_completion_requested():
+            update_completion_cache(script_name, parser)
         autocomplete(parser, exclude=["-h", "--help"])
 
     # parse the command line arguments
-    args = parser.parse_args(args=argv)
+    with span("parse"):
+        args = parser.parse_args(args=argv)
     if args.log_level:
         logger.setLevel(args.log_level)
 
@@ -126,6 +158,11 @@ def main(
         # handle the case that no command was passed, interactively let the user select commands,
         # plugins, extensions and options
         if extension is None:
+            # questionary pulls in prompt_toolkit, only import it when prompting
+            from devc.utils.interaction_providers.questionary_interaction_provider import (
+                QuestionaryInteractionProvider,
+            )
+
             user_extension, argv = user_selected_extension(
                 parser,
                 subparser,
@@ -138,20 +175,45 @@ def main(
                 return 0
             args = parser.parse_args(argv)
             # TODO(Manuel) we have to clean the user_selected_extension up...
-            extension = cast(CommandExtension, user_extension)
+            extension = cast("CommandExtension", user_extension)
             logger.debug(f"selected extension {extension.NAME}({extension}) with args: {args}")
 
         # call the main method of the extension
-        rc = extension.main(parser=parser, args=args)
+        with span(f"command {extension.NAME}"):
+            rc = extension.main(parser=parser, args=args)
     except KeyboardInterrupt:
         print_signal(title="Signal Received", message="Execution interrupted by the user.")
         rc = signal.SIGINT
     except RuntimeError as e:
         print_error(title="Runtime Error", message=str(e))
         rc = 1
+    finally:
+        if profiler is not None:
+            profiler.report(profile_args.profile_format, profile_args.profile_output)
     return rc
 
 
+def _add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Record the time and allocated memory blocks of each phase and print a report.",
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=PROFILE_FORMATS,
+        default="table",
+        help="Format of the profile report, 'trace' is the Chrome trace event format.",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default=None,
+        metavar="FILE",
+        help="Write the profile report to FILE instead of stderr.",
+    )
+
+
 # entrypoint for the debugger
 if __name__ == "__main__":
     sys.exit(main(script_name="devc"))
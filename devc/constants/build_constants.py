@@ -0,0 +1,27 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+from typing import ClassVar
+
+
+@dataclass(frozen=True)
+class BUILD_CONSTANTS:
+
+    # Backends of devc build and prebuild, auto selects buildx if the docker CLI provides it
+    BACKENDS: ClassVar[tuple[str, ...]] = ("auto", "sdk", "buildx")
+    # Repository the images of devc prebuild are tagged in
+    PREBUILD_REPOSITORY: ClassVar[str] = "devc-prebuilt"
+    # How the devcontainer.json references the prebuilt image
+    PREBUILD_REFERENCES: ClassVar[tuple[str, ...]] = ("cache-from", "image")
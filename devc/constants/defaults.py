@@ -21,3 +21,31 @@ class DEFAULT_IMAGES:
 
     # Default Ubuntu image
     UBUNTU: ClassVar[str] = "ubuntu:24.04"
+
+
+@dataclass(frozen=True)
+class DEFAULT_APT_PACKAGES:
+
+    # Packages installed into every generated Dockerfile, the stable core of the package layer
+    BASE: ClassVar[tuple[str, ...]] = (
+        "bash-completion",
+        "curl",
+        "git",
+        "lsb-release",
+        "sudo",
+        "trash-cli",
+        "tree",
+        "vim",
+        "wget",
+    )
+
+
+@dataclass(frozen=True)
+class DEFAULT_CCACHE:
+
+    # Cache directory in the container, independent of the user so it can be set in a base stage
+    DIR: ClassVar[str] = "/ccache"
+    # Named volume shared by all devcontainers of the host
+    VOLUME: ClassVar[str] = "devc-ccache"
+    # Same as the default of ccache
+    MAX_SIZE: ClassVar[int] = 5 * 1024**3
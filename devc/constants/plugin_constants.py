@@ -22,4 +22,6 @@ class PLUGIN_EXTENSION_ARGUMENT_GROUPS:
     BASIC: ClassVar[str] = "Basic Setup"
     DEVICES_USB: ClassVar[str] = "Device/USB Options"
     GRAPHICS: ClassVar[str] = "Graphics Options"
+    COMPILER: ClassVar[str] = "Compiler Options"
+    PERFORMANCE: ClassVar[str] = "Performance Options"
     ROS2: ClassVar[str] = "ROS2 Flags"
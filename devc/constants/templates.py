@@ -27,12 +27,16 @@ class TEMPLATES:
     BASE_DOCKERFILE: ClassVar[str] = "Dockerfile.j2"
     DOCKERFILE_EXTENSIONS_JSON: ClassVar[str] = "dockerfile_extensions.json"
     DEVCONTAINER_EXTENSIONS_JSON: ClassVar[str] = "devcontainer_extensions.json"
+    DOCKERIGNORE: ClassVar[str] = ".dockerignore.j2"
+    # Bundle of precompiled templates, see devc.core.template_bundle
+    PRECOMPILED_TEMPLATES: ClassVar[Path] = TEMPLATE_DIR / "precompiled_templates.zip"
 
     _TEMPLATE_FILES: ClassVar[list[ſtr]] = [
         DEVCONTAINER_JSON,
         BASE_DOCKERFILE,
         DOCKERFILE_EXTENSIONS_JSON,
         DEVCONTAINER_EXTENSIONS_JSON,
+        DOCKERIGNORE,
     ]
 
     # Mapping template filename -> destination path in devcontainer
@@ -49,6 +53,7 @@ class TEMPLATES:
     __mapping_to_filename: ClassVar[dict[str, Path]] = {
         DEVCONTAINER_JSON: Path("devcontainer.json"),
         BASE_DOCKERFILE: Path("Dockerfile"),
+        DOCKERIGNORE: Path(".dockerignore"),
     }
 
     @classmethod
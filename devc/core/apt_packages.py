@@ -0,0 +1,82 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Normalize the apt packages installed by a generated Dockerfile.
+
+The package list is part of the install layer, so any change of it rebuilds
+the layer. Packages are therefore deduplicated and sorted by name, whatever
+order and duplicates the base packages, plugins and extension files use.
+Versions can be pinned with a lockfile holding one ``package=version`` per
+line, ``#`` starts a comment.
+"""
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from devc.core.exceptions.dockerfile_exceptions import DockerfilePackageError
+
+
+def normalize_apt_packages(
+    packages: Iterable[str], pins: Mapping[str, str] | None = None
+) -> list[str]:
+    """
+    Return the deduplicated ``packages`` sorted by name.
+
+    An entry may hold several packages separated by whitespace and pin a
+    version with ``package=version``. Packages without a version are pinned
+    to the version in ``pins``, if any.
+
+    :raises DockerfilePackageError: if a package is pinned to different versions
+    """
+    versions: dict[str, str] = {}
+    for entry in packages:
+        for package in entry.split():
+            name, _, version = package.partition("=")
+            pinned = versions.get(name, "")
+            if version and pinned and version != pinned:
+                raise DockerfilePackageError(
+                    f"The apt package '{name}' is pinned to different versions: "
+                    f"'{pinned}' and '{version}'"
+                )
+            versions[name] = version or pinned
+
+    pins = pins or {}
+    return [
+        f"{name}={versions[name] or pins[name]}" if versions[name] or name in pins else name
+        for name in sorted(versions)
+    ]
+
+
+def read_apt_lockfile(path: Path) -> dict[str, str]:
+    """
+    Read the pinned versions of the apt lockfile at ``path``.
+
+    :raises DockerfilePackageError: if the file can not be read or a line is invalid
+    """
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError as e:
+        raise DockerfilePackageError(f"Can not read the apt lockfile '{path}': {e}") from e
+
+    pins: dict[str, str] = {}
+    for number, line in enumerate(lines, start=1):
+        line = line.partition("#")[0].strip()
+        if not line:
+            continue
+        name, _, version = (part.strip() for part in line.partition("="))
+        if len(name.split()) != 1 or len(version.split()) != 1:
+            raise DockerfilePackageError(
+                f"Invalid line {number} of the apt lockfile '{path}', expected 'package=version'"
+            )
+        pins[name] = version
+    return pins
@@ -0,0 +1,233 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import argparse
+import contextlib
+import io
+import multiprocessing
+import sys
+import time
+
+from devc_cli_plugin_system.command import add_subparsers_on_demand
+from devc_cli_plugin_system.constants import EXTENSION_GROUPS, PLUGIN_SYSTEM_CONSTANTS
+from devc_cli_plugin_system.entry_points import get_entry_points
+from devc.core.models.batch_manifest import BatchTarget
+from devc.core.template_loader import get_default_template_loader
+from devc.utils.console import capture_console
+from devc.utils.files import DeferredWrite, defer_writes, write_deferred
+from devc.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Commands which can not be used as the command of a batch target.
+EXCLUDED_BATCH_COMMANDS = {
+    "batch",
+    "build",
+    "extension_points",
+    "extensions",
+    "prebuild",
+    "serve",
+}
+# Threads writing the generated files
+WRITER_THREADS = 4
+
+# Service and targets inherited by the forked worker processes
+_worker_state: "tuple[BatchService, list[BatchTarget]] | None" = None
+
+
+@dataclass
+class BatchResult:
+    target: BatchTarget
+    # None if the target has been skipped
+    rc: int | None
+    duration: float = 0.0
+    error: str = ""
+    # files generated by the target, written once the target succeeded
+    writes: list[DeferredWrite] = field(default_factory=list, repr=False)
+
+    @property
+    def status(self) -> str:
+        if self.rc is None:
+            return "skipped"
+        return "ok" if self.rc == 0 else "failed"
+
+
+class BatchService:
+    """
+    Generate the targets of a batch manifest within one process.
+
+    The command and plugin extensions are instantiated once and the parser of
+    each command and plugin combination is reused for all targets using it.
+    """
+
+    def __init__(self, cli_name: str = "devc") -> None:
+        self._cli_name = cli_name
+        self._parsers: dict[tuple[str, str], argparse.ArgumentParser] = {}
+
+    def run(
+        self, targets: list[BatchTarget], *, fail_fast: bool = False, jobs: int = 1
+    ) -> list[BatchResult]:
+        """
+        Generate all ``targets``, after a failure skip the rest if ``fail_fast``.
+
+        With ``jobs`` > 1 the targets are rendered by that many forked worker
+        processes. The output of each target is printed in the order of the
+        targets either way. The files are written by a thread pool, only once
+        the target generating them succeeded.
+        """
+        with ThreadPoolExecutor(WRITER_THREADS, thread_name_prefix="devc-batch-writer") as writer:
+            if jobs > 1 and len(targets) > 1 and _can_fork():
+                results = self._run_parallel(targets, fail_fast, jobs, writer)
+            else:
+                results = self._run_sequential(targets, fail_fast, writer)
+        return [self._finish(result, future) for result, future in results]
+
+    def run_target(self, target: BatchTarget) -> BatchResult:
+        """Generate a single target, errors and the files to write are reported in the result."""
+        logger.debug(f"Generating batch target '{target.name}': {target.to_argv()}")
+        start = time.perf_counter()
+        with defer_writes() as writes:
+            try:
+                rc = self._run(target)
+                error = "" if rc == 0 else f"exited with code {rc}"
+            except SystemExit as e:
+                # argparse reports invalid arguments on stderr and exits
+                rc = e.code if isinstance(e.code, int) and e.code else 2
+                error = "invalid arguments"
+            except Exception as e:
+                logger.debug(f"Batch target '{target.name}' failed", exc_info=True)
+                rc = 1
+                error = str(e) or type(e).__name__
+        return BatchResult(
+            target=target,
+            rc=rc,
+            duration=time.perf_counter() - start,
+            error=error,
+            writes=writes if rc == 0 else [],
+        )
+
+    def _run_sequential(
+        self, targets: list[BatchTarget], fail_fast: bool, writer: ThreadPoolExecutor
+    ) -> "list[tuple[BatchResult, Future[None] | None]]":
+        results: list[tuple[BatchResult, Future[None] | None]] = []
+        failed = False
+        for target in targets:
+            if failed and fail_fast:
+                results.append((BatchResult(target=target, rc=None), None))
+                continue
+            result = self.run_target(target)
+            failed = failed or result.rc != 0
+            results.append((result, writer.submit(write_deferred, result.writes)))
+        return results
+
+    def _run_parallel(
+        self,
+        targets: list[BatchTarget],
+        fail_fast: bool,
+        jobs: int,
+        writer: ThreadPoolExecutor,
+    ) -> "list[tuple[BatchResult, Future[None] | None]]":
+        global _worker_state
+        # load the extensions and compile the templates once, the workers inherit them
+        for target in targets:
+            try:
+                self._get_parser(target.command, target.plugin)
+            except (Exception, SystemExit):
+                pass  # reported by the worker running the target
+        get_default_template_loader().preload_templates()
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        results: list[tuple[BatchResult, Future[None] | None]] = []
+        failed = False
+        _worker_state = (self, targets)
+        try:
+            with ProcessPoolExecutor(
+                min(jobs, len(targets)), mp_context=multiprocessing.get_context("fork")
+            ) as pool:
+                futures = [pool.submit(_run_target_in_worker, i) for i in range(len(targets))]
+                # collect in order of the targets, so the output is deterministic
+                for target, future in zip(targets, futures):
+                    if failed and fail_fast:
+                        future.cancel()
+                        results.append((BatchResult(target=target, rc=None), None))
+                        continue
+                    try:
+                        result, output, errors = future.result()
+                    except Exception as e:
+                        # e.g. the worker process died
+                        result, output, errors = (
+                            BatchResult(target=target, rc=1, error=str(e) or type(e).__name__),
+                            "",
+                            "",
+                        )
+                    sys.stdout.write(output)
+                    sys.stderr.write(errors)
+                    failed = failed or result.rc != 0
+                    results.append((result, writer.submit(write_deferred, result.writes)))
+        finally:
+            _worker_state = None
+        return results
+
+    @staticmethod
+    def _finish(result: BatchResult, write: "Future[None] | None") -> BatchResult:
+        if write is not None and write.exception() is not None:
+            result.rc = 1
+            result.error = f"failed to write files: {write.exception()}"
+        result.writes = []
+        return result
+
+    def _run(self, target: BatchTarget) -> int:
+        parser = self._get_parser(target.command, target.plugin)
+        args = parser.parse_args(target.to_argv())
+        extension = getattr(args, PLUGIN_SYSTEM_CONSTANTS.COMMAND_IDENTIFIER)
+        rc: int = extension.main(parser=parser, args=args)
+        return rc
+
+    def _get_parser(self, command: str, plugin: str) -> argparse.ArgumentParser:
+        key = (command, plugin)
+        if key in self._parsers:
+            return self._parsers[key]
+
+        commands = set(get_entry_points(EXTENSION_GROUPS.COMMAND_GROUP)) - EXCLUDED_BATCH_COMMANDS
+        if command not in commands:
+            raise ValueError(
+                f"Unknown command '{command}', expected one of: {', '.join(sorted(commands))}"
+            )
+        parser = argparse.ArgumentParser(prog=self._cli_name)
+        add_subparsers_on_demand(
+            parser,
+            self._cli_name,
+            PLUGIN_SYSTEM_CONSTANTS.COMMAND_IDENTIFIER,
+            EXTENSION_GROUPS.COMMAND_GROUP,
+            required=True,
+            argv=[command, plugin],
+        )
+        self._parsers[key] = parser
+        return parser
+
+
+def _can_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _run_target_in_worker(index: int) -> tuple[BatchResult, str, str]:
+    """Generate a target in a worker process and return its result and captured output."""
+    assert _worker_state is not None, "worker state is inherited from the parent process"
+    service, targets = _worker_state
+    errors = io.StringIO()
+    with capture_console() as output, contextlib.redirect_stderr(errors):
+        result = service.run_target(targets[index])
+    return result, output.getvalue(), errors.getvalue()
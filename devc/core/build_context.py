@@ -0,0 +1,105 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Keep the build context of a devcontainer small.
+
+Docker sends the whole build context to the daemon before building. The
+generated devcontainer.json uses the project root as context, which includes
+e.g. the build, install and log directories of a ROS 2 workspace. A generated
+``.dockerignore`` in the project root excludes them. If the Dockerfile does not
+copy files from the context, the context can be narrowed to the directory of
+the Dockerfile instead.
+"""
+from pathlib import Path
+
+from devc.constants.templates import TEMPLATES
+from devc.core.template_loader import TemplateLoaderABC
+from devc.core.template_machine import TemplateMachine
+from devc.utils.dockerfile_parsing import find_context_copy
+from devc.utils.dockerignore import DockerIgnore
+from devc.utils.files import atomic_write_text
+from devc.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# first line of generated .dockerignore files, files without it are not overwritten
+DOCKERIGNORE_HEADER = "# Generated by devc"
+
+
+def create_dockerignore(
+    root: Path,
+    patterns: list[str],
+    *,
+    template_machine: TemplateMachine,
+    loader: TemplateLoaderABC,
+    override: bool = False,
+) -> Path | None:
+    """
+    Write the ``.dockerignore`` of the build context ``root`` with the additional ``patterns``.
+
+    An existing ``.dockerignore`` is only replaced if it has been generated by
+    devc or ``override`` is set. The size of the build context with and without
+    the ignored files is logged. Returns the path, None if an existing file was kept.
+    """
+    path = root / TEMPLATES.get_target_filename(TEMPLATES.DOCKERIGNORE)
+    if path.exists() and not override and not _is_generated(path):
+        logger.info("Keeping the existing %s", path)
+        return None
+
+    template = loader.load_template(TEMPLATES.DOCKERIGNORE)
+    text = template_machine.render_template(template=template, context={"patterns": patterns})
+    text += "\n"
+    # estimating the context size walks it, so skip it if nothing changed
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        logger.debug("%s is up to date", path)
+        return path
+    atomic_write_text(path, text)
+    logger.info(
+        "Created %s, build context: %s, without the ignored files: %s",
+        path,
+        DockerIgnore([]).get_context_size(root),
+        DockerIgnore(text.splitlines()).get_context_size(root),
+    )
+    return path
+
+
+def find_minimal_context(dockerfile: Path) -> Path | None:
+    """
+    Return the directory of ``dockerfile`` if it can be used as build context.
+
+    This is the case if the Dockerfile does not COPY or ADD files from the
+    build context. None is returned otherwise or if it can not be read.
+    """
+    try:
+        lines = dockerfile.read_text(encoding="utf-8").splitlines()
+    except OSError as e:
+        logger.warning("Can not read %s to narrow its build context: %s", dockerfile, e)
+        return None
+    instruction = find_context_copy(lines)
+    if instruction is not None:
+        logger.warning(
+            "Not narrowing the build context, %s copies files from it: %s",
+            dockerfile,
+            instruction.arguments,
+        )
+        return None
+    return dockerfile.parent
+
+
+def _is_generated(path: Path) -> bool:
+    try:
+        with path.open(encoding="utf-8") as f:
+            return f.readline().startswith(DOCKERIGNORE_HEADER)
+    except OSError:
+        return False
@@ -0,0 +1,325 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Build the image of a generated Dockerfile.
+
+Two backends are supported:
+
+* ``sdk`` builds through the Docker client of :mod:`devc.utils.docker_utils`.
+  The Docker SDK talks to the classic builder, BuildKit is not available
+  through it.
+* ``buildx`` runs ``docker buildx build``, which builds with BuildKit and can
+  import and export layer caches, e.g. ``--cache-to type=local,dest=cache``.
+
+``auto`` uses buildx if a cache is exported, a cache source with a type is
+given or the Dockerfile needs BuildKit, otherwise the SDK. Either way the build
+log is passed on line by line while building and the steps with their
+durations are parsed from it.
+"""
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+
+from devc.constants.build_constants import BUILD_CONSTANTS
+from devc.core.exceptions.build_exceptions import BuildError, BuildFailedError
+from devc.utils.docker_utils import get_docker_client
+from devc.utils.dockerfile_parsing import parse_instructions
+from devc.utils.lazy_import import lazy_import
+from devc.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    import docker
+else:
+    docker = lazy_import("docker")
+
+logger = get_logger(__name__)
+
+_CLASSIC_STEP_PATTERN = re.compile(r"^Step (\d+)/(\d+) : (.*)$")
+_BUILDKIT_LINE_PATTERN = re.compile(r"^#(\d+) (.*)$")
+_BUILDKIT_DONE_PATTERN = re.compile(r"^DONE (\d+(?:\.\d+)?)s$")
+_SYNTAX_DIRECTIVE_PATTERN = re.compile(r"^#\s*syntax\s*=", re.IGNORECASE)
+
+
+@dataclass
+class BuildRequest:
+    dockerfile: Path
+    context: Path
+    tag: str = ""
+    build_args: dict[str, str] = field(default_factory=dict)
+    # cache sources, image references or e.g. type=local,src=... (buildx only)
+    cache_from: list[str] = field(default_factory=list)
+    # cache exports like type=local,dest=... (buildx only)
+    cache_to: list[str] = field(default_factory=list)
+    target: str = ""
+    no_cache: bool = False
+    backend: str = "auto"
+    labels: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class BuildStep:
+    name: str
+    # seconds, 0 for cached steps
+    duration: float = 0.0
+    cached: bool = False
+
+
+@dataclass
+class BuildResult:
+    backend: str
+    image_id: str
+    steps: list[BuildStep]
+    duration: float
+
+
+class ClassicProgressParser:
+    """Collect the steps of a classic builder log, e.g. ``Step 2/9 : RUN ...``."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.steps: list[BuildStep] = []
+        self._clock = clock
+        self._started: float | None = None
+
+    def feed(self, line: str) -> None:
+        match = _CLASSIC_STEP_PATTERN.match(line)
+        if match is not None:
+            self.finish()
+            self.steps.append(
+                BuildStep(name=f"[{match.group(1)}/{match.group(2)}] {match.group(3)}")
+            )
+            self._started = self._clock()
+        elif self.steps and line.strip() == "---> Using cache":
+            self.steps[-1].cached = True
+
+    def finish(self) -> None:
+        """Set the duration of the running step, the log has no end marker per step."""
+        if self._started is not None:
+            self.steps[-1].duration = self._clock() - self._started
+            self._started = None
+
+
+class BuildKitProgressParser:
+    """Collect the steps of a BuildKit log in plain progress mode, e.g. ``#5 [2/8] RUN ...``."""
+
+    def __init__(self) -> None:
+        self._steps: dict[str, BuildStep] = {}
+
+    @property
+    def steps(self) -> list[BuildStep]:
+        return list(self._steps.values())
+
+    def feed(self, line: str) -> None:
+        match = _BUILDKIT_LINE_PATTERN.match(line)
+        if match is None:
+            return
+        vertex, text = match.groups()
+        step = self._steps.get(vertex)
+        if step is None:
+            # the first line of a vertex names it, the following ones are its output
+            self._steps[vertex] = BuildStep(name=text)
+        elif text == "CACHED":
+            step.cached = True
+        elif (done := _BUILDKIT_DONE_PATTERN.match(text)) is not None:
+            step.duration = float(done.group(1))
+
+    def finish(self) -> None:
+        pass
+
+
+class BuildService:
+    def __init__(
+        self,
+        output: Callable[[str], None] = print,
+        client_factory: Callable[[], "docker.APIClient"] = get_docker_client,
+    ) -> None:
+        """
+        Create a build service passing each line of the build log to ``output``.
+
+        ``client_factory`` returns the Docker client used by the sdk backend.
+        """
+        self._output = output
+        self._client_factory = client_factory
+
+    def build(self, request: BuildRequest) -> BuildResult:
+        """
+        Build the image of ``request`` with its backend.
+
+        :raises BuildError: if the build can not be started or fails
+        :raises DependencyMissing: if the Docker daemon is not reachable
+        """
+        backend = select_backend(request)
+        logger.debug(f"Building {request.dockerfile} with the {backend} backend")
+        start = time.perf_counter()
+        if backend == "sdk":
+            image_id, steps = self._build_with_sdk(request)
+        else:
+            image_id, steps = self._build_with_buildx(request)
+        return BuildResult(
+            backend=backend,
+            image_id=image_id,
+            steps=steps,
+            duration=time.perf_counter() - start,
+        )
+
+    def _build_with_sdk(self, request: BuildRequest) -> tuple[str, list[BuildStep]]:
+        client = self._client_factory()
+        parser = ClassicProgressParser()
+        image_id = ""
+        pending = ""
+        try:
+            # decode=True yields the JSON messages as soon as the daemon sends them
+            for chunk in client.build(
+                path=str(request.context),
+                dockerfile=str(request.dockerfile.resolve()),
+                tag=request.tag or None,
+                buildargs=request.build_args,
+                cache_from=request.cache_from or None,
+                target=request.target or None,
+                labels=request.labels or None,
+                nocache=request.no_cache,
+                rm=True,
+                decode=True,
+            ):
+                if "error" in chunk:
+                    raise BuildFailedError(
+                        chunk.get("errorDetail", {}).get("message") or chunk["error"]
+                    )
+                if "stream" in chunk:
+                    *lines, pending = (pending + chunk["stream"]).split("\n")
+                    for line in lines:
+                        self._emit(line, parser)
+                elif "status" in chunk and not chunk.get("progressDetail"):
+                    # pull progress is reported many times per layer, only pass on its results
+                    self._emit(" ".join(filter(None, (chunk.get("id"), chunk["status"]))), parser)
+                aux: Any = chunk.get("aux")
+                if isinstance(aux, dict) and "ID" in aux:
+                    image_id = aux["ID"]
+        except docker.errors.DockerException as e:
+            raise BuildFailedError(f"The Docker daemon failed to build the image: {e}") from e
+        finally:
+            if pending:
+                self._emit(pending, parser)
+            parser.finish()
+        return image_id, parser.steps
+
+    def _build_with_buildx(self, request: BuildRequest) -> tuple[str, list[BuildStep]]:
+        docker_cli = shutil.which("docker")
+        if docker_cli is None:
+            raise BuildError(
+                "The buildx backend requires the docker CLI with the buildx plugin, "
+                "use '--backend sdk' to build without it."
+            )
+        parser = BuildKitProgressParser()
+        with tempfile.TemporaryDirectory(prefix="devc-build-") as tmp_dir:
+            iidfile = Path(tmp_dir) / "image-id"
+            command = [
+                docker_cli,
+                "buildx",
+                "build",
+                "--progress=plain",
+                "--load",
+                "--iidfile",
+                str(iidfile),
+                "--file",
+                str(request.dockerfile),
+                *get_buildx_arguments(request),
+                str(request.context),
+            ]
+            logger.debug(f"Running {' '.join(command)}")
+            # BuildKit writes its progress to stderr
+            with subprocess.Popen(
+                command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+            ) as process:
+                assert process.stdout is not None
+                for line in process.stdout:
+                    self._emit(line.rstrip("\n"), parser)
+            if process.returncode != 0:
+                raise BuildFailedError(f"docker buildx build exited with code {process.returncode}")
+            image_id = iidfile.read_text().strip() if iidfile.exists() else ""
+        return image_id, parser.steps
+
+    def _emit(self, line: str, parser: ClassicProgressParser | BuildKitProgressParser) -> None:
+        parser.feed(line)
+        self._output(line)
+
+
+def select_backend(request: BuildRequest) -> str:
+    """
+    Return the backend to build ``request`` with, resolving ``auto``.
+
+    :raises BuildError: if the backend is unknown, the Dockerfile does not exist or
+        the sdk backend is requested to export a cache
+    """
+    if request.backend not in BUILD_CONSTANTS.BACKENDS:
+        raise BuildError(
+            f"Unknown build backend '{request.backend}', expected one of: "
+            + ", ".join(BUILD_CONSTANTS.BACKENDS)
+        )
+    try:
+        dockerfile = request.dockerfile.read_text(encoding="utf-8")
+    except OSError as e:
+        raise BuildError(f"Can not read the Dockerfile '{request.dockerfile}': {e}") from e
+
+    if request.backend == "sdk" and request.cache_to:
+        raise BuildError("Exporting a build cache requires the buildx backend.")
+    if request.backend != "auto":
+        return request.backend
+    typed_cache_source = any("type=" in source for source in request.cache_from)
+    if request.cache_to or typed_cache_source or requires_buildkit(dockerfile):
+        return "buildx"
+    return "sdk"
+
+
+def requires_buildkit(dockerfile: str) -> bool:
+    """Return whether the ``dockerfile`` uses a syntax directive or options of RUN instructions."""
+    for instruction in parse_instructions(dockerfile.splitlines()):
+        if not instruction.keyword:
+            if any(_SYNTAX_DIRECTIVE_PATTERN.match(line.strip()) for line in instruction.lines):
+                return True
+        elif instruction.keyword == "RUN" and instruction.arguments.startswith("--"):
+            return True
+    return False
+
+
+def get_buildx_arguments(request: BuildRequest) -> list[str]:
+    """Return the options of ``docker buildx build`` for ``request``."""
+    arguments = []
+    if request.tag:
+        arguments += ["--tag", request.tag]
+    for key, value in request.build_args.items():
+        arguments += ["--build-arg", f"{key}={value}"]
+    for source in request.cache_from:
+        arguments += ["--cache-from", source]
+    for destination in request.cache_to:
+        arguments += ["--cache-to", destination]
+    for key, value in request.labels.items():
+        arguments += ["--label", f"{key}={value}"]
+    if request.target:
+        arguments += ["--target", request.target]
+    if request.no_cache:
+        arguments.append("--no-cache")
+    return arguments
+
+
+def get_default_build_args() -> dict[str, str]:
+    """Return the build args passed by the generated devcontainer.json."""
+    user = os.environ.get("USER", "")
+    return {"USER_NAME": user, "USER_PASSWORD": user, "USER_UID": "1000", "USER_GID": "1000"}
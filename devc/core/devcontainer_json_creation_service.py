@@ -13,24 +13,35 @@
 # limitations under the License.
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any
-import jinja2
+from typing import Any, TYPE_CHECKING
 import json
-import re
+import os
 
 from devc_cli_plugin_system.plugin_extensions.extension_manager import ExtensionManager
 from devc.constants.templates import TEMPLATES
+from devc.core.build_context import find_minimal_context
 from devc.core.exceptions.devcontainer_json_exception import (
     DevJsonTemplateNotFoundError,
     DevJsonTemplateRenderError,
     DevJsonExistsError,
 )
+from devc.core.generation_record import GenerationRecord, hash_inputs, hash_text
 from devc.core.models.devcontainer_extension_json_scheme import DevJsonHandler
 from devc.core.template_loader import TemplateLoaderABC
 from devc.core.template_machine import TemplateMachine
+from devc.utils.dockerignore import DockerIgnore
+from devc.utils.files import atomic_write_text
+from devc.utils import jsonc
 from devc.utils.logging import get_logger
-from devc.utils.merge_dicts import AppendListMerge
+from devc.utils.merge_dicts import DevcontainerMerge
+from devc.utils.profiling import span
 from devc.core.models.options import DevContainerJsonOptions
+from devc.utils.lazy_import import lazy_import
+
+if TYPE_CHECKING:
+    import jinja2
+else:
+    jinja2 = lazy_import("jinja2")
 
 logger = get_logger(__name__)
 
@@ -46,11 +57,12 @@ class DevcontainerJsonCreationService:
         self._template_machine: TemplateMachine = template_machine
         self._loader: TemplateLoaderABC = loader
         self._ext_manager: ExtensionManager = ext_manager
-        self._json_update_strategy = AppendListMerge()
+        self._json_update_strategy = DevcontainerMerge()
 
-    def _load_template(self, template_file: str) -> jinja2.Template:
+    def _load_template(self, template_file: str) -> "jinja2.Template":
         try:
-            template = self._loader.load_template(template_file)
+            with span("template load"):
+                template = self._loader.load_template(template_file)
         except FileNotFoundError:
             logger.error(
                 "Template %s not found in %s",
@@ -60,41 +72,51 @@ class DevcontainerJsonCreationService:
             raise DevJsonTemplateNotFoundError(f"Template {template_file} not found")
         return template
 
-    def _update_created_dev_json_with_extensions(self, path: Path) -> None:
-        updates = self._ext_manager.get_combined_updates()
+    def _apply_extension_updates(
+        self, data: dict[str, Any], updates: dict[str, Any], path: Path
+    ) -> dict[str, Any]:
+        """Merge the ``updates`` of the called plugin extensions into ``data``."""
         if not updates:
             logger.debug("No devcontainer.json plugin updates to apply.")
-            return
+            return data
 
-        current_data: dict[str, Any] = json.loads(path.read_text())
-        merged = self._json_update_strategy.merge_dicts(current_data, updates)
-        path.write_text(json.dumps(merged, indent=4))
+        merged = self._json_update_strategy.merge_dicts(data, updates)
         logger.info(
             "Applied following plugin extensions to [bold blue]devcontainer.json[/bold blue] at %s",
             path,
         )
         for ext_name in self._ext_manager.called_extensions.keys():
             logger.info(f"\t - {ext_name}")
+        return merged
+
+    @staticmethod
+    def _narrow_build_context(data: dict[str, Any], devcontainer_dir: Path) -> None:
+        """Use the directory of the Dockerfile as build context, if it does not copy files."""
+        build = data.get("build")
+        dockerfile = _get_dockerfile_path(data, devcontainer_dir)
+        if not isinstance(build, dict) or dockerfile is None:
+            logger.warning("Not narrowing the build context, no Dockerfile is built.")
+            return
+        context = find_minimal_context(dockerfile)
+        if context is None:
+            return
+        previous = Path(os.path.normpath(devcontainer_dir / build.get("context", ".")))
+        logger.info(
+            "Narrowed the build context from %s to %s",
+            DockerIgnore.from_file(previous / ".dockerignore").get_context_size(previous),
+            DockerIgnore.from_file(context / ".dockerignore").get_context_size(context),
+        )
+        build["context"] = os.path.relpath(context, devcontainer_dir)
 
-    def _postprocess_rendered_json(self, path: Path) -> None:
-        """Clean up trailing commas and ensure valid JSON formatting."""
-        text = path.read_text()
-
-        # remove trailing commas before } or ]
-        cleaned = re.sub(r",(\s*[}\]])", r"\1", text)
-
+    def _postprocess_rendered_json(self, text: str) -> dict[str, Any]:
+        """Parse the rendered JSON, comments and trailing commas are allowed."""
         try:
-            # validate and pretty-print the JSON
-            parsed = json.loads(cleaned)
+            parsed: dict[str, Any] = jsonc.loads(text)
         except json.JSONDecodeError as e:
-            logger.error("Postprocessing failed: invalid JSON after cleanup (%s)", e)
-            # write cleaned text anyway to aid debugging
-            path.write_text(cleaned)
-            raise
-
-        # write validated, formatted JSON
-        path.write_text(json.dumps(parsed, indent=4))
-        logger.debug("Postprocessed and cleaned JSON at %s", path)
+            logger.error("Postprocessing failed: the rendered template is invalid JSON (%s)", e)
+            logger.debug("Rendered devcontainer.json:\n%s", text)
+            raise DevJsonTemplateRenderError(f"The rendered template is not valid JSON: {e}") from e
+        return parsed
 
     def create_devcontainer_json(
         self,
@@ -110,29 +132,99 @@ class DevcontainerJsonCreationService:
         )
         # check path
         path: Path = options.path / TEMPLATES.get_target_filename(template_file)
-        if not options.override and path.exists():
+        predefs = dict(asdict(dev_json.content.pre_defined_extensions))
+        with span("extension updates"):
+            updates = self._ext_manager.get_combined_updates()
+        record, inputs = None, {}
+        if options.incremental:
+            inputs = {
+                "template": template_file,
+                "source": self._loader.get_template_source(template_file),
+                "context": predefs,
+                "options": options.content_options(),
+                "updates": updates,
+            }
+            record = GenerationRecord.read(path)
+            # an unmodified target builds the Dockerfile a regeneration would build
+            if record is not None and record.is_up_to_date(
+                path, _hash_inputs(inputs, options, _read_generated(path), path.parent)
+            ):
+                logger.info("Skipping %s, it is up to date", path)
+                return
+        # a file generated by a previous incremental run may be regenerated if it is unmodified
+        if (
+            not options.override
+            and path.exists()
+            and not (record is not None and record.is_unmodified(path))
+        ):
             logger.warning("Target file %s already exists", path)
             raise DevJsonExistsError(f"The target file '{path}' already exists.")
 
-        # render template with given options
+        # render template with given options, the file is only written once all steps succeeded
         try:
-            predefs = dict(asdict(dev_json.content.pre_defined_extensions))
-            self._template_machine.render_to_target(
-                template=template, target_path=path, context=predefs
-            )
+            rendered = self._template_machine.render_template(template=template, context=predefs)
         except jinja2.UndefinedError as e:
             logger.error("Template render error: %s", e.message)
             raise DevJsonTemplateRenderError(
                 f"Missing required values to render template {template_file}: {e.message}."
             )
 
-        # make sure no trailing commas and the like
-        self._postprocess_rendered_json(path=path)
+        # the templates may contain comments and trailing commas
+        with span("post-process"):
+            data = self._postprocess_rendered_json(rendered)
 
         # Apply plugin updates
-        self._update_created_dev_json_with_extensions(path=path)
-
+        with span("merge"):
+            data = self._apply_extension_updates(data, updates, path=path)
+
+        if options.minimal_context:
+            self._narrow_build_context(data, path.parent)
+
+        with span("write"):
+            text = json.dumps(data, indent=4)
+            atomic_write_text(path, text)
+            if options.incremental:
+                GenerationRecord(
+                    inputs=_hash_inputs(inputs, options, data, path.parent),
+                    output=hash_text(text),
+                ).write(path)
         logger.info(
             "Creation of [bold blue]devcontainer.json[/bold blue] successfully at %s",
             path,
         )
+
+
+def _hash_inputs(
+    inputs: dict[str, Any],
+    options: DevContainerJsonOptions,
+    data: dict[str, Any] | None,
+    devcontainer_dir: Path,
+) -> str:
+    """Return the hash of the ``inputs`` generating the devcontainer.json ``data``."""
+    if options.minimal_context:
+        # whether the build context is narrowed depends on the Dockerfile, e.g. on its COPYs
+        dockerfile = _get_dockerfile_path(data or {}, devcontainer_dir)
+        try:
+            text = dockerfile.read_text(encoding="utf-8") if dockerfile is not None else None
+        except OSError:
+            text = None
+        inputs = {**inputs, "dockerfile": text}
+    return hash_inputs(**inputs)
+
+
+def _get_dockerfile_path(data: dict[str, Any], devcontainer_dir: Path) -> Path | None:
+    """Return the path of the Dockerfile built by the devcontainer.json ``data``, if any."""
+    build = data.get("build")
+    if not isinstance(build, dict) or not build.get("dockerfile"):
+        return None
+    # paths of the build section are relative to the devcontainer.json, whose directory
+    # may not exist yet, so they are normalized without resolving them
+    return Path(os.path.normpath(devcontainer_dir / build["dockerfile"]))
+
+
+def _read_generated(path: Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
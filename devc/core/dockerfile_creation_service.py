@@ -13,22 +13,43 @@
 # limitations under the License.
 from dataclasses import asdict
 from pathlib import Path
-import jinja2
+from typing import Any, TYPE_CHECKING
+import re
 
+from devc.constants.defaults import DEFAULT_APT_PACKAGES
 from devc.constants.templates import TEMPLATES
+from devc.core.apt_packages import normalize_apt_packages, read_apt_lockfile
 from devc.core.exceptions.dockerfile_exceptions import (
     DockerfileTemplateNotFoundError,
     DockerfileExistsError,
     DockerfileTemplateRenderError,
 )
+from devc.core.dockerfile_insertion_engine import apply_insertions
+from devc.core.dockerfile_layer_optimizer import optimize_layers
+from devc.core.generation_record import GenerationRecord, hash_inputs, hash_text
 from devc.core.models.dockerfile_extension_json_scheme import DockerfileHandler
 from devc.core.template_loader import TemplateLoaderABC
 from devc.core.template_machine import TemplateMachine
 from devc.core.models.options import DockerfileOptions
+from devc.utils.dockerfile_parsing import add_run_options, Instruction
+from devc.utils.files import atomic_write_text
+from devc.utils.lazy_import import lazy_import
 from devc.utils.logging import get_logger
+from devc.utils.profiling import span
+
+if TYPE_CHECKING:
+    import jinja2
+else:
+    jinja2 = lazy_import("jinja2")
 
 logger = get_logger(__name__)
 
+# BuildKit cache mount for pip, used by RUN instructions calling pip as root
+PIP_CACHE_MOUNT = "--mount=type=cache,target=/root/.cache/pip,sharing=locked"
+_PIP_INSTALL_PATTERN = re.compile(r"\b(pip3?|python3?\s+-m\s+pip)\s+install\b")
+# commands of the pre-defined extensions which are run as root
+_ROOT_COMMANDS = ("pre_package_install", "post_package_install", "additional_sudo_commands")
+
 
 class DockerfileCreationService:
     def __init__(self, template_machine: TemplateMachine, loader: TemplateLoaderABC):
@@ -42,7 +63,8 @@ class DockerfileCreationService:
         options: DockerfileOptions,
     ) -> None:
         try:
-            template = self.loader.load_template(template_file)
+            with span("template load"):
+                template = self.loader.load_template(template_file)
         except FileNotFoundError:
             logger.error(
                 "Template %s not found in %s",
@@ -52,19 +74,78 @@ class DockerfileCreationService:
             raise DockerfileTemplateNotFoundError(f"Template {template_file} not found")
 
         path: Path = options.path / TEMPLATES.get_target_filename(template_file)
-        if not options.override and path.exists():
+        predefs = dict(asdict(dockerfile_handler.content.pre_defined_extensions))
+        self._add_apt_packages(predefs, options)
+        if predefs["buildkit_cache"]:
+            self._add_pip_cache_mounts(predefs)
+        record, inputs = None, ""
+        if options.incremental:
+            inputs = hash_inputs(
+                template=template_file,
+                source=self.loader.get_template_source(template_file),
+                context=predefs,
+                insertions=dockerfile_handler.content.insertions,
+                options=options.content_options(),
+            )
+            record = GenerationRecord.read(path)
+            if record is not None and record.is_up_to_date(path, inputs):
+                logger.info("Skipping %s, it is up to date", path)
+                return
+        # a file generated by a previous incremental run may be regenerated if it is unmodified
+        if (
+            not options.override
+            and path.exists()
+            and not (record is not None and record.is_unmodified(path))
+        ):
             logger.warning("Target file %s already exists", path)
             raise DockerfileExistsError(f"The target file '{path}' already exists.")
 
         try:
-            predefs = dict(asdict(dockerfile_handler.content.pre_defined_extensions))
-            self.template_machine.render_to_target(
-                template=template, target_path=path, context=predefs
-            )
+            rendered = self.template_machine.render_template(template=template, context=predefs)
         except jinja2.UndefinedError as e:
             logger.error("Template render error: %s", e.message)
             raise DockerfileTemplateRenderError(
                 f"Missing required values to render template {template_file}: {e.message}"
             )
 
+        with span("insertions"):
+            rendered = apply_insertions(rendered, dockerfile_handler.content.insertions)
+        if options.optimize_layers:
+            with span("optimize layers"):
+                rendered = optimize_layers(rendered)
+
+        with span("write"):
+            atomic_write_text(path, rendered)
+            if options.incremental:
+                GenerationRecord(inputs=inputs, output=hash_text(rendered)).write(path)
         logger.info("Creation of devcontainer.json successfully at %s", path)
+
+    @staticmethod
+    def _add_apt_packages(predefs: dict[str, Any], options: DockerfileOptions) -> None:
+        """
+        Add the normalized packages of the install layer and of the extra layer.
+
+        The extra layer holds the additional packages if they are split from the
+        base packages, otherwise it is empty.
+        """
+        pins = read_apt_lockfile(options.apt_lockfile) if options.apt_lockfile else None
+        packages = normalize_apt_packages(
+            [*DEFAULT_APT_PACKAGES.BASE, *predefs["additional_apt_packages"]], pins
+        )
+        if predefs["split_apt_layers"]:
+            core = [p for p in packages if p.partition("=")[0] in DEFAULT_APT_PACKAGES.BASE]
+            predefs["apt_packages"] = core
+            predefs["extra_apt_packages"] = [p for p in packages if p not in core]
+        else:
+            predefs["apt_packages"] = packages
+            predefs["extra_apt_packages"] = []
+
+    @staticmethod
+    def _add_pip_cache_mounts(predefs: dict[str, Any]) -> None:
+        """Mount the pip cache into the RUN instructions of the root commands calling pip."""
+
+        def installs_with_pip(instruction: Instruction) -> bool:
+            return _PIP_INSTALL_PATTERN.search(instruction.arguments) is not None
+
+        for key in _ROOT_COMMANDS:
+            predefs[key] = add_run_options(predefs[key], PIP_CACHE_MOUNT, installs_with_pip)
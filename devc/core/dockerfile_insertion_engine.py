@@ -0,0 +1,140 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Apply the ``insertions`` of a Dockerfile extension file to a rendered Dockerfile.
+
+An insertion adds its ``lines`` ``before`` or ``after`` each line matching its
+``anchor``, or replaces the matching lines with them (``replace``). Literal
+anchors match lines containing them, regex anchors are searched within the
+lines. Insertions with an empty anchor are ignored, as used by the placeholder
+of the default file.
+
+All anchors are compiled into one pattern, so the rendered Dockerfile is
+scanned once no matter how many insertions are given. Inserted lines are not
+matched against the anchors again. If several insertions hit the same line,
+they are applied in the order they are listed in.
+"""
+import re
+
+from devc.core.exceptions.dockerfile_exceptions import DockerfileInsertionError
+from devc.core.models.dockerfile_extension_json_scheme import Insertion
+from devc.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+INSERTION_POSITIONS = ("before", "after", "replace")
+
+
+class InsertionEngine:
+    def __init__(self, insertions: list[Insertion]) -> None:
+        """
+        Compile the anchors of the ``insertions``.
+
+        :raises DockerfileInsertionError: if a position or regex anchor is invalid
+        """
+        self._insertions = [insertion for insertion in insertions if insertion.anchor]
+        if len(self._insertions) < len(insertions):
+            logger.debug("Ignoring insertions without an anchor.")
+
+        patterns = []
+        self._combined: list[int] = []
+        # anchors with groups or global flags can not be combined with the other anchors
+        self._separate: list[tuple[int, re.Pattern[str]]] = []
+        for index, insertion in enumerate(self._insertions):
+            if insertion.position not in INSERTION_POSITIONS:
+                raise DockerfileInsertionError(
+                    f"Invalid position '{insertion.position}' of the insertion at anchor "
+                    f"'{insertion.anchor}', expected one of: {', '.join(INSERTION_POSITIONS)}"
+                )
+            pattern = self._compile_anchor(insertion)
+            if pattern.groups or pattern.flags != re.UNICODE:
+                self._separate.append((index, pattern))
+            else:
+                # an optional lookahead per anchor, so one match reports all anchors of a line
+                patterns.append(f"(?:(?=.*?(?P<i{index}>{pattern.pattern})))?")
+                self._combined.append(index)
+        self._matcher = re.compile("".join(patterns)) if patterns else None
+
+    def apply(self, text: str) -> str:
+        """
+        Return ``text`` with all insertions applied.
+
+        :raises DockerfileInsertionError: if an anchor does not match any line or a
+            line is replaced by more than one insertion
+        """
+        if not self._insertions:
+            return text
+
+        matched = [False] * len(self._insertions)
+        result: list[str] = []
+        for line in text.splitlines():
+            hits = self._match(line)
+            if not hits:
+                result.append(line)
+                continue
+
+            insertions = [self._insertions[i] for i in hits]
+            replacing = [insertion for insertion in insertions if insertion.position == "replace"]
+            if len(replacing) > 1:
+                raise DockerfileInsertionError(
+                    f"The line '{line}' is replaced by several insertions: "
+                    + ", ".join(f"'{insertion.anchor}'" for insertion in replacing)
+                )
+            for insertion in insertions:
+                if insertion.position == "before":
+                    result.extend(insertion.lines)
+            if replacing:
+                result.extend(replacing[0].lines)
+            else:
+                result.append(line)
+            for insertion in insertions:
+                if insertion.position == "after":
+                    result.extend(insertion.lines)
+            for i in hits:
+                matched[i] = True
+
+        unmatched = [ins.anchor for ins, hit in zip(self._insertions, matched) if not hit]
+        if unmatched:
+            raise DockerfileInsertionError(
+                "The anchors of following insertions do not match any line of the Dockerfile: "
+                + ", ".join(f"'{anchor}'" for anchor in unmatched)
+            )
+        return "\n".join(result) + ("\n" if text.endswith("\n") else "")
+
+    def _match(self, line: str) -> list[int]:
+        """Return the indices of the insertions whose anchor matches ``line`` in order."""
+        hits = []
+        if self._matcher is not None:
+            match = self._matcher.match(line)
+            if match is not None:
+                hits = [i for i in self._combined if match.group(f"i{i}") is not None]
+        if self._separate:
+            hits += [i for i, pattern in self._separate if pattern.search(line)]
+            hits.sort()
+        return hits
+
+    @staticmethod
+    def _compile_anchor(insertion: Insertion) -> "re.Pattern[str]":
+        anchor = insertion.anchor if insertion.is_regex else re.escape(insertion.anchor)
+        try:
+            return re.compile(anchor)
+        except re.error as e:
+            raise DockerfileInsertionError(
+                f"Invalid regex anchor '{insertion.anchor}' of an insertion: {e}"
+            ) from e
+
+
+def apply_insertions(text: str, insertions: list[Insertion]) -> str:
+    """Return the rendered Dockerfile ``text`` with the ``insertions`` applied."""
+    return InsertionEngine(insertions).apply(text)
@@ -0,0 +1,181 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Reduce the number of layers of a rendered Dockerfile.
+
+Adjacent ``RUN`` instructions, separated by nothing but comments and blank
+lines, are merged into one instruction by chaining their commands with ``&&``.
+Any other instruction, e.g. ``USER``, ``WORKDIR``, ``ARG`` or ``ENV``, ends a
+sequence of ``RUN`` instructions, so nothing is moved across it. Comments
+between merged instructions are kept as comment lines within the merged
+instruction.
+
+Only instructions which keep their meaning when chained are merged: shell form
+without options like ``--mount`` or heredocs, no comments on the command lines
+and no top-level ``;``, ``&`` or ``||`` in the appended command, which would
+otherwise ignore a failure of the previous commands. Nothing is appended to an
+instruction changing the state of its shell, e.g. with ``cd``, ``export`` or
+``set``, as each ``RUN`` instruction starts a new shell in the ``WORKDIR``.
+"""
+import json
+import re
+import shlex
+
+from devc.utils.dockerfile_parsing import Instruction, parse_instructions
+
+_OPENING_TOKENS = {"if", "case", "for", "while", "until", "{", "("}
+_CLOSING_TOKENS = {"fi", "esac", "done", "}", ")"}
+# tokens after which a new command starts
+_COMMAND_SEPARATORS = {
+    *("&&", "||", ";", ";;", "&", "|", "!", "(", ")", "{", "}"),
+    *("if", "then", "elif", "else", "while", "until", "do"),
+}
+# commands changing the state of the shell, e.g. its working directory or variables
+_STATE_CHANGING_COMMANDS = {
+    *(".", "source", "cd", "pushd", "popd", "export", "unset", "set", "shopt"),
+    *("umask", "ulimit", "alias", "unalias", "declare", "typeset", "local", "readonly"),
+    *("read", "mapfile", "readarray", "getopts", "let", "for", "select", "trap", "eval"),
+    *("exec", "exit", "return"),
+}
+_ASSIGNMENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\+?=")
+
+
+def optimize_layers(text: str) -> str:
+    """Return the Dockerfile ``text`` with adjacent compatible RUN instructions merged."""
+    result: list[Instruction] = []
+    # index of the last RUN instruction in result, if only comments and blank lines follow it
+    previous_run: int | None = None
+    for instruction in parse_instructions(text.splitlines()):
+        if not instruction.keyword:
+            result.append(instruction)
+            continue
+        if (
+            previous_run is not None
+            and instruction.keyword == "RUN"
+            and _can_append(result[previous_run], instruction)
+        ):
+            first, *between = result[previous_run:]
+            del result[previous_run:]
+            result.append(_merge(first, between, instruction))
+            continue
+        result.append(instruction)
+        previous_run = len(result) - 1 if instruction.keyword == "RUN" else None
+
+    lines = [line for instruction in result for line in instruction.lines]
+    return "\n".join(lines) + ("\n" if text.endswith("\n") else "")
+
+
+def _merge(first: Instruction, between: list[Instruction], second: Instruction) -> Instruction:
+    # blank continuation lines are deprecated, comments are allowed
+    comments = [line for i in between for line in i.lines if line.strip()]
+    head, *tail = second.lines
+    command = head.lstrip()[3:].lstrip()  # strip the RUN keyword
+    return Instruction(
+        keyword="RUN",
+        lines=[
+            *first.lines[:-1],
+            f"{first.lines[-1].rstrip()} \\",
+            *comments,
+            f"    && {command}".rstrip(),
+            *tail,
+        ],
+    )
+
+
+def _can_append(first: Instruction, second: Instruction) -> bool:
+    first_tokens = _tokenize(first)
+    second_tokens = _tokenize(second)
+    if first_tokens is None or second_tokens is None:
+        return False
+    # "cd src && make" followed by "make install" would install from src
+    if _changes_shell_state(first_tokens):
+        return False
+    first_top_level = _get_top_level_tokens(first_tokens)
+    second_top_level = _get_top_level_tokens(second_tokens)
+    if first_top_level is None or second_top_level is None:
+        return False
+    # a trailing separator can not be followed by &&
+    if first_top_level and first_top_level[-1] in (";", "&") or "&" in first_top_level:
+        return False
+    # "a && b; c" or "a && b || c" would run c even if a failed
+    return not {";", "&", "||"} & set(second_top_level)
+
+
+def _tokenize(instruction: Instruction) -> list[str] | None:
+    """
+    Return the shell tokens of a RUN instruction.
+
+    None is returned if the instruction can not be merged safely, e.g. because
+    it can not be parsed, uses options, the exec form, heredocs or comments.
+    """
+    command = instruction.arguments
+    if not command or command.startswith("--") or "<<" in command or _is_exec_form(command):
+        return None
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+    lexer.commenters = ""
+    lexer.whitespace_split = True
+    try:
+        tokens = list(lexer)
+    except ValueError:
+        return None
+    if any(token.startswith("#") for token in tokens):
+        return None
+    return tokens
+
+
+def _changes_shell_state(tokens: list[str]) -> bool:
+    """
+    Return whether any command of ``tokens`` may change the state of the shell.
+
+    Commands within subshells are considered as well, which is stricter than needed.
+    """
+    at_command = True
+    # a command consisting of assignments only sets shell variables
+    assignments_only = False
+    for token in tokens:
+        if token in _COMMAND_SEPARATORS:
+            if assignments_only:
+                return True
+            at_command = True
+        elif at_command and _ASSIGNMENT.match(token):
+            assignments_only = True
+        elif at_command:
+            if token in _STATE_CHANGING_COMMANDS:
+                return True
+            at_command = assignments_only = False
+    return assignments_only
+
+
+def _get_top_level_tokens(tokens: list[str]) -> list[str] | None:
+    """Return the tokens outside of compound commands, None if they are unbalanced."""
+    top_level = []
+    depth = 0
+    for token in tokens:
+        if token in _OPENING_TOKENS:
+            depth += 1
+        elif token in _CLOSING_TOKENS:
+            depth -= 1
+            if depth < 0:
+                return None
+        elif depth == 0:
+            top_level.append(token)
+    return top_level if depth == 0 else None
+
+
+def _is_exec_form(command: str) -> bool:
+    # a shell command may start with "[" too, e.g. "[ -e file ] || ..."
+    try:
+        return isinstance(json.loads(command), list)
+    except ValueError:
+        return False
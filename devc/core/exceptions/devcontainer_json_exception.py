@@ -25,3 +25,7 @@ class DevJsonExistsError(DevcontainerJsonError):
 
 class DevJsonTemplateRenderError(DevcontainerJsonError):
     pass
+
+
+class DevJsonMergeConflictError(DevcontainerJsonError):
+    """Two updates set different values for the same setting of the devcontainer.json."""
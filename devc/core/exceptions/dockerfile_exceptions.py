@@ -25,3 +25,15 @@ class DockerfileExistsError(DockerfileError):
 
 class DockerfileTemplateRenderError(DockerfileError):
     pass
+
+
+class DockerfileInsertionError(DockerfileError):
+    pass
+
+
+class DockerfilePackageError(DockerfileError):
+    pass
+
+
+class DockerfileExtensionError(DockerfileError):
+    pass
@@ -0,0 +1,113 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Records of generated files, used to skip the regeneration of unchanged targets.
+
+The record of a generated file is stored in a hidden sidecar file next to it.
+It holds the hash of the inputs the file has been generated from and the hash
+of the generated content. A target is up to date if the hash of its current
+inputs matches the record and the file has not been modified since.
+"""
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+from typing import Any
+import functools
+import hashlib
+import json
+
+from devc.utils.files import atomic_write_text
+from devc.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Increment if the generated files change without a change of the inputs or the devc version.
+GENERATION_RECORD_VERSION = 1
+
+
+@dataclass(frozen=True)
+class GenerationRecord:
+    # hash of the inputs the file has been generated from
+    inputs: str
+    # hash of the generated content
+    output: str
+
+    @classmethod
+    def read(cls, target: Path) -> "GenerationRecord | None":
+        """Return the record of ``target`` or None if there is no valid one."""
+        try:
+            data = json.loads(get_record_path(target).read_text(encoding="utf-8"))
+            if data.get("version") != GENERATION_RECORD_VERSION:
+                return None
+            return cls(inputs=str(data["inputs"]), output=str(data["output"]))
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+
+    def write(self, target: Path) -> None:
+        data = {"version": GENERATION_RECORD_VERSION, **asdict(self)}
+        atomic_write_text(get_record_path(target), json.dumps(data, indent=4))
+
+    def is_unmodified(self, target: Path) -> bool:
+        """Return whether ``target`` still has the content it has been generated with."""
+        try:
+            return hash_text(target.read_text(encoding="utf-8")) == self.output
+        except (OSError, ValueError):
+            return False
+
+    def is_up_to_date(self, target: Path, inputs: str) -> bool:
+        """Return whether ``target`` has been generated from ``inputs`` and is unmodified."""
+        return self.inputs == inputs and self.is_unmodified(target)
+
+
+def get_record_path(target: Path) -> Path:
+    return target.with_name(f".{target.name}.devc-hash")
+
+
+def hash_inputs(**inputs: Any) -> str:
+    """
+    Return a hash of the JSON serializable ``inputs`` and the devc version.
+
+    Dataclasses are hashed by their fields and paths by their string.
+    """
+    data = {
+        "devc": _get_devc_version(),
+        "version": GENERATION_RECORD_VERSION,
+        "inputs": inputs,
+    }
+    text = json.dumps(data, sort_keys=True, default=_to_json)
+    return hash_text(text)
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _to_json(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Can not hash input of type {type(value).__name__}")
+
+
+@functools.cache
+def _get_devc_version() -> str:
+    from importlib import metadata
+
+    try:
+        return metadata.version("devc")
+    except metadata.PackageNotFoundError:
+        logger.debug("devc is not installed, generation records only depend on the inputs")
+        return ""
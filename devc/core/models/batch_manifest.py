@@ -0,0 +1,164 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Manifest describing the targets of ``devc batch``.
+
+A manifest is a JSON, TOML or YAML file of the form::
+
+    defaults:                         # optional, arguments are prepended to each target
+      command: dev-json
+      plugin: ros2-desktop-full
+      args: {ros-distro: jazzy}
+    targets:
+      - path: repos/a/.devcontainer   # relative to the manifest
+        args: {name: a, image: "ubuntu:24.04"}
+        extensions: {nvidia: runtime, ssh: true}
+      - name: b-dockerfile            # defaults to the path
+        command: dockerfile
+        path: repos/b/.docker
+        args: ["--ros-distro", "humble"]
+
+``args`` and ``extensions`` are either lists of command line arguments or
+mappings of option names to values. ``true`` passes a flag, ``false`` and
+``null`` omit the option and lists pass multiple values.
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+import json
+import tomllib
+
+from devc.core.exceptions.batch_exceptions import BatchManifestError
+from devc.core.exceptions.devc_exceptions import DependencyMissing
+
+_TARGET_KEYS = {"name", "command", "plugin", "path", "args", "extensions"}
+
+
+@dataclass
+class BatchTarget:
+    name: str
+    command: str
+    plugin: str
+    path: Path
+    args: list[str] = field(default_factory=list)
+
+    def to_argv(self) -> list[str]:
+        """Return the command line arguments to generate this target."""
+        return [self.command, self.plugin, *self.args, "--path", str(self.path)]
+
+
+def load_batch_manifest(path: Path) -> list[BatchTarget]:
+    """
+    Load the targets of the manifest at ``path``.
+
+    :raises BatchManifestError: if the manifest can not be read or is invalid
+    :raises DependencyMissing: if a YAML manifest is given but PyYAML is not installed
+    """
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as e:
+        raise BatchManifestError(f"Failed to read manifest '{path}': {e}") from e
+
+    data = _parse_manifest(text, path)
+    if not isinstance(data, dict) or not isinstance(data.get("targets"), list):
+        raise BatchManifestError(f"Manifest '{path}' must contain a list of 'targets'.")
+    defaults = data.get("defaults", {})
+    if not isinstance(defaults, dict):
+        raise BatchManifestError(f"'defaults' of manifest '{path}' must be a mapping.")
+
+    targets = []
+    for index, entry in enumerate(data["targets"]):
+        if not isinstance(entry, dict):
+            raise BatchManifestError(f"Target #{index} must be a mapping.")
+        unknown = set(entry) - _TARGET_KEYS
+        if unknown:
+            raise BatchManifestError(
+                f"Target #{index} has unknown keys: {', '.join(sorted(unknown))}"
+            )
+        targets.append(_create_target(defaults, entry, index, path.parent))
+    names = [target.name for target in targets]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise BatchManifestError(f"Duplicate target names in manifest: {', '.join(duplicates)}")
+    return targets
+
+
+def _parse_manifest(text: str, path: Path) -> Any:
+    loads: Callable[[str], Any]
+    errors: tuple[type[Exception], ...]
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        loads, errors = json.loads, (ValueError,)
+    elif suffix == ".toml":
+        loads, errors = tomllib.loads, (tomllib.TOMLDecodeError,)
+    elif suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise DependencyMissing(
+                "YAML manifests require PyYAML, install it with 'pip install devc[yaml]'."
+            ) from e
+        loads, errors = yaml.safe_load, (yaml.YAMLError,)
+    else:
+        raise BatchManifestError(
+            f"Unsupported manifest format '{suffix}', use .json, .toml, .yaml or .yml."
+        )
+
+    try:
+        return loads(text)
+    except errors as e:
+        raise BatchManifestError(f"Failed to parse manifest '{path}': {e}") from e
+
+
+def _create_target(
+    defaults: dict[str, Any], entry: dict[str, Any], index: int, base_dir: Path
+) -> BatchTarget:
+    merged = {**defaults, **entry}
+    for key in ("command", "plugin", "path"):
+        if not isinstance(merged.get(key), str) or not merged[key]:
+            raise BatchManifestError(f"Target #{index} requires a non empty '{key}'.")
+    # arguments of the target are passed after the defaults, so they take precedence
+    args = []
+    for key in ("args", "extensions"):
+        args += _to_args(defaults.get(key), index) + _to_args(entry.get(key), index)
+    return BatchTarget(
+        name=str(merged.get("name") or merged["path"]),
+        command=merged["command"],
+        plugin=merged["plugin"],
+        path=base_dir / merged["path"],
+        args=args,
+    )
+
+
+def _to_args(value: Any, index: int) -> list[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    if not isinstance(value, dict):
+        raise BatchManifestError(f"Arguments of target #{index} must be a list or a mapping.")
+
+    args: list[str] = []
+    for option, option_value in value.items():
+        flag = option if option.startswith("-") else f"--{option}"
+        if option_value is None or option_value is False:
+            continue
+        args.append(flag)
+        if option_value is True:
+            continue
+        if isinstance(option_value, list):
+            args.extend(str(v) for v in option_value)
+        else:
+            args.append(str(option_value))
+    return args
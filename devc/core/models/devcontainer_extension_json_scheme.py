@@ -12,12 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 from dataclasses import dataclass, asdict
 from typing import Any, TextIO
 from typing import override
 
 from devc.core.file_handler_interface import FileHandler
+from devc.utils import jsonc
 
 
 @dataclass
@@ -41,7 +41,7 @@ class DevJsonHandler(FileHandler[DevJsonConfig]):
 
     @override
     def parse_file(self, file: TextIO) -> DevJsonConfig:
-        data: dict[str, Any] = json.load(file)
+        data: dict[str, Any] = jsonc.load(file)
         predefs = data.get("pre-defined-extensions", {})
 
         return DevJsonConfig(
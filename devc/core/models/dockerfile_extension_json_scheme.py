@@ -12,12 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, fields
 from typing import Any, TextIO
 from typing import override
-import json
 
+from devc.core.exceptions.dockerfile_exceptions import DockerfileExtensionError
 from devc.core.file_handler_interface import FileHandler
+from devc.utils import jsonc
 from devc.utils.json_parsing import filter_empty_strings
 
 
@@ -29,6 +30,12 @@ class PredefinedExtensions:
     post_package_install: list[str] = field(default_factory=list)
     additional_sudo_commands: list[str] = field(default_factory=list)
     additional_user_commands: list[str] = field(default_factory=list)
+    # use BuildKit cache mounts for the apt and pip caches
+    buildkit_cache: bool = False
+    # split into a user independent base stage and a per user stage
+    multi_stage: bool = False
+    # install the additional apt packages in a layer of their own
+    split_apt_layers: bool = False
 
 
 @dataclass
@@ -51,9 +58,44 @@ class DockerfileHandler(FileHandler[DockerfileExtension]):
         assert self.content is not None
         self.content.pre_defined_extensions.image = image
 
+    def enable_buildkit_cache(self) -> None:
+        assert self.content is not None
+        self.content.pre_defined_extensions.buildkit_cache = True
+
+    def enable_multi_stage(self) -> None:
+        assert self.content is not None
+        self.content.pre_defined_extensions.multi_stage = True
+
+    def enable_split_apt_layers(self) -> None:
+        assert self.content is not None
+        self.content.pre_defined_extensions.split_apt_layers = True
+
+    def apply_updates(self, updates: dict[str, Any]) -> None:
+        """
+        Apply the updates of Dockerfile plugin extensions to the pre-defined extensions.
+
+        Lists are extended, other values replaced.
+
+        :raises DockerfileExtensionError: if a key is not a pre-defined extension
+        """
+        assert self.content is not None
+        predefs = self.content.pre_defined_extensions
+        names = {f.name for f in fields(predefs)}
+        for key, value in updates.items():
+            if key not in names:
+                raise DockerfileExtensionError(
+                    f"'{key}' is not a pre-defined extension, expected one of: "
+                    + ", ".join(sorted(names))
+                )
+            current = getattr(predefs, key)
+            if isinstance(current, list) and isinstance(value, list):
+                current.extend(value)
+            else:
+                setattr(predefs, key, value)
+
     @override
     def parse_file(self, file: TextIO) -> DockerfileExtension:
-        data: dict[str, Any] = json.load(file)
+        data: dict[str, Any] = jsonc.load(file)
         predefs = PredefinedExtensions(
             image=data.get("pre-defined-extensions", {}).get("image", None),
             pre_package_install=filter_empty_strings(
@@ -71,6 +113,13 @@ class DockerfileHandler(FileHandler[DockerfileExtension]):
             additional_user_commands=filter_empty_strings(
                 data.get("pre-defined-extensions", {}).get("additional_user_commands", [])
             ),
+            buildkit_cache=bool(
+                data.get("pre-defined-extensions", {}).get("buildkit_cache", False)
+            ),
+            multi_stage=bool(data.get("pre-defined-extensions", {}).get("multi_stage", False)),
+            split_apt_layers=bool(
+                data.get("pre-defined-extensions", {}).get("split_apt_layers", False)
+            ),
         )
 
         insertions = [
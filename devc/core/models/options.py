@@ -12,8 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Any
 
 
 @dataclass
@@ -21,11 +22,21 @@ class Options:
     path: Path = Path("")
     extend_with: Path = Path("")
     override: bool = False
+    incremental: bool = False
+
+    def content_options(self) -> dict[str, Any]:
+        """Return the options which affect the content of the generated file."""
+        options = asdict(self)
+        del options["override"], options["incremental"]
+        return options
 
 
 @dataclass
 class DockerfileOptions(Options):
     image: str = ""
+    optimize_layers: bool = False
+    # pinned versions of the apt packages
+    apt_lockfile: Path | None = None
 
 
 @dataclass
@@ -33,3 +44,5 @@ class DevContainerJsonOptions(Options):
     name: str = ""
     image: str = ""
     dockerfile: Path = Path("")
+    # use the directory of the Dockerfile as build context if possible
+    minimal_context: bool = False
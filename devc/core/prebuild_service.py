@@ -0,0 +1,269 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Prebuild the image of a generated devcontainer once per content.
+
+The content hash covers the Dockerfile, the ``--extend-with`` patch it has
+been generated with and the build args. If the Dockerfile copies files from
+the build context, it covers the files of the context which are not excluded
+by its ``.dockerignore`` as well, except for the rewritten devcontainer.json.
+Images are labeled with it, so an image built for an identical devcontainer,
+e.g. of another repository, is found and reused instead of being built again.
+The devcontainer.json is then rewritten to use the prebuilt image, either as
+``image`` or as a ``build.cacheFrom`` source of the still built Dockerfile.
+BuildKit only uses images with cache metadata as cache source, so images
+referenced as ``build.cacheFrom`` are built by buildx with an inline cache.
+"""
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+import hashlib
+import json
+import os
+import re
+
+from devc.constants.build_constants import BUILD_CONSTANTS
+from devc.core.build_service import BuildRequest, BuildResult, BuildService
+from devc.core.exceptions.build_exceptions import PrebuildError
+from devc.core.generation_record import GenerationRecord, get_record_path, hash_text
+from devc.utils.docker_utils import get_docker_client
+from devc.utils.dockerfile_parsing import find_context_copy
+from devc.utils.dockerignore import DockerIgnore
+from devc.utils.files import atomic_write_text
+from devc.utils import jsonc
+from devc.utils.lazy_import import lazy_import
+from devc.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    import docker
+else:
+    docker = lazy_import("docker")
+
+logger = get_logger(__name__)
+
+# label holding the content hash of prebuilt images
+PREBUILD_LABEL = "io.devc.content-hash"
+
+_LOCAL_ENV_PATTERN = re.compile(r"\$\{localEnv:([^}:]+)(?::([^}]*))?\}")
+
+
+@dataclass
+class PrebuildResult:
+    tag: str
+    content_hash: str
+    # None if an existing image has been reused
+    build: BuildResult | None
+
+
+class PrebuildService:
+    def __init__(
+        self,
+        build_service: BuildService,
+        client_factory: Callable[[], "docker.APIClient"] = get_docker_client,
+    ) -> None:
+        self._build_service = build_service
+        self._client_factory = client_factory
+
+    def prebuild(
+        self,
+        devcontainer_json: Path,
+        *,
+        extend_with: Path | None = None,
+        build_args: dict[str, str] | None = None,
+        reference: str = "cache-from",
+        repository: str = BUILD_CONSTANTS.PREBUILD_REPOSITORY,
+        backend: str = "auto",
+    ) -> PrebuildResult:
+        """
+        Build the image of ``devcontainer_json`` unless it exists and reference it.
+
+        The ``build_args`` are added to the args of the devcontainer.json.
+
+        :raises PrebuildError: if the devcontainer.json does not build a Dockerfile or
+            the sdk backend is requested to build a cache source
+        :raises BuildError: if the image build fails
+        :raises DependencyMissing: if the Docker daemon is not reachable
+        """
+        if reference not in BUILD_CONSTANTS.PREBUILD_REFERENCES:
+            raise PrebuildError(
+                f"Unknown reference '{reference}', expected one of: "
+                + ", ".join(BUILD_CONSTANTS.PREBUILD_REFERENCES)
+            )
+        # the classic builder of the sdk backend can not export an inline cache
+        inline_cache = reference == "cache-from"
+        if inline_cache and backend == "sdk":
+            raise PrebuildError(
+                "Referencing the prebuilt image as cache source requires the buildx backend, "
+                "use '--reference image' to build it with the sdk backend."
+            )
+        data, comments = _read_json(devcontainer_json)
+        build = data.get("build")
+        if not isinstance(build, dict) or not build.get("dockerfile"):
+            raise PrebuildError(f"{devcontainer_json} does not build an image from a Dockerfile.")
+
+        # paths of the build section are relative to the devcontainer.json
+        directory = devcontainer_json.parent
+        dockerfile = Path(os.path.normpath(directory / build["dockerfile"]))
+        context = Path(os.path.normpath(directory / build.get("context", ".")))
+        args = {
+            key: _substitute_local_env(str(value))
+            for key, value in (build.get("args") or {}).items()
+        }
+        args.update(build_args or {})
+        dockerfile_text = _read_text(dockerfile)
+        copies_context = find_context_copy(dockerfile_text.splitlines()) is not None
+        content_hash = get_content_hash(
+            dockerfile_text,
+            _read_text(extend_with) if extend_with is not None else "",
+            args,
+            context_hash=(
+                get_context_hash(context, exclude=_get_written_paths(devcontainer_json))
+                if copies_context
+                else ""
+            ),
+            inline_cache=inline_cache,
+        )
+        tag = f"{repository}:{content_hash[:16]}"
+
+        result = PrebuildResult(tag=tag, content_hash=content_hash, build=None)
+        if self._tag_existing_image(content_hash, tag):
+            logger.info("Reusing the prebuilt image %s", tag)
+        else:
+            result.build = self._build_service.build(
+                BuildRequest(
+                    dockerfile=dockerfile,
+                    context=context,
+                    tag=tag,
+                    build_args=args,
+                    cache_to=["type=inline"] if inline_cache else [],
+                    backend=backend,
+                    labels={PREBUILD_LABEL: content_hash},
+                )
+            )
+        _reference_image(devcontainer_json, data, comments, tag, reference)
+        return result
+
+    def _tag_existing_image(self, content_hash: str, tag: str) -> bool:
+        """Return whether an image with ``content_hash`` exists, tag it as ``tag`` if needed."""
+        client = self._client_factory()
+        try:
+            images = client.images(filters={"label": f"{PREBUILD_LABEL}={content_hash}"})
+            if not images:
+                return False
+            image = images[0]
+            if tag not in (image.get("RepoTags") or []):
+                repository, _, name = tag.rpartition(":")
+                client.tag(image["Id"], repository, name)
+        except docker.errors.DockerException as e:
+            raise PrebuildError(f"The Docker daemon failed to look up prebuilt images: {e}") from e
+        return True
+
+
+def get_content_hash(
+    dockerfile: str,
+    extend_with: str,
+    build_args: dict[str, str],
+    *,
+    context_hash: str = "",
+    inline_cache: bool = False,
+) -> str:
+    """Return the hash identifying the image built from the given inputs."""
+    data = json.dumps(
+        {
+            "dockerfile": dockerfile,
+            "extend_with": extend_with,
+            "build_args": build_args,
+            "context": context_hash,
+            "inline_cache": inline_cache,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def get_context_hash(context: Path, exclude: Iterable[Path] = ()) -> str:
+    """
+    Return the hash of the paths and contents of the files sent as build ``context``.
+
+    The files ``exclude`` are skipped.
+    """
+    ignore = DockerIgnore.from_file(context / ".dockerignore")
+    excluded = {os.path.abspath(path) for path in exclude}
+    digest = hashlib.sha256()
+    for path, entry in sorted(ignore.iter_files(context), key=lambda item: item[0]):
+        if os.path.abspath(entry.path) in excluded:
+            continue
+        try:
+            if entry.is_symlink():
+                content = hashlib.sha256(os.readlink(entry.path).encode("utf-8"))
+            else:
+                with open(entry.path, "rb") as f:
+                    content = hashlib.file_digest(f, "sha256")
+        except OSError as e:
+            raise PrebuildError(f"Can not read {entry.path} of the build context: {e}") from e
+        digest.update(path.encode("utf-8") + b"\0" + content.digest())
+    return digest.hexdigest()
+
+
+def _reference_image(
+    path: Path, data: dict[str, Any], comments: jsonc.Comments, tag: str, reference: str
+) -> None:
+    if reference == "image":
+        del data["build"]
+        data["image"] = tag
+    else:
+        cache_from = data["build"].get("cacheFrom") or []
+        cache_from = [cache_from] if isinstance(cache_from, str) else list(cache_from)
+        # images of previous prebuilds of this devcontainer are outdated
+        repository = tag.rpartition(":")[0]
+        cache_from = [image for image in cache_from if image.rpartition(":")[0] != repository]
+        data["build"]["cacheFrom"] = [tag, *cache_from]
+
+    # keep a file generated with --incremental regeneratable
+    record = GenerationRecord.read(path)
+    text = jsonc.dumps(data, indent=4, comments=comments)
+    if record is not None and record.is_unmodified(path):
+        GenerationRecord(inputs=record.inputs, output=hash_text(text)).write(path)
+    atomic_write_text(path, text)
+    logger.info("Referenced the prebuilt image %s as %s in %s", tag, reference, path)
+
+
+def _get_written_paths(devcontainer_json: Path) -> list[Path]:
+    """Return the paths rewritten by a prebuild, they change with every new prebuild."""
+    return [devcontainer_json, get_record_path(devcontainer_json)]
+
+
+def _substitute_local_env(value: str) -> str:
+    """Substitute ``${localEnv:NAME}`` and ``${localEnv:NAME:default}`` in ``value``."""
+    return _LOCAL_ENV_PATTERN.sub(
+        lambda match: os.environ.get(match.group(1), match.group(2) or ""), value
+    )
+
+
+def _read_json(path: Path) -> tuple[dict[str, Any], jsonc.Comments]:
+    try:
+        data, comments = jsonc.loads_with_comments(_read_text(path))
+    except json.JSONDecodeError as e:
+        raise PrebuildError(f"{path} is not valid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise PrebuildError(f"{path} does not hold a JSON object.")
+    return data, comments
+
+
+def _read_text(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8")
+    except OSError as e:
+        raise PrebuildError(f"Can not read {path}: {e}") from e
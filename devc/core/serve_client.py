@@ -0,0 +1,117 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Forward a devc command line to the ``devc serve`` daemon.
+
+The client is only imported by devc runs which may be forwarded, see
+:func:`devc.utils.forwarding.is_forwarding_enabled`. A request is a JSON line
+``{"command", "plugin", "argv", "cwd", "env"}`` sent together with the standard streams
+of the client, so the daemon prints to and prompts on the terminal of the client. The
+daemon answers with JSON lines, ``{"status": "started", "pid": ...}`` once it runs the
+command and ``{"rc": ...}`` once the command finished.
+"""
+from pathlib import Path
+from typing import BinaryIO
+import hashlib
+import json
+import os
+import signal
+import sys
+import tempfile
+
+from devc.utils.forwarding import is_forwarding_enabled
+
+# Overrides the path of the socket of the daemon.
+SOCKET_ENV = "DEVC_SOCKET"
+
+
+def get_socket_path() -> Path:
+    """
+    Return the path of the socket of the daemon.
+
+    The path is ``$DEVC_SOCKET`` if set. Otherwise there is one socket per user, interpreter
+    and import path in ``$XDG_RUNTIME_DIR`` (defaulting to the temp directory), so a client
+    only talks to a daemon running the same installation of devc.
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return Path(path)
+    key = hashlib.sha256("\0".join([sys.executable, *sys.path]).encode()).hexdigest()[:16]
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(directory, f"devc-{os.getuid()}-{key}.sock")
+
+
+def forward_to_server(argv: list[str], *, socket_path: Path | None = None) -> int | None:
+    """
+    Run the command line ``argv`` by the daemon and return its exit code.
+
+    Returns None if the daemon is not running or did not start the command, e.g. while
+    it reloads, the caller runs the command in-process then.
+    """
+    if not is_forwarding_enabled(argv):
+        return None
+    path = socket_path or get_socket_path()
+    if not path.exists():
+        return None
+    # only paid if a daemon may be running
+    import socket
+
+    request = {
+        "command": argv[0],
+        "argv": argv[1:],
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+            socket.send_fds(sock, [_encode(request)], [0, 1, 2])
+            reader = sock.makefile("rb")
+            status = _decode(reader.readline())
+        except (OSError, ValueError):
+            # not running, e.g. a stale socket, or closed by a reloading daemon
+            return None
+        if "error" in status:
+            print(f"devc serve: {status['error']}", file=sys.stderr)
+            return int(status.get("rc", 2))
+        result = _read_result(reader, int(status["pid"]))
+    if "rc" not in result:
+        print("devc serve: the daemon stopped while running the command", file=sys.stderr)
+        return 1
+    return int(result["rc"])
+
+
+def _read_result(reader: BinaryIO, pid: int) -> dict:
+    try:
+        return _decode(reader.readline())
+    except KeyboardInterrupt:
+        # the terminal interrupts the client only, pass it on to the command
+        os.kill(pid, signal.SIGINT)
+        return _read_result(reader, pid)
+    except (OSError, ValueError):
+        return {}
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message).encode("utf-8") + b"\n"
+
+
+def _decode(line: bytes) -> dict:
+    """Decode a JSON line, an empty line means the connection has been closed."""
+    if not line:
+        raise ValueError("connection closed")
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("expected a JSON object")
+    return message
@@ -0,0 +1,322 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+The ``devc serve`` daemon running devc command lines of thin clients.
+
+The daemon loads the extensions, compiles the templates and looks up the Docker daemon
+once. Each request is run in a process forked from the warm daemon, so requests run
+concurrently without sharing their working directory, environment or output. See
+:mod:`devc.core.serve_client` for the protocol.
+"""
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+import contextlib
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+
+from devc_cli_plugin_system.entry_points import (
+    EXTENSION_POINT_GROUP_NAME,
+    get_entry_points_fingerprint,
+    get_indexed_group_names,
+)
+from devc_cli_plugin_system.plugin_system import instantiate_extensions
+from devc.core.exceptions.devc_exceptions import DependencyMissing
+from devc.core.exceptions.serve_exceptions import ServeError, ServeRequestError
+from devc.core.template_loader import get_default_template_loader
+from devc.utils.console import reset_console
+from devc.utils.docker_utils import get_docker_daemon_facts
+from devc.utils.forwarding import LOCAL_COMMANDS
+from devc.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Largest request accepted, the request holds the environment of the client.
+MAX_REQUEST_SIZE = 1024**2
+_RECEIVE_SIZE = 64 * 1024
+# Modules of the command output, imported up front instead of by each request.
+WARM_MODULES = ("docker", "rich.console", "rich.logging", "rich.panel", "rich.table")
+
+
+@dataclass
+class ServeRequest:
+    command: str
+    cwd: str
+    plugin: str = ""
+    argv: list[str] = field(default_factory=list)
+    # the environment of the command, None keeps the one of the daemon
+    env: dict[str, str] | None = None
+
+    @classmethod
+    def from_json(cls, data: Any) -> "ServeRequest":
+        """
+        Create a request from a decoded JSON object.
+
+        :raises ServeRequestError: if a field is missing or has the wrong type
+        """
+        if not isinstance(data, dict):
+            raise ServeRequestError("The request has to be a JSON object.")
+        command, cwd = data.get("command"), data.get("cwd")
+        plugin, argv, env = data.get("plugin", ""), data.get("argv", []), data.get("env")
+        if not isinstance(command, str) or not command or command in LOCAL_COMMANDS:
+            raise ServeRequestError(f"Invalid command {command!r}.")
+        if not isinstance(cwd, str) or not os.path.isabs(cwd):
+            raise ServeRequestError(f"The cwd has to be an absolute path, got {cwd!r}.")
+        if not isinstance(plugin, str):
+            raise ServeRequestError(f"Invalid plugin {plugin!r}.")
+        if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+            raise ServeRequestError("The argv has to be a list of strings.")
+        if env is not None and (
+            not isinstance(env, dict)
+            or not all(isinstance(k, str) and isinstance(v, str) for k, v in env.items())
+        ):
+            raise ServeRequestError("The env has to map strings to strings.")
+        return cls(command=command, cwd=cwd, plugin=plugin, argv=argv, env=env)
+
+    def to_argv(self) -> list[str]:
+        return [self.command, *([self.plugin] if self.plugin else []), *self.argv]
+
+
+class ServeService:
+    """
+    Run devc command lines received on a Unix domain socket.
+
+    The ``runner`` runs a command line and returns its exit code. The daemon re-executes
+    itself to load upgraded plugins if the installed distributions change or on SIGHUP.
+    """
+
+    def __init__(
+        self,
+        socket_path: Path,
+        *,
+        runner: Callable[[list[str]], int] | None = None,
+        fingerprint: Callable[[], str] = get_entry_points_fingerprint,
+    ) -> None:
+        self.socket_path = socket_path
+        self._runner = runner or _run_cli
+        self._fingerprint = fingerprint
+        # taken before the warm up, so distributions changed meanwhile are reloaded
+        self._loaded_fingerprint = fingerprint()
+        self._reload_requested = False
+        self._server: "_ForkingUnixServer | None" = None
+
+    def warm_up(self) -> None:
+        """Load what every request would load, the forked requests inherit it."""
+        for group_name in get_indexed_group_names():
+            # the extension points are the abstract base classes of the extensions
+            if group_name != EXTENSION_POINT_GROUP_NAME:
+                instantiate_extensions(group_name)
+        get_default_template_loader().preload_templates()
+        for module in WARM_MODULES:
+            with contextlib.suppress(ImportError):
+                importlib.import_module(module)
+        with contextlib.suppress(DependencyMissing):
+            # cached in memory, the client of the daemon is not shared with the requests
+            get_docker_daemon_facts()
+
+    def needs_reload(self) -> bool:
+        """Return whether the daemon has to reload, e.g. as a plugin has been installed."""
+        return self._reload_requested or self._fingerprint() != self._loaded_fingerprint
+
+    @property
+    def reload_requested(self) -> bool:
+        return self._reload_requested
+
+    def request_reload(self) -> None:
+        """Reload once the running requests finished, e.g. on SIGHUP."""
+        self._reload_requested = True
+
+    def serve(self) -> None:
+        """
+        Listen on the socket until the daemon is terminated or reloads.
+
+        :raises ServeError: if another daemon listens on the socket
+        """
+        server = self.bind()
+        signal.signal(signal.SIGHUP, lambda signum, frame: self.request_reload())
+        signal.signal(signal.SIGTERM, _exit)
+        logger.info("Serving devc on %s", self.socket_path)
+        try:
+            server.serve_forever()
+        finally:
+            self.close()
+
+    def bind(self) -> "_ForkingUnixServer":
+        """
+        Create the server listening on the socket, only accessible by the current user.
+
+        :raises ServeError: if another daemon listens on the socket
+        """
+        if _is_listening(self.socket_path):
+            raise ServeError(f"A devc daemon is already listening on {self.socket_path}.")
+        with contextlib.suppress(FileNotFoundError):
+            # left behind by a daemon which has been killed
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        umask = os.umask(0o177)
+        try:
+            self._server = _ForkingUnixServer(str(self.socket_path), self)
+        finally:
+            os.umask(umask)
+        return self._server
+
+    def close(self) -> None:
+        """Stop listening and wait for the running requests."""
+        if self._server is None:
+            return
+        self._server.server_close()
+        self._server = None
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+    def reload(self) -> None:
+        """Re-execute the daemon, plugins which are already imported can not be reloaded."""
+        logger.info("Reloading devc serve")
+        self.close()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(sys.executable, [sys.executable, *sys.orig_argv[1:]])
+
+    def handle(self, connection: socket.socket) -> None:
+        """Run a request within the forked process handling ``connection``."""
+        try:
+            request, fds = _receive_request(connection)
+        except ServeRequestError as e:
+            _send(connection, {"error": str(e), "rc": 2})
+            return
+        _send(connection, {"status": "started", "pid": os.getpid()})
+        rc = self.run(request, fds)
+        _send(connection, {"rc": rc})
+
+    def run(self, request: ServeRequest, fds: list[int]) -> int:
+        """Run ``request`` printing to the standard streams ``fds`` of the client."""
+        for signum in (signal.SIGHUP, signal.SIGTERM):
+            signal.signal(signum, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        if request.env is not None:
+            os.environ.clear()
+            os.environ.update(request.env)
+        with _redirect_streams(fds):
+            # the console of the daemon has been created for the terminal of the daemon
+            reset_console()
+            try:
+                os.chdir(request.cwd)
+                return self._runner(request.to_argv())
+            except SystemExit as e:
+                # argparse reports invalid arguments and --help this way
+                return e.code if isinstance(e.code, int) else int(e.code is not None)
+            except Exception as e:
+                logger.error("devc serve failed to run %s: %s", request.to_argv(), e)
+                return 1
+
+
+class _ForkingUnixServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    # wait for the running requests before the daemon stops or reloads
+    block_on_close = True
+
+    def __init__(self, socket_path: str, service: ServeService) -> None:
+        self.service = service
+        super().__init__(socket_path, _RequestHandler)
+
+    def verify_request(self, request: Any, client_address: Any) -> bool:
+        # the socket is private, but the peer is checked as well where possible
+        if hasattr(socket, "SO_PEERCRED"):
+            creds = request.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+            _, uid, _ = struct.unpack("3i", creds)
+            if uid != os.getuid():
+                logger.warning("Rejected a devc serve request of user %s", uid)
+                return False
+        if self.service.needs_reload():
+            # the client runs the command in-process while the daemon reloads
+            self.service.request_reload()
+            return False
+        return True
+
+    def service_actions(self) -> None:
+        super().service_actions()
+        if self.service.reload_requested:
+            self.service.reload()
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    server: _ForkingUnixServer
+
+    def handle(self) -> None:
+        self.server.service.handle(self.request)
+
+
+def _exit(signum: int, frame: Any) -> None:
+    sys.exit(0)
+
+
+def _run_cli(argv: list[str]) -> int:
+    from devc.cli import main
+
+    return main(argv=argv)
+
+
+def _receive_request(connection: socket.socket) -> tuple[ServeRequest, list[int]]:
+    data, fds, _, _ = socket.recv_fds(connection, _RECEIVE_SIZE, 3)
+    while not data.endswith(b"\n"):
+        chunk = connection.recv(_RECEIVE_SIZE)
+        if not chunk or len(data) + len(chunk) > MAX_REQUEST_SIZE:
+            for fd in fds:
+                os.close(fd)
+            raise ServeRequestError("The request has to be a JSON line of at most 1 MiB.")
+        data += chunk
+    try:
+        request = ServeRequest.from_json(json.loads(data))
+    except (ValueError, ServeRequestError) as e:
+        for fd in fds:
+            os.close(fd)
+        raise ServeRequestError(str(e)) from e
+    return request, fds
+
+
+def _send(connection: socket.socket, message: dict) -> None:
+    with contextlib.suppress(OSError):
+        # the client may be gone, e.g. interrupted
+        connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+@contextlib.contextmanager
+def _redirect_streams(fds: list[int]) -> Any:
+    """Use ``fds`` as stdin, stdout and stderr, without them the output is discarded."""
+    with contextlib.ExitStack() as stack:
+        if len(fds) != 3:
+            devnull = stack.enter_context(open(os.devnull, "r+b"))
+            fds = [devnull.fileno()] * 3
+        for fd, target in zip(fds, (0, 1, 2)):
+            os.dup2(fd, target)
+        try:
+            yield
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+
+def _is_listening(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
@@ -0,0 +1,138 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Precompiled template bundles which can be shipped inside the wheel.
+
+A bundle is a zip file created by ``jinja2.Environment.compile_templates``
+with an additional manifest holding the Jinja version and a checksum of the
+source of each template. A template is only loaded from the bundle if its
+source still matches the checksum, otherwise it is compiled from source.
+
+Create the bundle of the templates shipped with devc before building the wheel::
+
+    python -m devc.core.template_bundle
+"""
+from pathlib import Path
+from typing import Any, Callable, MutableMapping
+import argparse
+import hashlib
+import json
+import zipfile
+
+import jinja2
+from jinja2.utils import internalcode
+
+from devc.constants.templates import TEMPLATES
+
+BUNDLE_MANIFEST = "manifest.json"
+
+
+class PrecompiledLoader(jinja2.BaseLoader):
+    """Load templates from a precompiled bundle if their source did not change since."""
+
+    def __init__(self, bundle: Path, fallback: jinja2.BaseLoader) -> None:
+        self._fallback = fallback
+        self._checksums = read_bundle_checksums(bundle)
+        self._module_loader = jinja2.ModuleLoader(str(bundle)) if self._checksums else None
+
+    def get_source(
+        self, environment: jinja2.Environment, template: str
+    ) -> tuple[str, str | None, Callable[[], bool] | None]:
+        return self._fallback.get_source(environment, template)
+
+    def list_templates(self) -> list[str]:
+        return self._fallback.list_templates()
+
+    @internalcode
+    def load(
+        self,
+        environment: jinja2.Environment,
+        name: str,
+        globals: MutableMapping[str, Any] | None = None,
+    ) -> jinja2.Template:
+        if self._module_loader is not None and name in self._checksums:
+            source, _, _ = self.get_source(environment, name)
+            if self._checksums[name] == _checksum(source):
+                return self._module_loader.load(environment, name, globals)
+        return super().load(environment, name, globals)
+
+
+def compile_template_bundle(environment: jinja2.Environment, target: Path) -> list[str]:
+    """
+    Compile the ``*.j2`` templates of ``environment`` into the bundle ``target``.
+
+    :returns: the names of the compiled templates
+    """
+    assert environment.loader is not None
+    names = environment.list_templates(extensions=["j2"])
+    target.parent.mkdir(parents=True, exist_ok=True)
+    environment.compile_templates(str(target), extensions=["j2"], ignore_errors=False)
+    manifest = {
+        "jinja2": jinja2.__version__,
+        "templates": {
+            name: _checksum(environment.loader.get_source(environment, name)[0]) for name in names
+        },
+    }
+    with zipfile.ZipFile(target, "a") as bundle:
+        bundle.writestr(BUNDLE_MANIFEST, json.dumps(manifest, indent=2, sort_keys=True))
+    return names
+
+
+def read_bundle_checksums(bundle: Path) -> dict[str, str]:
+    """
+    Return the source checksums of the templates in ``bundle``.
+
+    The mapping is empty if the bundle can not be read or has been compiled
+    with another Jinja version.
+    """
+    try:
+        with zipfile.ZipFile(bundle) as f:
+            manifest = json.loads(f.read(BUNDLE_MANIFEST))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return {}
+    if manifest.get("jinja2") != jinja2.__version__:
+        return {}
+    return dict(manifest.get("templates", {}))
+
+
+def _checksum(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def main() -> None:
+    from devc.core.template_loader import TemplateLoader
+
+    parser = argparse.ArgumentParser(description="Precompile the Jinja templates of devc.")
+    parser.add_argument(
+        "--template-dir",
+        type=Path,
+        default=TEMPLATES.TEMPLATE_DIR,
+        help="Directory containing the templates",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=TEMPLATES.PRECOMPILED_TEMPLATES,
+        help="Path of the bundle to create",
+    )
+    args = parser.parse_args()
+    # compile from source, not from an existing bundle which is about to be replaced
+    loader = TemplateLoader(args.template_dir, precompiled=None, bytecode_cache=None)
+    args.output.unlink(missing_ok=True)
+    names = compile_template_bundle(loader.env, args.output)
+    print(f"Compiled {len(names)} templates into '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,46 +14,128 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from jinja2 import (
-    Environment,
-    FileSystemLoader,
-    Template,
-    StrictUndefined,
-    Undefined,
-    UndefinedError,
-)
+from typing import TYPE_CHECKING
+import functools
+
+from devc.constants.templates import TEMPLATES
+from devc.utils.cache import get_cache_dir, is_cache_enabled
+from devc.utils.lazy_import import lazy_import
+from devc.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    import jinja2
+    from jinja2 import BytecodeCache, Template, Undefined
+else:
+    jinja2 = lazy_import("jinja2")
+
+logger = get_logger(__name__)
 
 
 class TemplateLoaderABC(ABC):
     @abstractmethod
-    def load_template(self, template_name: str) -> Template:
+    def load_template(self, template_name: str) -> "Template":
         """Load a Jinja2 template by filename."""
         pass
 
+    @abstractmethod
+    def get_template_source(self, template_name: str) -> str:
+        """Return the source of a Jinja2 template by filename."""
+        pass
+
 
 class TemplateLoader(TemplateLoaderABC):
-    def __init__(self, template_dir: Path, undefined: type[Undefined] = StrictUndefined):
-        """Initialize the loader with the directory containing Jinja2 templates."""
+    def __init__(
+        self,
+        template_dir: Path,
+        undefined: "type[Undefined] | None" = None,
+        *,
+        bytecode_cache: "BytecodeCache | None" = None,
+        precompiled: Path | None = None,
+    ):
+        """
+        Initialize the loader with the directory containing Jinja2 templates.
+
+        Templates are rendered with ``jinja2.StrictUndefined`` unless another
+        ``undefined`` type is passed. Compiled templates are stored in the
+        ``bytecode_cache`` if given. If ``precompiled`` points to a bundle created
+        by ``devc.core.template_bundle``, unchanged templates are loaded from it
+        instead of being compiled.
+        """
         if not template_dir.is_dir():
             raise NotADirectoryError(f"Template directory does not exist: {template_dir}")
-        self.env = Environment(
-            loader=FileSystemLoader(str(template_dir)),
-            undefined=undefined,
+        loader: jinja2.BaseLoader = jinja2.FileSystemLoader(str(template_dir))
+        if precompiled is not None and precompiled.is_file():
+            from devc.core.template_bundle import PrecompiledLoader
+
+            loader = PrecompiledLoader(precompiled, fallback=loader)
+        self.env = jinja2.Environment(
+            loader=loader,
+            undefined=undefined or jinja2.StrictUndefined,
+            bytecode_cache=bytecode_cache,
         )
         self.env.filters["required"] = self._required_filter
 
         self.template_dir = template_dir
 
-    def load_template(self, template_name: str) -> Template:
+    def load_template(self, template_name: str) -> "Template":
         """Load a Jinja2 template by filename."""
         try:
             return self.env.get_template(template_name)
         except Exception as e:
             raise FileNotFoundError(f"Template not found: {template_name}") from e
 
+    def get_template_source(self, template_name: str) -> str:
+        """Return the source of a Jinja2 template by filename."""
+        assert self.env.loader is not None
+        try:
+            source: str = self.env.loader.get_source(self.env, template_name)[0]
+        except Exception as e:
+            raise FileNotFoundError(f"Template not found: {template_name}") from e
+        return source
+
+    def preload_templates(self) -> None:
+        """Compile all templates up front, e.g. before forking worker processes."""
+        for template_name in self.env.list_templates(extensions=["j2"]):
+            self.load_template(template_name)
+
     @staticmethod
     def _required_filter(value: str, field_name: str) -> str:
         """Require non-empty value or raise error."""
         if not value or (isinstance(value, str) and not value.strip()):
-            raise UndefinedError(f"Required field '{field_name}' cannot be empty")
+            raise jinja2.UndefinedError(f"Required field '{field_name}' cannot be empty")
         return value
+
+
+def get_template_bytecode_cache() -> "BytecodeCache | None":
+    """
+    Return the persistent bytecode cache for templates.
+
+    The cache is located in the devc cache directory, separated by Jinja
+    version. Jinja only uses a cached template if the checksum of its source
+    matches. ``None`` is returned if the on-disk caches are disabled.
+    """
+    if not is_cache_enabled():
+        return None
+    cache_dir = get_cache_dir(f"jinja2-{jinja2.__version__}")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.debug(f"Not caching templates, failed to create '{cache_dir}': {e}")
+        return None
+    return jinja2.FileSystemBytecodeCache(str(cache_dir))
+
+
+@functools.cache
+def get_default_template_loader() -> TemplateLoader:
+    """
+    Return the loader for the templates shipped with devc.
+
+    The loader is shared within the process, so each template is compiled at
+    most once. It uses the precompiled bundle if it has been shipped and the
+    persistent bytecode cache otherwise.
+    """
+    return TemplateLoader(
+        template_dir=TEMPLATES.TEMPLATE_DIR,
+        bytecode_cache=get_template_bytecode_cache(),
+        precompiled=TEMPLATES.PRECOMPILED_TEMPLATES,
+    )
@@ -12,30 +12,38 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from jinja2 import Template, meta
 from pathlib import Path
-from typing import Any
+from typing import Any, TYPE_CHECKING
+
+from devc.utils.files import atomic_write_text
+from devc.utils.profiling import span
+
+if TYPE_CHECKING:
+    from jinja2 import Template
 
 
 class TemplateMachine:
 
-    def get_undeclared_variables(self, template: Template) -> set[str]:
+    def get_undeclared_variables(self, template: "Template") -> set[str]:
         """Return the set of undeclared variables (no default provided in the template)."""
+        from jinja2 import meta
+
         res: set[str] = meta.find_undeclared_variables(template)
         return res
 
-    def render_template(self, template: Template, context: dict[str, Any]) -> str:
+    def render_template(self, template: "Template", context: dict[str, Any]) -> str:
         """Render the template with the given context dictionary."""
-        res: str = template.render(**context)
+        with span("template render"):
+            res: str = template.render(**context)
         return res
 
     def render_to_target(
-        self, template: Template, target_path: Path, context: dict[str, Any]
+        self, template: "Template", target_path: Path, context: dict[str, Any]
     ) -> None:
         """
         Render the template and write it to the target path.
         Creates parent directories if needed.
         """
         rendered_content = self.render_template(template, context)
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        target_path.write_text(rendered_content)
+        with span("write"):
+            atomic_write_text(target_path, rendered_content)
@@ -0,0 +1,40 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Helpers to locate the on-disk cache of devc."""
+from pathlib import Path
+import os
+
+# Overrides the cache directory, e.g. for CI agents sharing a cache volume.
+CACHE_DIR_ENV = "DEVC_CACHE_DIR"
+# Set to a truthy value to neither read nor write any on-disk cache.
+NO_CACHE_ENV = "DEVC_NO_CACHE"
+
+
+def is_cache_enabled() -> bool:
+    """Return False if the on-disk caches are disabled with ``DEVC_NO_CACHE``."""
+    return os.environ.get(NO_CACHE_ENV, "").strip().lower() in ("", "0", "false", "no")
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """
+    Return the cache directory of devc or a sub directory of it.
+
+    The directory is ``$DEVC_CACHE_DIR`` if set, otherwise ``$XDG_CACHE_HOME/devc``
+    (defaulting to ``~/.cache/devc``). The directory is not created.
+    """
+    base = os.environ.get(CACHE_DIR_ENV)
+    if not base:
+        xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+        base = os.path.join(xdg_cache_home, "devc")
+    return Path(base, *parts)
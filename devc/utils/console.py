@@ -11,38 +11,75 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
+from typing import Iterator, TYPE_CHECKING
+import contextlib
+import io
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
 
+_console: "Console | None" = None
 
-def print_error(title: str, message: str) -> None:
-    color = "red"
-    console.print(
-        Panel.fit(
-            Text(message),
-            title=f"[{color}]{title}[/{color}]",
-            border_style=color,
-        )
+
+def get_console() -> "Console":
+    """Return the shared console, rich is only imported once something is printed."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+def reset_console() -> None:
+    """Drop the shared console, e.g. after the standard streams have been redirected."""
+    global _console
+    _console = None
+
+
+@contextlib.contextmanager
+def capture_console() -> Iterator[io.StringIO]:
+    """
+    Redirect everything printed to the shared console into the yielded buffer.
+
+    The buffer keeps the styling of the shared console, so it can be written to
+    the terminal later on, e.g. to print the output of parallel workers in order.
+    """
+    global _console
+    from rich.console import Console
+
+    console = get_console()
+    buffer = io.StringIO()
+    previous, _console = _console, Console(
+        file=buffer,
+        force_terminal=console.is_terminal,
+        color_system="auto" if console.color_system else None,
+        width=console.width,
+        no_color=console.no_color,
     )
+    try:
+        yield buffer
+    finally:
+        _console = previous
+
+
+def print_error(title: str, message: str) -> None:
+    _print_panel(title, message, color="red")
 
 
 def print_warning(title: str, message: str) -> None:
-    color = "yellow"
-    console.print(
-        Panel.fit(
-            Text(message),
-            title=f"[{color}]{title}[/{color}]",
-            border_style=color,
-        )
-    )
+    _print_panel(title, message, color="yellow")
 
 
 def print_signal(title: str, message: str) -> None:
-    color = "bright_black"
-    console.print(
+    _print_panel(title, message, color="bright_black")
+
+
+def _print_panel(title: str, message: str, color: str) -> None:
+    from rich.panel import Panel
+    from rich.text import Text
+
+    get_console().print(
         Panel.fit(
             Text(message),
             title=f"[{color}]{title}[/{color}]",
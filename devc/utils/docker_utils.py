@@ -11,17 +11,88 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import docker
-from packaging.version import Version
+"""
+Access to the Docker daemon.
+
+Connecting to the daemon and querying it can take a while, e.g. if the socket
+is behind a slow rootless proxy. Clients are therefore shared within a process
+and the facts about a daemon are cached on disk for ``DEVC_DOCKER_FACTS_TTL``
+seconds, keyed by ``DOCKER_HOST``.
+"""
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+import hashlib
+import json
+import os
+import time
+
+from packaging.version import InvalidVersion, Version
 from devc.core.exceptions.devc_exceptions import DependencyMissing
+from devc.utils.cache import get_cache_dir, is_cache_enabled
+from devc.utils.files import atomic_write_text
+from devc.utils.lazy_import import lazy_import
+from devc.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    import docker
+else:
+    docker = lazy_import("docker")
 
-def get_docker_client() -> docker.APIClient:
-    """Return a Docker client connected to the local daemon."""
-    try:
-        client = docker.from_env().api  # Docker SDK >= 2.0
-        client.ping()  # Ensure connection is valid
+logger = get_logger(__name__)
+
+# Timeout in seconds for connecting to and querying the daemon.
+DOCKER_TIMEOUT_ENV = "DEVC_DOCKER_TIMEOUT"
+DEFAULT_DOCKER_TIMEOUT = 2.0
+# Seconds the facts about a daemon are cached, 0 disables the cache.
+DOCKER_FACTS_TTL_ENV = "DEVC_DOCKER_FACTS_TTL"
+DEFAULT_DOCKER_FACTS_TTL = 300.0
+# Seconds an unreachable daemon is cached, so a started daemon is noticed soon.
+UNREACHABLE_DOCKER_FACTS_TTL = 30.0
+
+# clients keyed by DOCKER_HOST and pid, connections can not be shared with forked processes
+_clients: dict[tuple[str, int], "docker.APIClient"] = {}
+# facts keyed by DOCKER_HOST, None if the daemon was not reachable
+_facts: dict[str, tuple[float, "DockerDaemonFacts | None"]] = {}
+
+
+@dataclass(frozen=True)
+class DockerDaemonFacts:
+    version: str
+    runtimes: tuple[str, ...] = ()
+    default_runtime: str = ""
+    cgroup_driver: str = ""
+    # resources available to containers, 0 if unknown
+    cpus: int = 0
+    memory: int = 0
+
+    @property
+    def parsed_version(self) -> Version | None:
+        """
+        Return the version, handles versions like '17.09.0-ce'.
+
+        Returns None for versions which are not PEP 440 compatible, e.g. of some distribution
+        or Podman builds.
+        """
+        try:
+            return Version(self.version.split("-")[0] or "0.0.0")
+        except InvalidVersion:
+            return None
+
+    @property
+    def has_nvidia_runtime(self) -> bool:
+        return "nvidia" in self.runtimes
+
+
+def get_docker_client() -> "docker.APIClient":
+    """Return a Docker client connected to the daemon, shared within the process."""
+    key = (_get_docker_host(), os.getpid())
+    client = _clients.get(key)
+    if client is not None:
         return client
+    try:
+        # creating the client already queries the API version of the daemon
+        client = docker.from_env(timeout=_get_timeout()).api  # Docker SDK >= 2.0
     except (docker.errors.DockerException, docker.errors.APIError, ConnectionError) as ex:
         raise DependencyMissing(
             "Docker Client failed to connect to docker daemon. "
@@ -29,6 +100,32 @@ def get_docker_client() -> docker.APIClient:
             "has permission to access it (usually by being in the 'docker' group). "
             f"\nUnderlying error:\n{ex}"
         )
+    _clients[key] = client
+    return client
+
+
+def get_docker_daemon_facts() -> DockerDaemonFacts | None:
+    """
+    Return the facts about the Docker daemon or None if it is not reachable.
+
+    The facts are cached in memory and on disk, unreachable daemons are cached
+    for a shorter time.
+    """
+    host = _get_docker_host()
+    now = time.time()
+    ttl = _get_facts_ttl()
+    if host in _facts and _is_fresh(*_facts[host], now=now, ttl=ttl):
+        return _facts[host][1]
+
+    cached = _read_facts_cache(host, now=now, ttl=ttl)
+    if cached is not None:
+        _facts[host] = cached
+        return cached[1]
+
+    facts = _query_daemon_facts()
+    _facts[host] = (now, facts)
+    _write_facts_cache(host, now, facts, ttl=ttl)
+    return facts
 
 
 def get_docker_version() -> Version:
@@ -36,6 +133,93 @@ def get_docker_version() -> Version:
     Return the Docker server version as a packaging.version.Version instance.
     Handles versions like '17.09.0-ce'.
     """
-    client = get_docker_client()
-    version_raw = client.version().get("Version", "0.0.0")
-    return Version(version_raw.split("-")[0])
+    facts = get_docker_daemon_facts()
+    if facts is None:
+        raise DependencyMissing("Docker daemon is not reachable.")
+    if facts.parsed_version is None:
+        raise InvalidVersion(f"Invalid Docker version: '{facts.version}'")
+    return facts.parsed_version
+
+
+def _query_daemon_facts() -> DockerDaemonFacts | None:
+    try:
+        info = get_docker_client().info()
+    except Exception as e:
+        logger.debug(f"Failed to query the Docker daemon: {e}")
+        return None
+    return DockerDaemonFacts(
+        version=str(info.get("ServerVersion", "0.0.0")),
+        runtimes=tuple(sorted(info.get("Runtimes") or {})),
+        default_runtime=str(info.get("DefaultRuntime", "")),
+        cgroup_driver=str(info.get("CgroupDriver", "")),
+        cpus=int(info.get("NCPU") or 0),
+        memory=int(info.get("MemTotal") or 0),
+    )
+
+
+def _is_fresh(timestamp: float, facts: DockerDaemonFacts | None, *, now: float, ttl: float) -> bool:
+    max_age = ttl if facts is not None else min(ttl, UNREACHABLE_DOCKER_FACTS_TTL)
+    return 0 <= now - timestamp < max_age
+
+
+def _get_facts_cache_path(host: str) -> Path:
+    key = hashlib.sha256(host.encode("utf-8")).hexdigest()[:16]
+    return get_cache_dir(f"docker-facts-{key}.json")
+
+
+def _read_facts_cache(
+    host: str, *, now: float, ttl: float
+) -> tuple[float, DockerDaemonFacts | None] | None:
+    if not ttl or not is_cache_enabled():
+        return None
+    try:
+        data = json.loads(_get_facts_cache_path(host).read_text(encoding="utf-8"))
+        if data["host"] != host:
+            return None
+        facts = data["facts"]
+        entry = (
+            float(data["time"]),
+            (
+                None
+                if facts is None
+                else DockerDaemonFacts(**{**facts, "runtimes": tuple(facts["runtimes"])})
+            ),
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return entry if _is_fresh(*entry, now=now, ttl=ttl) else None
+
+
+def _write_facts_cache(
+    host: str, now: float, facts: DockerDaemonFacts | None, *, ttl: float
+) -> None:
+    if not ttl or not is_cache_enabled():
+        return
+    data: dict[str, Any] = {
+        "host": host,
+        "time": now,
+        "facts": None if facts is None else asdict(facts),
+    }
+    try:
+        atomic_write_text(_get_facts_cache_path(host), json.dumps(data))
+    except OSError as e:
+        logger.debug(f"Failed to cache the Docker daemon facts: {e}")
+
+
+def _get_docker_host() -> str:
+    return os.environ.get("DOCKER_HOST", "")
+
+
+def _get_timeout() -> float:
+    return _get_float_env(DOCKER_TIMEOUT_ENV, DEFAULT_DOCKER_TIMEOUT)
+
+
+def _get_facts_ttl() -> float:
+    return _get_float_env(DOCKER_FACTS_TTL_ENV, DEFAULT_DOCKER_FACTS_TTL)
+
+
+def _get_float_env(name: str, default: float) -> float:
+    try:
+        return max(float(os.environ[name]), 0.0)
+    except (KeyError, ValueError):
+        return default
@@ -0,0 +1,97 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Helper functions to work with the instructions of a Dockerfile."""
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+import re
+
+_KEYWORD_PATTERN = re.compile(r"^\s*([A-Za-z]+)(\s+|$)")
+
+
+@dataclass
+class Instruction:
+    # upper case keyword like RUN, empty for comments and blank lines
+    keyword: str
+    # the lines of the instruction including continuation lines
+    lines: list[str]
+
+    @property
+    def arguments(self) -> str:
+        """Return the arguments of the instruction with the line continuations joined."""
+        parts: list[str] = []
+        for line in self.lines:
+            stripped = line.strip()
+            if stripped.startswith("#") and parts:
+                continue  # comments within continuation lines are ignored by docker
+            parts.append(stripped.removesuffix("\\").strip())
+        text = " ".join(part for part in parts if part)
+        match = _KEYWORD_PATTERN.match(text)
+        if not match or not self.keyword:
+            return text
+        return text.removeprefix(match.group(0))
+
+
+def parse_instructions(lines: Iterable[str]) -> list[Instruction]:
+    """
+    Group the ``lines`` of a Dockerfile (or a fragment of it) into instructions.
+
+    Continuation lines belong to the instruction they continue. Comments and
+    blank lines outside of instructions are returned as instructions without a
+    keyword. Heredocs are not supported.
+    """
+    instructions: list[Instruction] = []
+    continued = False
+    for line in lines:
+        stripped = line.strip()
+        if continued:
+            instructions[-1].lines.append(line)
+            # comments and blank lines within an instruction do not end it
+            if stripped and not stripped.startswith("#"):
+                continued = stripped.endswith("\\")
+            continue
+        match = None if stripped.startswith("#") else _KEYWORD_PATTERN.match(line)
+        keyword = match.group(1).upper() if match else ""
+        instructions.append(Instruction(keyword=keyword, lines=[line]))
+        continued = bool(keyword) and stripped.endswith("\\")
+    return instructions
+
+
+def find_context_copy(lines: Iterable[str]) -> Instruction | None:
+    """Return the first COPY or ADD instruction of ``lines`` copying from the build context."""
+    for instruction in parse_instructions(lines):
+        if instruction.keyword in ("COPY", "ADD") and "--from=" not in instruction.arguments:
+            return instruction
+    return None
+
+
+def add_run_options(
+    lines: Iterable[str], options: str, predicate: Callable[[Instruction], bool]
+) -> list[str]:
+    """
+    Add ``options``, e.g. ``--mount=...``, to each RUN instruction matching ``predicate``.
+
+    Returns the lines with the options inserted after the RUN keyword.
+    """
+    result: list[str] = []
+    for instruction in parse_instructions(lines):
+        if instruction.keyword == "RUN" and predicate(instruction):
+            first, *rest = instruction.lines
+            match = _KEYWORD_PATTERN.match(first)
+            assert match is not None
+            arguments = first.removeprefix(match.group(0))
+            result.append(f"{match.group(0).rstrip()} {options} {arguments}".rstrip())
+            result.extend(rest)
+        else:
+            result.extend(instruction.lines)
+    return result
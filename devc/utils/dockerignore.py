@@ -0,0 +1,138 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Match paths against the patterns of a ``.dockerignore`` file.
+
+Patterns follow the rules of Docker: they are relative to the root of the
+build context, ``*`` and ``?`` do not match ``/``, ``**`` matches any number of
+directories and a leading ``!`` re-includes matching paths. A pattern matching
+a directory matches everything within it. The last matching pattern wins.
+"""
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+import os
+import posixpath
+import re
+
+
+@dataclass(frozen=True)
+class ContextSize:
+    files: int
+    bytes: int
+
+    def __str__(self) -> str:
+        size = float(self.bytes)
+        for unit in ("B", "KB", "MB", "GB"):
+            if size < 1024 or unit == "GB":
+                break
+            size /= 1024
+        return f"{size:.1f} {unit} in {self.files} files"
+
+
+class DockerIgnore:
+    def __init__(self, lines: Iterable[str]) -> None:
+        self._rules: list[tuple[re.Pattern[str], bool]] = []
+        for line in lines:
+            pattern = line.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            excluded = pattern.startswith("!")
+            pattern = posixpath.normpath(pattern.removeprefix("!").strip()).lstrip("/")
+            if pattern and pattern != ".":
+                self._rules.append((_compile(pattern), excluded))
+
+    @classmethod
+    def from_file(cls, path: Path) -> "DockerIgnore":
+        """Read the patterns of ``path``, no patterns if it does not exist."""
+        try:
+            return cls(path.read_text(encoding="utf-8").splitlines())
+        except FileNotFoundError:
+            return cls([])
+
+    @property
+    def has_exceptions(self) -> bool:
+        return any(excluded for _, excluded in self._rules)
+
+    def is_ignored(self, path: str) -> bool:
+        """Return whether the ``path`` relative to the context root is ignored."""
+        parts = path.strip("/").split("/")
+        candidates = ["/".join(parts[: i + 1]) for i in range(len(parts))]
+        ignored = False
+        for pattern, excluded in self._rules:
+            if any(pattern.fullmatch(candidate) for candidate in candidates):
+                ignored = not excluded
+        return ignored
+
+    def get_context_size(self, root: Path) -> ContextSize:
+        """Return the size of the files in ``root`` which are not ignored."""
+        files = size = 0
+        for _, entry in self.iter_files(root):
+            try:
+                size += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+            files += 1
+        return ContextSize(files=files, bytes=size)
+
+    def iter_files(self, root: Path) -> Iterator[tuple[str, os.DirEntry[str]]]:
+        """Yield the path relative to ``root`` and the entry of each file which is not ignored."""
+        directories = [("", str(root))]
+        while directories:
+            prefix, directory = directories.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                path = prefix + entry.name
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if self.is_ignored(path):
+                    # an exception may re-include files of an ignored directory
+                    if is_dir and self.has_exceptions:
+                        directories.append((path + "/", entry.path))
+                    continue
+                if is_dir:
+                    directories.append((path + "/", entry.path))
+                    continue
+                yield path, entry
+
+
+def _compile(pattern: str) -> re.Pattern[str]:
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and (end := pattern.find("]", i + 1)) != -1:
+            start = i + 1
+            characters = pattern[start:end]
+            if characters.startswith("!"):
+                characters = "^" + characters.removeprefix("!")
+            regex += f"[{characters}]"
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return re.compile(regex)
@@ -0,0 +1,79 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Helper functions for writing files."""
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator
+import contextlib
+import os
+import secrets
+import stat
+
+# (path, text, encoding) of the writes collected by defer_writes
+DeferredWrite = tuple[Path, str, str]
+
+_deferred_writes: ContextVar[list[DeferredWrite] | None] = ContextVar(
+    "deferred_writes", default=None
+)
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    """
+    Write ``text`` to ``path`` without ever exposing a partially written file.
+
+    The content is written to a temporary file in the same directory which then
+    replaces the target. Parent directories are created if needed and the mode of
+    an existing target file is kept. Within :func:`defer_writes` the write is
+    only collected.
+    """
+    deferred = _deferred_writes.get()
+    if deferred is not None:
+        deferred.append((path, text, encoding))
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+    try:
+        with tmp_path.open("x", encoding=encoding) as f:
+            f.write(text)
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(path.stat().st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextlib.contextmanager
+def defer_writes() -> Iterator[list[DeferredWrite]]:
+    """
+    Collect the writes of :func:`atomic_write_text` instead of writing the files.
+
+    The yielded list holds the collected writes, which can be written later on
+    with :func:`write_deferred`, e.g. only if all steps succeeded.
+    """
+    writes: list[DeferredWrite] = []
+    token = _deferred_writes.set(writes)
+    try:
+        yield writes
+    finally:
+        _deferred_writes.reset(token)
+
+
+def write_deferred(writes: list[DeferredWrite]) -> None:
+    """Write the files collected by :func:`defer_writes`."""
+    for path, text, encoding in writes:
+        atomic_write_text(path, text, encoding)
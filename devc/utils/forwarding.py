@@ -0,0 +1,32 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Decide whether a devc run is forwarded to the ``devc serve`` daemon.
+
+Checked by every devc run before :mod:`devc.core.serve_client` is imported.
+"""
+import os
+
+# Set to a truthy value to always run in-process, even if the daemon is running.
+NO_SERVER_ENV = "DEVC_NO_SERVER"
+# Commands which are never forwarded to the daemon.
+LOCAL_COMMANDS = frozenset(("serve",))
+
+
+def is_forwarding_enabled(argv: list[str]) -> bool:
+    """Return whether ``argv`` may be run by the daemon."""
+    if os.environ.get(NO_SERVER_ENV, "").strip().lower() not in ("", "0", "false", "no"):
+        return False
+    # global options and the interactive selection stay in-process
+    return bool(argv) and not argv[0].startswith("-") and argv[0] not in LOCAL_COMMANDS
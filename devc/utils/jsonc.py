@@ -0,0 +1,209 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Read and write JSON with comments (JSONC) as allowed in devcontainer.json files.
+
+The text is tokenized in a single pass: ``//`` and ``/* */`` comments and trailing commas
+are blanked out and the result is parsed by :mod:`json`. Blanking keeps every character at
+its offset, hence the positions of a :class:`json.JSONDecodeError` refer to the original text.
+"""
+from typing import Any, TextIO
+import json
+import re
+
+JsonPath = tuple[str | int, ...]
+"""The keys and indices leading from the root of a document to a value."""
+
+Comments = dict[JsonPath, list[str]]
+"""The comments in front of the values at a path, ``()`` holds the comments before the root."""
+
+# every alternative consumes at least one character and none of them overlap, so the
+# text is matched left to right without backtracking
+_TOKEN = re.compile(
+    r"""
+    (?P<string>"(?:[^"\\]|\\.)*")
+    |(?P<comment>//[^\n]*|/\*.*?\*/)
+    |(?P<unterminated>/\*)
+    |(?P<punctuation>[{}\[\],:])
+    |(?P<space>\s+)
+    |(?P<other>[^"/{}\[\],:\s]+|.)
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+
+def strip(text: str) -> str:
+    """Return ``text`` as plain JSON, comments and trailing commas are replaced by spaces."""
+    return _Scanner(text, keep_comments=False).scan()
+
+
+def loads(text: str) -> Any:
+    """
+    Parse the JSONC document ``text``.
+
+    :raises json.JSONDecodeError: if ``text`` is not valid JSONC
+    """
+    return json.loads(strip(text))
+
+
+def load(file: TextIO) -> Any:
+    """
+    Parse the JSONC document in ``file``.
+
+    :raises json.JSONDecodeError: if the file is not valid JSONC
+    """
+    return loads(file.read())
+
+
+def loads_with_comments(text: str) -> tuple[Any, Comments]:
+    """
+    Parse the JSONC document ``text`` and return its data and comments.
+
+    The comments are keyed by the path of the value they precede, see :func:`dumps` to
+    write them back. Comments in front of a closing bracket do not precede a value and are
+    dropped.
+
+    :raises json.JSONDecodeError: if ``text`` is not valid JSONC
+    """
+    scanner = _Scanner(text, keep_comments=True)
+    return json.loads(scanner.scan()), scanner.comments
+
+
+def dumps(value: Any, *, indent: int = 4, comments: Comments | None = None) -> str:
+    """
+    Serialize ``value`` formatted like the :mod:`json` module with ``indent``.
+
+    Without ``comments`` the text equals the one of :func:`json.dumps`. The
+    ``comments`` are written in front of the values at their path, comments of
+    paths which do not exist in ``value`` are skipped.
+    """
+    if not comments:
+        return json.dumps(value, indent=indent)
+    return _Writer(indent, comments).write(value)
+
+
+class _Scanner:
+    """Blanks out comments and trailing commas and tracks the path of the current value."""
+
+    def __init__(self, text: str, *, keep_comments: bool):
+        self._text = text
+        self._keep_comments = keep_comments
+        self.comments: Comments = {}
+        # pending comments, waiting for the value they precede
+        self._pending: list[str] = []
+        # per open object or array the current key, None for an object before its first key
+        self._path: list[str | int | None] = []
+        self._expect_key: list[bool] = []
+
+    def scan(self) -> str:
+        text = self._text
+        parts: list[str] = []
+        # index in parts of a comma which is dropped if a closing bracket follows
+        trailing_comma: int | None = None
+        for match in _TOKEN.finditer(text):
+            kind, token = match.lastgroup, match.group()
+            if kind == "space":
+                parts.append(token)
+                continue
+            if kind == "comment":
+                parts.append(_blank(token))
+                if self._keep_comments:
+                    self._pending.append(token)
+                continue
+            if kind == "unterminated":
+                raise json.JSONDecodeError("Unterminated comment", text, match.start())
+
+            if trailing_comma is not None and kind == "punctuation" and token in "}]":
+                parts[trailing_comma] = " "
+            trailing_comma = len(parts) if token == "," else None
+            parts.append(token)
+            if self._keep_comments:
+                self._track(kind, token)
+        return "".join(parts)
+
+    def _track(self, kind: str | None, token: str) -> None:
+        if kind == "punctuation":
+            if token in "{[":
+                self._attach_pending()
+                self._path.append(None if token == "{" else 0)
+                self._expect_key.append(token == "{")
+            elif token in "}]":
+                self._pending.clear()
+                if self._path:
+                    self._path.pop()
+                    self._expect_key.pop()
+            elif token == "," and self._path:
+                if isinstance(self._path[-1], int):
+                    self._path[-1] += 1
+                else:
+                    self._expect_key[-1] = True
+            return
+        if kind == "string" and self._expect_key and self._expect_key[-1]:
+            try:
+                self._path[-1] = json.loads(token)
+            except json.JSONDecodeError:
+                # reported by the parser with the position in the document
+                return
+            self._expect_key[-1] = False
+        self._attach_pending()
+
+    def _attach_pending(self) -> None:
+        if not self._pending:
+            return
+        path = tuple(key for key in self._path if key is not None)
+        self.comments.setdefault(path, []).extend(self._pending)
+        self._pending = []
+
+
+class _Writer:
+    """Writes JSON formatted like ``json.dumps`` with comments in front of values."""
+
+    def __init__(self, indent: int, comments: Comments):
+        self._indent = indent
+        self._comments = comments
+
+    def write(self, value: Any) -> str:
+        return self._comment_lines((), "") + self._write(value, (), 0)
+
+    def _write(self, value: Any, path: JsonPath, level: int) -> str:
+        if not isinstance(value, (dict, list)) or not value:
+            return json.dumps(value)
+
+        padding = " " * (self._indent * (level + 1))
+        if isinstance(value, dict):
+            items = [
+                self._comment_lines(path + (key,), padding)
+                + f"{padding}{json.dumps(str(key))}: "
+                + self._write(item, path + (key,), level + 1)
+                for key, item in value.items()
+            ]
+            brackets = "{}"
+        else:
+            items = [
+                self._comment_lines(path + (index,), padding)
+                + padding
+                + self._write(item, path + (index,), level + 1)
+                for index, item in enumerate(value)
+            ]
+            brackets = "[]"
+        closing_padding = " " * (self._indent * level)
+        return f"{brackets[0]}\n" + ",\n".join(items) + f"\n{closing_padding}{brackets[1]}"
+
+    def _comment_lines(self, path: JsonPath, padding: str) -> str:
+        return "".join(f"{padding}{comment}\n" for comment in self._comments.get(path, []))
+
+
+def _blank(token: str) -> str:
+    """Replace ``token`` by spaces, keeping its line breaks."""
+    return re.sub(r"[^\n]", " ", token)
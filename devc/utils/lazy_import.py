@@ -0,0 +1,52 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Helpers to defer the import of heavy dependencies until they are used."""
+import importlib.util
+import sys
+import types
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Return the module ``name`` without executing it yet.
+
+    The module is executed on the first attribute access, so importing a module
+    which only needs e.g. ``docker`` on a few code paths does not pay for the
+    import on every ``devc`` invocation. Annotations referring to the module
+    should be placed behind ``typing.TYPE_CHECKING`` or written as strings.
+
+    Submodules can only be imported lazily if their parent package has already
+    been imported, e.g. ``importlib.metadata``.
+
+    :raises ModuleNotFoundError: if the module is not installed
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    parent, _, child = name.rpartition(".")
+    if parent and parent not in sys.modules:
+        # finding the spec of a submodule would import the parent package
+        raise ValueError(f"The parent package of '{name}' has to be imported first")
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    if parent:
+        # a regular import binds the submodule to its parent package as well
+        setattr(sys.modules[parent], child, module)
+    return module
@@ -11,19 +11,59 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from typing import Any, TYPE_CHECKING
 import logging
-from rich.logging import RichHandler
+
+from devc.utils.console import get_console
+
+if TYPE_CHECKING:
+    from rich.logging import RichHandler
 
 LOGGER_NAME = "devc"
 
 
+class LazyRichHandler(logging.Handler):
+    """
+    Forward records to a ``rich.logging.RichHandler`` which is created on the first record.
+
+    The handler prints to the shared console of ``devc.utils.console``, so log
+    records are captured together with the other output.
+    """
+
+    def __init__(self, level: int = logging.NOTSET, **rich_handler_kwargs: Any) -> None:
+        super().__init__(level)
+        self._rich_handler_kwargs = rich_handler_kwargs
+        self._handler: "RichHandler | None" = None
+
+    @property
+    def handler(self) -> logging.Handler:
+        console = get_console()
+        if self._handler is None or self._handler.console is not console:
+            from rich.logging import RichHandler
+
+            self._handler = RichHandler(
+                level=self.level, console=console, **self._rich_handler_kwargs
+            )
+            if self.formatter is not None:
+                self._handler.setFormatter(self.formatter)
+        return self._handler
+
+    def setFormatter(self, fmt: logging.Formatter | None) -> None:  # noqa: N802
+        super().setFormatter(fmt)
+        if self._handler is not None:
+            self._handler.setFormatter(fmt)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.handler.emit(record)
+
+
 def setup_logging(level: int = logging.INFO) -> logging.Logger:
     if not logging.getLogger().handlers:  # only configure once
         logging.basicConfig(
             level=level,
             format="%(message)s",
             datefmt="[%X]",
-            handlers=[RichHandler(rich_tracebacks=True, markup=True)],
+            handlers=[LazyRichHandler(rich_tracebacks=True, markup=True)],
         )
     root = logging.getLogger(LOGGER_NAME)
     return root
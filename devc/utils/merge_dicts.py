@@ -12,6 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from typing import Any
+import json
+
+from devc.core.exceptions.devcontainer_json_exception import DevJsonMergeConflictError
 
 
 class MergeDictsStrategy(ABC):
@@ -32,3 +37,176 @@ class AppendListMerge(MergeDictsStrategy):
             else:
                 base[k] = v
         return base
+
+
+class DevcontainerMerge(MergeDictsStrategy):
+    """
+    Merge devcontainer.json updates without duplicating entries.
+
+    Dicts are merged recursively and values are replaced like :class:`AppendListMerge`,
+    but ``base`` is not modified, untouched values are shared with the result. The lists
+    of :data:`KEYED_LISTS` contain every setting once:
+
+    - ``runArgs`` are flags with their values, e.g. ``--network=host`` or ``-e VAR=x``.
+    - ``mounts`` are keyed by their target.
+    - ``forwardPorts`` and the VS Code extensions are sets.
+
+    Duplicates are dropped, the first occurrence keeps its position. Different values for
+    the same setting, e.g. two ``--network`` flags, raise a
+    :class:`DevJsonMergeConflictError`.
+    """
+
+    def merge_dicts(self, base: dict, new: dict) -> dict:
+        return self._merge(base, new, ())
+
+    def _merge(self, base: dict, new: dict, path: tuple[str, ...]) -> dict:
+        merged = dict(base)
+        for k, v in new.items():
+            current = merged.get(k)
+            split = KEYED_LISTS.get(path + (k,))
+            if split is not None and isinstance(v, list):
+                merged[k] = _merge_entries(
+                    ".".join(path + (k,)), current if isinstance(current, list) else [], v, split
+                )
+            elif isinstance(current, list) and isinstance(v, list):
+                merged[k] = current + v
+            elif isinstance(current, dict) and isinstance(v, dict):
+                merged[k] = self._merge(current, v, path + (k,))
+            else:
+                merged[k] = v
+        return merged
+
+
+_Entry = tuple[Hashable, Any, list[Any]]
+"""The key, the value to compare for conflicts and the list items of a setting."""
+
+# docker run flags which may be given only once, other flags may be repeated
+_SINGLE_VALUE_RUN_ARGS = frozenset(
+    (
+        "--cpus",
+        "--cpuset-cpus",
+        "--gpus",
+        "--hostname",
+        "--ipc",
+        "--memory",
+        "--memory-swap",
+        "--name",
+        "--network",
+        "--pid",
+        "--platform",
+        "--runtime",
+        "--shm-size",
+        "--user",
+        "--userns",
+        "--uts",
+        "--workdir",
+    )
+)
+
+_RUN_ARG_ALIASES = {
+    "-e": "--env",
+    "-h": "--hostname",
+    "-l": "--label",
+    "-m": "--memory",
+    "-p": "--publish",
+    "-u": "--user",
+    "-v": "--volume",
+    "-w": "--workdir",
+    "--net": "--network",
+}
+
+
+def _name_of(value: str) -> str:
+    return value.split("=", 1)[0]
+
+
+def _container_path_of(value: str) -> str:
+    parts = value.split(":")
+    return parts[1] if len(parts) > 1 else parts[0]
+
+
+# repeatable docker run flags whose values set a named setting, e.g. an environment variable
+_RUN_ARG_KEYS: dict[str, Callable[[str], str]] = {
+    "--device": _container_path_of,
+    "--env": _name_of,
+    "--label": _name_of,
+    "--sysctl": _name_of,
+    "--tmpfs": lambda value: value.split(":", 1)[0],
+    "--ulimit": _name_of,
+    "--volume": _container_path_of,
+}
+
+
+def _split_run_args(items: list[Any]) -> Iterator[_Entry]:
+    tokens = [str(item) for item in items]
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if not token.startswith("-"):
+            # a value without a flag, keep it as is
+            yield ("", token), token, [items[i]]
+            i += 1
+            continue
+        flag, value, end = token, None, i + 1
+        if "=" in token:
+            flag, value = token.split("=", 1)
+        elif i + 1 < len(tokens) and not tokens[i + 1].startswith("-"):
+            value, end = tokens[i + 1], i + 2
+        flag = _RUN_ARG_ALIASES.get(flag, flag)
+        if value is None or flag in _SINGLE_VALUE_RUN_ARGS:
+            key: Hashable = (flag,)
+        else:
+            key = (flag, _RUN_ARG_KEYS.get(flag, str)(value))
+        yield key, value, items[i:end]
+        i = end
+
+
+def _split_mounts(items: list[Any]) -> Iterator[_Entry]:
+    for item in items:
+        if isinstance(item, dict):
+            options = {str(k): str(v) for k, v in item.items()}
+        else:
+            options = {}
+            for option in str(item).split(","):
+                name, _, value = option.partition("=")
+                options[name] = value
+        target = options.get("target") or options.get("dst") or options.get("destination")
+        yield ("target", target) if target else ("mount", _hashable(item)), options, [item]
+
+
+def _split_set(items: list[Any]) -> Iterator[_Entry]:
+    for item in items:
+        yield _hashable(item), None, [item]
+
+
+def _hashable(item: Any) -> Hashable:
+    return item if isinstance(item, Hashable) else json.dumps(item, sort_keys=True)
+
+
+KEYED_LISTS: dict[tuple[str, ...], Callable[[list[Any]], Iterable[_Entry]]] = {
+    ("runArgs",): _split_run_args,
+    ("mounts",): _split_mounts,
+    ("forwardPorts",): _split_set,
+    ("customizations", "vscode", "extensions"): _split_set,
+}
+"""The lists of a devcontainer.json merged by :class:`DevcontainerMerge` per path."""
+
+
+def _merge_entries(
+    name: str, base: list[Any], new: list[Any], split: Callable[[list[Any]], Iterable[_Entry]]
+) -> list[Any]:
+    merged: list[Any] = []
+    seen: dict[Hashable, tuple[Any, list[Any]]] = {}
+    for entries in (split(base), split(new)):
+        for key, value, items in entries:
+            if key not in seen:
+                seen[key] = (value, items)
+                merged.extend(items)
+                continue
+            previous_value, previous_items = seen[key]
+            if previous_value != value:
+                raise DevJsonMergeConflictError(
+                    f"Conflicting {name} entries: "
+                    f"'{' '.join(map(str, previous_items))}' and '{' '.join(map(str, items))}'"
+                )
+    return merged
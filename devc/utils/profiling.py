@@ -0,0 +1,160 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Named spans to find out where the time of a devc run goes.
+
+Spans are only recorded once profiling is enabled, e.g. with ``devc --profile``,
+otherwise :func:`span` does nothing. Plugins can add their own spans::
+
+    from devc.utils.profiling import span
+
+    with span("my-plugin.download"):
+        ...
+"""
+from dataclasses import asdict, dataclass
+from typing import Any, ContextManager, Iterator
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+PROFILE_FORMATS = ("table", "json", "trace")
+
+
+@dataclass
+class Span:
+    name: str
+    # seconds since profiling has been enabled
+    start: float
+    duration: float
+    # net number of memory blocks allocated within the span
+    allocated_blocks: int
+    # number of enclosing spans
+    depth: int
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._local.depth = depth
+            self.spans.append(
+                Span(
+                    name=name,
+                    start=start - self._origin,
+                    duration=end - start,
+                    allocated_blocks=sys.getallocatedblocks() - blocks,
+                    depth=depth,
+                )
+            )
+
+    def to_json(self) -> dict[str, Any]:
+        return {"spans": [asdict(s) for s in sorted(self.spans, key=lambda s: s.start)]}
+
+    def to_trace(self) -> dict[str, Any]:
+        """Return the spans in the Chrome trace event format, e.g. for chrome://tracing."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "ph": "X",
+                "ts": s.start * 1e6,
+                "dur": s.duration * 1e6,
+                "pid": pid,
+                "tid": 0,
+                "args": {"allocated_blocks": s.allocated_blocks},
+            }
+            for s in sorted(self.spans, key=lambda s: s.start)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def print_table(self, console: Any) -> None:
+        """Print the spans aggregated by name and nesting to the rich ``console``."""
+        from rich.table import Table
+
+        # spans are recorded when they end, order them as they started
+        rows: dict[tuple[int, str], list[Span]] = {}
+        for s in sorted(self.spans, key=lambda s: s.start):
+            rows.setdefault((s.depth, s.name), []).append(s)
+
+        table = Table(title="Profile")
+        table.add_column("Phase", no_wrap=True)
+        table.add_column("Calls", justify="right")
+        table.add_column("Time", justify="right")
+        table.add_column("Allocated Blocks", justify="right")
+        for (depth, name), spans in rows.items():
+            table.add_row(
+                "  " * depth + name,
+                str(len(spans)),
+                f"{sum(s.duration for s in spans) * 1000:.2f} ms",
+                str(sum(s.allocated_blocks for s in spans)),
+            )
+        console.print(table)
+
+    def report(self, profile_format: str, output: str | None = None) -> None:
+        """Write the profile in ``profile_format`` to the file ``output`` or to stderr."""
+        from rich.console import Console
+
+        if profile_format == "table":
+            if output is None:
+                self.print_table(Console(stderr=True))
+            else:
+                with open(output, "w", encoding="utf-8") as f:
+                    self.print_table(Console(file=f, width=120))
+            return
+
+        data = self.to_trace() if profile_format == "trace" else self.to_json()
+        text = json.dumps(data, indent=1)
+        if output is None:
+            sys.stderr.write(text + "\n")
+        else:
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(text)
+
+
+_profiler: Profiler | None = None
+
+
+def enable_profiling() -> Profiler:
+    """Start recording spans, returns the profiler holding them."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def get_profiler() -> Profiler | None:
+    """Return the profiler if profiling is enabled."""
+    return _profiler
+
+
+def span(name: str) -> ContextManager[None]:
+    """Return a context manager recording the time spent within it as span ``name``."""
+    if _profiler is None:
+        return contextlib.nullcontext()
+    return _profiler.span(name)
@@ -11,23 +11,96 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Helpers to allow ${VAR} substitutions in strings."""
+"""
+Helpers to allow ${VAR} substitutions in strings.
 
+:class:`PlaceholderSubstitution` scans a structure once for the strings containing a ``$``
+and substitutes only those, e.g. once per ROS distribution::
+
+    substitution = PlaceholderSubstitution(handler.content)
+    contents = substitution.substitute_many({"ROS_DISTRO": d} for d in SUPPORTED_ROS_DISTROS)
+"""
+
+from collections.abc import Iterable, Mapping
 from string import Template
 from typing import Any
+import copy
+import functools
+
+# a step into a list (index), a dict (key) or a dataclass (field name)
+_Step = int | str
+# the steps to the strings with placeholders, a Template marks a string
+_Tree = dict[_Step, "_Tree | Template"]
+
+
+class PlaceholderSubstitution:
+    """Substitute ${VAR} placeholders in the strings of a nested structure."""
+
+    def __init__(self, obj: Any):
+        self._obj = obj
+        self._tree = _scan(obj)
+
+    @property
+    def has_placeholders(self) -> bool:
+        """Return whether any string of the structure may contain a placeholder."""
+        return self._tree is not None
+
+    def substitute(self, env: Mapping[str, Any], *, in_place: bool = False) -> Any:
+        """
+        Return the structure with the placeholders of ``env`` substituted.
+
+        Lists, dicts and dataclasses without placeholders are shared with the scanned
+        structure, the others are copied. With ``in_place`` the dataclasses are updated
+        instead of copied.
+        """
+        if self._tree is None:
+            return self._obj
+        return _substitute(self._obj, self._tree, env, in_place)
+
+    def substitute_many(self, envs: Iterable[Mapping[str, Any]]) -> list[Any]:
+        """Return a copy of the structure per environment of ``envs``."""
+        return [self.substitute(env) for env in envs]
 
 
 def substitute_placeholders(obj: Any, env: dict) -> Any:
     """Recursively replace ${VAR} placeholders in strings within nested structures."""
+    return PlaceholderSubstitution(obj).substitute(env, in_place=True)
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile(text: str) -> Template:
+    return Template(text)
+
+
+def _scan(obj: Any) -> "_Tree | Template | None":
+    """Return the tree of steps to the strings containing a ``$``, None if there is none."""
     if isinstance(obj, str):
-        return Template(obj).safe_substitute(env)
-    elif isinstance(obj, list):
-        return [substitute_placeholders(item, env) for item in obj]
+        return _compile(obj) if "$" in obj else None
+    if isinstance(obj, list):
+        items: Iterable[tuple[_Step, Any]] = enumerate(obj)
     elif isinstance(obj, dict):
-        return {k: substitute_placeholders(v, env) for k, v in obj.items()}
+        items = obj.items()
     elif hasattr(obj, "__dataclass_fields__"):
-        # Handle dataclasses
-        for field_name, field_value in obj.__dict__.items():
-            setattr(obj, field_name, substitute_placeholders(field_value, env))
-        return obj
-    return obj
+        items = obj.__dict__.items()
+    else:
+        return None
+    tree: _Tree = {}
+    for step, value in items:
+        subtree = _scan(value)
+        if subtree is not None:
+            tree[step] = subtree
+    return tree or None
+
+
+def _substitute(obj: Any, tree: "_Tree | Template", env: Mapping[str, Any], in_place: bool) -> Any:
+    if isinstance(tree, Template):
+        return tree.safe_substitute(env)
+    if hasattr(obj, "__dataclass_fields__"):
+        result = obj if in_place else copy.copy(obj)
+        for name, subtree in tree.items():
+            setattr(result, str(name), _substitute(getattr(obj, str(name)), subtree, env, in_place))
+        return result
+    result = obj.copy()
+    for step, subtree in tree.items():
+        result[step] = _substitute(obj[step], subtree, env, in_place)
+    return result
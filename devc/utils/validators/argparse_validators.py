@@ -18,11 +18,17 @@ from pathlib import Path
 from typing import Any
 
 from devc.utils.validators.core import (
+    validate_byte_size,
+    validate_cpus,
+    validate_cpuset,
     validate_empty_or_new_dir,
     validate_existing_file,
     validate_file_type,
+    validate_key_value,
     validate_not_empty,
     validate_positive_int,
+    validate_tmpfs,
+    validate_ulimit,
 )
 
 
@@ -53,6 +59,54 @@ class PositiveInt:
             raise argparse.ArgumentTypeError(str(e))
 
 
+class KeyValue:
+    def __call__(self, value: str) -> tuple[str, str]:
+        try:
+            return validate_key_value(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+
+class ByteSize:
+    def __call__(self, value: str) -> int:
+        try:
+            return validate_byte_size(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+
+class Cpus:
+    def __call__(self, value: str) -> float:
+        try:
+            return validate_cpus(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+
+class CpuSet:
+    def __call__(self, value: str) -> tuple[int, ...]:
+        try:
+            return validate_cpuset(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+
+class Ulimit:
+    def __call__(self, value: str) -> str:
+        try:
+            return validate_ulimit(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+
+class Tmpfs:
+    def __call__(self, value: str) -> str:
+        try:
+            return validate_tmpfs(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+
+
 class NotEmpty:
     def __init__(self, strip: bool = True) -> None:
         self.strip = strip
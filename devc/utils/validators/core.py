@@ -14,6 +14,28 @@
 
 from pathlib import Path
 from typing import Any
+import re
+
+# units of Docker's size options like --memory, binary multiples of a byte
+_BYTE_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+_BYTE_SIZE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*([kmgt]?)b?$", re.IGNORECASE)
+_ULIMIT_NAMES = (
+    "core",
+    "cpu",
+    "data",
+    "fsize",
+    "locks",
+    "memlock",
+    "msgqueue",
+    "nice",
+    "nofile",
+    "nproc",
+    "rss",
+    "rtprio",
+    "rttime",
+    "sigpending",
+    "stack",
+)
 
 
 def validate_not_empty(value: Any, *, strip: bool = True) -> None:
@@ -41,6 +63,93 @@ def validate_positive_int(value: str) -> int:
     return ivalue
 
 
+def validate_key_value(value: str) -> tuple[str, str]:
+    key, separator, val = value.partition("=")
+    if not separator or not key.strip():
+        raise ValueError(f"{value!r} is not of the form KEY=VALUE.")
+
+    return key.strip(), val
+
+
+def validate_byte_size(value: str) -> int:
+    """Return the bytes of a size like ``512m`` or ``2g``, a number without unit is in bytes."""
+    match = _BYTE_SIZE_PATTERN.match(value.strip())
+    if match is None:
+        raise ValueError(f"{value!r} is not a size like 512m or 2g.")
+
+    size = int(float(match.group(1)) * _BYTE_SIZE_UNITS[match.group(2).lower()])
+    if size <= 0:
+        raise ValueError(f"{value!r} is not a positive size.")
+
+    return size
+
+
+def validate_cpus(value: str) -> float:
+    try:
+        cpus = float(value)
+    except ValueError:
+        raise ValueError(f"{value!r} is not a valid number of CPUs.")
+
+    if not cpus > 0:
+        raise ValueError("The number of CPUs must be greater than 0.")
+
+    return cpus
+
+
+def validate_cpuset(value: str) -> tuple[int, ...]:
+    """Return the sorted CPU ids of a list like ``0-3,6``."""
+    cpus: set[int] = set()
+    for part in value.split(","):
+        first, separator, last = part.strip().partition("-")
+        try:
+            start = int(first)
+            end = int(last) if separator else start
+        except ValueError:
+            raise ValueError(f"{value!r} is not a list of CPUs like 0-3,6.")
+        if start < 0 or end < start:
+            raise ValueError(f"{part.strip()!r} is not a valid CPU range.")
+        cpus.update(range(start, end + 1))
+
+    return tuple(sorted(cpus))
+
+
+def validate_ulimit(value: str) -> str:
+    """Return the normalized ulimit ``NAME=SOFT[:HARD]``, -1 means unlimited."""
+    name, separator, limits = value.partition("=")
+    name = name.strip()
+    if not separator or name not in _ULIMIT_NAMES:
+        raise ValueError(
+            f"{value!r} is not of the form NAME=SOFT[:HARD] with NAME one of "
+            + ", ".join(_ULIMIT_NAMES)
+            + "."
+        )
+
+    try:
+        values = [int(limit) for limit in limits.split(":")]
+    except ValueError:
+        raise ValueError(f"The limits of {value!r} are not integers.")
+    if len(values) > 2 or any(limit < -1 for limit in values):
+        raise ValueError(f"{value!r} is not of the form NAME=SOFT[:HARD].")
+    if len(values) == 2 and values[1] != -1 and (values[0] == -1 or values[0] > values[1]):
+        raise ValueError(f"The soft limit of {value!r} exceeds its hard limit.")
+
+    return f"{name}={':'.join(map(str, values))}"
+
+
+def validate_tmpfs(value: str) -> str:
+    """Validate a tmpfs mount ``PATH[:OPTIONS]``, e.g. ``/tmp:size=1g``."""
+    path, _, options = value.partition(":")
+    if not path.startswith("/"):
+        raise ValueError(f"The tmpfs path of {value!r} is not absolute.")
+
+    for option in filter(None, options.split(",")):
+        key, _, size = option.partition("=")
+        if key == "size":
+            validate_byte_size(size)
+
+    return value
+
+
 def validate_empty_or_new_dir(path_str: str, *, must_be_empty: bool = True) -> Path:
     p = Path(path_str).expanduser().resolve()
 
@@ -16,6 +16,9 @@ from typing import Any
 from collections.abc import Generator
 from pathlib import Path
 from .core import (
+    validate_byte_size,
+    validate_cpus,
+    validate_cpuset,
     validate_not_empty,
     validate_positive_int,
 )
@@ -42,6 +45,48 @@ class PositiveInt:
             return str(e)
 
 
+class ByteSize:
+    def __init__(self, *, optional: bool = False) -> None:
+        self.optional = optional
+
+    def __call__(self, value: str) -> bool | str:
+        if self.optional and not value.strip():
+            return True
+        try:
+            validate_byte_size(value)
+            return True
+        except ValueError as e:
+            return str(e)
+
+
+class Cpus:
+    def __init__(self, *, optional: bool = False) -> None:
+        self.optional = optional
+
+    def __call__(self, value: str) -> bool | str:
+        if self.optional and not value.strip():
+            return True
+        try:
+            validate_cpus(value)
+            return True
+        except ValueError as e:
+            return str(e)
+
+
+class CpuSet:
+    def __init__(self, *, optional: bool = False) -> None:
+        self.optional = optional
+
+    def __call__(self, value: str) -> bool | str:
+        if self.optional and not value.strip():
+            return True
+        try:
+            validate_cpuset(value)
+            return True
+        except ValueError as e:
+            return str(e)
+
+
 class ExistingPaths:
     def __init__(self, *, must_be_device: bool = False, delimiter: str = ",") -> None:
         """
@@ -22,6 +22,8 @@ import types
 from typing import Any
 from collections.abc import Iterator
 
+from devc_cli_plugin_system.completion_cache import is_completion_requested
+from devc_cli_plugin_system.completion_cache import mark_parser_loaded
 from devc_cli_plugin_system.entry_points import get_entry_points
 from devc_cli_plugin_system.entry_points import get_first_line_doc
 from devc_cli_plugin_system.plugin_system import instantiate_extensions
@@ -30,6 +32,7 @@ from devc_cli_plugin_system.plugin_system import satisfies_version
 from devc_cli_plugin_system.plugin.plugin_context import PluginContext
 from devc_cli_plugin_system.plugin import Plugin
 from devc_cli_plugin_system.interactive_creation.interaction_provider import InteractionProvider
+from devc.utils.profiling import span
 
 
 class CommandExtension(ABC):
@@ -159,7 +162,8 @@ def add_subparsers_on_demand(
 
     # add entry point specific sub-parsers but without a description and
     # arguments for now
-    entry_points = get_entry_points(group_name)
+    with span(f"entry points {group_name}"):
+        entry_points = get_entry_points(group_name)
     command_parsers = {}
     for name in sorted(entry_points.keys()):
         command_parser = subparser.add_parser(
@@ -173,7 +177,7 @@ def add_subparsers_on_demand(
     with SuppressUsageOutput({parser} | set(command_parsers.values())):
         args = argv
         # for completion use the arguments provided by the argcomplete env var
-        if _is_completion_requested():
+        if is_completion_requested():
             from argcomplete import split_line
 
             _, _, _, comp_words, _ = split_line(os.environ["COMP_LINE"])
@@ -181,7 +185,7 @@ def add_subparsers_on_demand(
         try:
             known_args, not_knwon = root_parser.parse_known_args(args=args)
         except SystemExit:
-            if not _is_completion_requested():
+            if not is_completion_requested():
                 raise
             # if the partial arguments can't be parsed use no known args
             known_args = argparse.Namespace(**{subparser.dest: None})
@@ -226,7 +230,8 @@ def add_subparsers_on_demand(
             kwargs = {}
             if "argv" in signature.parameters:
                 kwargs["argv"] = argv
-            extension.add_arguments(command_parser, f"{cli_name} {name}", **kwargs)
+            with span(f"add arguments {name}"):
+                extension.add_arguments(command_parser, f"{cli_name} {name}", **kwargs)
             del command_parser._root_parser
 
         if hasattr(extension, "register_plugin"):
@@ -235,15 +240,20 @@ def add_subparsers_on_demand(
             kwargs = {}
             if "argv" in signature.parameters:
                 kwargs["argv"] = argv
-            extension.register_plugin(command_parser, f"{cli_name} {name}", **kwargs)
+            with span(f"register plugins {name}"):
+                extension.register_plugin(command_parser, f"{cli_name} {name}", **kwargs)
             del command_parser._root_parser
 
         if hasattr(extension, "register_plugin_extensions"):
             command_parser = command_parsers[name]
             command_parser._root_parser = root_parser
-            extension.register_plugin_extensions(command_parser)
+            with span(f"register plugin extensions {name}"):
+                extension.register_plugin_extensions(command_parser)
             del command_parser._root_parser
 
+        # all arguments of the selected branch are known, it can be cached for completion
+        mark_parser_loaded(command_parser)
+
     return subparser
 
 
@@ -283,7 +293,3 @@ def _ignore_zero_exit(original_exit_handler):  # type: ignore[no-untyped-def]
         return original_exit_handler(status=status, message=message)
 
     return exit_
-
-
-def _is_completion_requested() -> bool:
-    return os.environ.get("_ARGCOMPLETE") == "1"
@@ -0,0 +1,268 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Serve shell completion from a cached description of the argument tree.
+
+Building the live parser for a completion request instantiates the command
+extensions, their plugins and all plugin extensions only to learn which
+arguments they register. Instead, the parser tree built by a live run is
+serialized and completion requests are answered from it as long as the
+installed distributions and the imported sources did not change.
+
+The parser tree is only built on demand, so the cache is filled per branch:
+a branch is known once a completion request (or any other invocation) loaded
+it. Requests for branches which are not known yet fall back to the live parser.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import types
+from pathlib import Path
+from typing import Any
+
+from devc.utils.cache import get_cache_dir, is_cache_enabled
+from devc.utils.files import atomic_write_text
+from devc_cli_plugin_system.entry_points import get_entry_points_fingerprint
+
+# Bump if the layout of the serialized argument tree changes.
+COMPLETION_CACHE_VERSION = 1
+
+# Attribute set on parsers whose own arguments have been added completely.
+_LOADED_ATTRIBUTE = "_devc_completion_loaded"
+
+logger = logging.getLogger(__name__)
+
+
+def is_completion_requested() -> bool:
+    """Return True if the process has been invoked by the argcomplete shell hook."""
+    return os.environ.get("_ARGCOMPLETE") == "1"
+
+
+def mark_parser_loaded(parser: argparse.ArgumentParser) -> None:
+    """Mark ``parser`` as complete, i.e. all arguments of its extension have been added."""
+    setattr(parser, _LOADED_ATTRIBUTE, True)
+
+
+def complete_from_cache(cli_name: str, *, exclude: list[str] | None = None) -> None:
+    """
+    Answer the pending completion request from the cache if possible.
+
+    Does not return if the request has been answered, since argcomplete exits
+    the process. Returns if the cache is disabled, missing or stale, or the
+    requested branch of the argument tree has not been cached yet.
+
+    :param str cli_name: the name of the command line tool
+    :param list exclude: option strings which should not be suggested
+    """
+    if not is_completion_requested() or not is_cache_enabled():
+        return
+    try:
+        from argcomplete import autocomplete, split_line
+    except ImportError:
+        return
+
+    tree = _read_completion_cache(_get_cache_path(cli_name))
+    if tree is None:
+        return
+    _, _, _, comp_words, _ = split_line(os.environ.get("COMP_LINE", ""))
+    if not _is_branch_cached(tree, comp_words[1:]):
+        return
+
+    parser = argparse.ArgumentParser(prog=cli_name)
+    _build_parser(parser, tree)
+    autocomplete(parser, exclude=exclude)
+
+
+def update_completion_cache(cli_name: str, parser: argparse.ArgumentParser) -> None:
+    """
+    Merge the branches of ``parser`` which have been loaded into the cache.
+
+    :param str cli_name: the name of the command line tool
+    :param parser: the live root parser
+    """
+    if not is_cache_enabled():
+        return
+    path = _get_cache_path(cli_name)
+    tree = _serialize_parser(parser, loaded=True)
+    cached_tree = _read_completion_cache(path)
+    if cached_tree is not None:
+        tree = _merge_trees(cached_tree, tree)
+    data = {
+        "version": COMPLETION_CACHE_VERSION,
+        "fingerprint": get_entry_points_fingerprint(),
+        "sources": _get_source_mtimes(),
+        "tree": tree,
+    }
+    try:
+        atomic_write_text(path, json.dumps(data, sort_keys=True))
+    except OSError as e:
+        logger.debug(f"Failed to write completion cache '{path}': {e}")
+
+
+def _get_cache_path(cli_name: str) -> Path:
+    # one cache per interpreter and import path, e.g. per virtual environment
+    key = hashlib.sha256("\0".join([sys.executable, *sys.path]).encode()).hexdigest()[:16]
+    return get_cache_dir(f"completion-{cli_name}-{key}.json")
+
+
+def _get_source_mtimes() -> dict[str, int]:
+    """
+    Get the modification times of all imported modules outside of the environment.
+
+    Distributions installed into the environment are covered by the entry point
+    fingerprint, but sources of editable installs or on ``PYTHONPATH`` can change
+    without touching their metadata, e.g. when adding an argument to a plugin.
+    """
+    prefixes = tuple({os.path.join(p, "") for p in (sys.prefix, sys.base_prefix)})
+    mtimes = {}
+    for module in list(sys.modules.values()):
+        if type(module) is not types.ModuleType:
+            # skip lazily imported modules, any attribute access would execute them
+            # and they did not contribute to the parser anyway
+            continue
+        filename = getattr(module, "__file__", None)
+        if not filename or filename.startswith(prefixes):
+            continue
+        try:
+            mtimes[filename] = os.stat(filename).st_mtime_ns
+        except OSError:
+            continue
+    return mtimes
+
+
+def _read_completion_cache(path: Path) -> dict | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != COMPLETION_CACHE_VERSION:
+        return None
+    if data.get("fingerprint") != get_entry_points_fingerprint():
+        return None
+    for filename, mtime in data.get("sources", {}).items():
+        try:
+            if os.stat(filename).st_mtime_ns != mtime:
+                return None
+        except OSError:
+            return None
+    tree = data.get("tree")
+    return tree if isinstance(tree, dict) else None
+
+
+def _serialize_parser(parser: argparse.ArgumentParser, *, loaded: bool) -> dict:
+    node: dict[str, Any] = {"loaded": loaded, "actions": [], "subcommands": None}
+    for action in parser._actions:
+        if isinstance(action, argparse._HelpAction):
+            continue
+        if isinstance(action, argparse._SubParsersAction):
+            helps = {a.dest: a.help for a in action._choices_actions}
+            node["subcommands"] = {
+                "dest": action.dest,
+                "required": action.required,
+                "choices": {
+                    name: {
+                        "help": helps.get(name),
+                        **_serialize_parser(
+                            sub_parser, loaded=getattr(sub_parser, _LOADED_ATTRIBUTE, False)
+                        ),
+                    }
+                    for name, sub_parser in action.choices.items()
+                },
+            }
+            continue
+        node["actions"].append(
+            {
+                "option_strings": action.option_strings,
+                "dest": action.dest,
+                "nargs": action.nargs,
+                "choices": (None if action.choices is None else [str(c) for c in action.choices]),
+                "help": action.help,
+                "metavar": action.metavar,
+            }
+        )
+    return node
+
+
+def _merge_trees(cached: dict, live: dict) -> dict:
+    # a loaded node of the live run is authoritative for its own arguments,
+    # but the live run only loads one branch, keep the cached siblings
+    merged = dict(live if live["loaded"] or not cached.get("loaded") else cached)
+    live_subcommands = live.get("subcommands")
+    cached_subcommands = cached.get("subcommands")
+    if live_subcommands and cached_subcommands:
+        cached_choices = cached_subcommands["choices"]
+        merged["subcommands"] = {
+            **merged["subcommands"],
+            "choices": {
+                name: (
+                    _merge_trees(cached_choices[name], child) if name in cached_choices else child
+                )
+                for name, child in live_subcommands["choices"].items()
+            },
+        }
+    return merged
+
+
+def _is_branch_cached(tree: dict, words: list[str]) -> bool:
+    """Check that all nodes selected by ``words`` have been loaded."""
+    node = tree
+    if not node.get("loaded"):
+        return False
+    words_iter = iter(words)
+    for word in words_iter:
+        if word.startswith("-"):
+            # skip the value of options which take exactly one value
+            option_string = word.split("=", 1)[0]
+            for action in node["actions"]:
+                if option_string in action["option_strings"]:
+                    if "=" not in word and action["nargs"] in (None, 1):
+                        next(words_iter, None)
+                    break
+            continue
+        subcommands = node.get("subcommands")
+        if subcommands and word in subcommands["choices"]:
+            node = subcommands["choices"][word]
+            if not node.get("loaded"):
+                return False
+    return True
+
+
+def _build_parser(parser: argparse.ArgumentParser, node: dict) -> None:
+    for action in node["actions"]:
+        kwargs: dict[str, Any] = {"help": action["help"]}
+        if isinstance(action["metavar"], list):
+            kwargs["metavar"] = tuple(action["metavar"])
+        elif action["metavar"] is not None:
+            kwargs["metavar"] = action["metavar"]
+        if action["nargs"] == 0:
+            kwargs["action"] = "store_const"
+            kwargs["const"] = None
+        else:
+            kwargs["nargs"] = action["nargs"]
+            kwargs["choices"] = action["choices"]
+        if action["option_strings"]:
+            parser.add_argument(*action["option_strings"], dest=action["dest"], **kwargs)
+        else:
+            parser.add_argument(action["dest"], **kwargs)
+
+    subcommands = node.get("subcommands")
+    if subcommands:
+        subparser = parser.add_subparsers(dest=subcommands["dest"])
+        subparser.required = subcommands["required"]
+        for name, child in subcommands["choices"].items():
+            kwargs = {} if child.get("help") is None else {"help": child["help"]}
+            _build_parser(subparser.add_parser(name, **kwargs), child)
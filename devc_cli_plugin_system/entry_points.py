@@ -15,13 +15,27 @@
 # limitations under the License.
 
 from collections import defaultdict
-from typing import Any, cast
+from pathlib import Path
+from typing import Any, cast, TYPE_CHECKING
+import hashlib
+import json
 import logging
+import os
+import sys
 
-try:
+from devc.utils.cache import get_cache_dir, is_cache_enabled
+from devc.utils.files import atomic_write_text
+from devc.utils.lazy_import import lazy_import
+
+if TYPE_CHECKING:
     import importlib.metadata as importlib_metadata
-except ModuleNotFoundError:
-    import importlib_metadata  # type: ignore[no-redef]
+else:
+    # importlib.metadata is not needed if the entry point index is up to date,
+    # e.g. when answering shell completion from the cache
+    try:
+        importlib_metadata = lazy_import("importlib.metadata")
+    except ModuleNotFoundError:
+        import importlib_metadata
 
 # The group name for entry points identifying extension points.
 #
@@ -30,8 +44,19 @@ except ModuleNotFoundError:
 # Those need to be declared using this group name.
 EXTENSION_POINT_GROUP_NAME = "devc_cli.extension_point"
 
+# Entry point groups with these prefixes are recorded in the on-disk index.
+# Groups with other prefixes are indexed as well if they are declared as
+# extension points.
+INDEXED_GROUP_PREFIXES = ("devc_cli.", "devc_commands.")
+
+# Bump if the layout of the on-disk index changes.
+ENTRY_POINT_INDEX_VERSION = 1
+
 logger = logging.getLogger(__name__)
 
+# mapping: group name -> entry point name -> (entry point value, distribution name)
+_entry_point_index: dict[str, dict[str, tuple[str, str]]] | None = None
+
 
 def get_all_entry_points() -> dict:
     """
@@ -41,16 +66,21 @@ def get_all_entry_points() -> dict:
     :rtype: dict
     """
     extension_points = get_entry_points(EXTENSION_POINT_GROUP_NAME)
+    index = _get_entry_point_index()
+    distributions: dict[str, importlib_metadata.Distribution | None] = {}
 
     entry_points: dict = defaultdict(dict)
 
-    for dist in importlib_metadata.distributions():
-        for ep in dist.entry_points:
-            # skip groups which are not registered as extension points
-            if ep.group not in extension_points:
+    for group_name in extension_points:
+        for name, (value, dist_name) in index.get(group_name, {}).items():
+            if dist_name not in distributions:
+                distributions[dist_name] = _find_distribution(dist_name)
+            dist = distributions[dist_name]
+            if dist is None:
+                # removed since the index has been written
                 continue
-
-            entry_points[ep.group][ep.name] = (dist, ep)
+            ep = importlib_metadata.EntryPoint(name=name, value=value, group=group_name)
+            entry_points[group_name][name] = (dist, ep)
     return entry_points
 
 
@@ -58,11 +88,21 @@ def get_entry_points(group_name: str) -> dict:
     """
     Get the entry points for a specific group.
 
+    Groups of ``devc`` and its extensions are answered from the entry point
+    index, any other group requires a scan of all installed distributions.
+
     :param str group_name: the name of the ``entry_point`` group
     :returns: mapping of group name to dictionaries which map entry point names
       to ``EntryPoint`` instances
     :rtype: dict
     """
+    index = _get_entry_point_index()
+    if _is_indexed_group(group_name, index):
+        return {
+            name: importlib_metadata.EntryPoint(name=name, value=value, group=group_name)
+            for name, (value, _) in index.get(group_name, {}).items()
+        }
+
     entry_points_impl = importlib_metadata.entry_points()
     if hasattr(entry_points_impl, "select"):
         groups = entry_points_impl.select(group=group_name)
@@ -96,6 +136,148 @@ def load_entry_points(group_name: str, *, exclude_names: set[str] | None = None)
     return extension_types
 
 
+def get_entry_points_fingerprint() -> str:
+    """
+    Get a fingerprint of the distributions installed on ``sys.path``.
+
+    The fingerprint covers the names and modification times of all
+    ``*.dist-info`` and ``*.egg-info`` entries, so it changes whenever a
+    distribution is installed, upgraded or removed.
+    """
+    digest = hashlib.sha256()
+    for path_entry in sys.path:
+        try:
+            with os.scandir(path_entry or ".") as it:
+                entries = sorted(
+                    (entry for entry in it if entry.name.endswith((".dist-info", ".egg-info"))),
+                    key=lambda entry: entry.name,
+                )
+                for entry in entries:
+                    mtime = entry.stat().st_mtime_ns
+                    digest.update(f"{path_entry}\0{entry.name}\0{mtime}\n".encode())
+        except OSError:
+            # not a directory (e.g. a zip file) or removed in the meantime
+            continue
+    return digest.hexdigest()
+
+
+def get_indexed_group_names() -> list[str]:
+    """Get the names of the entry point groups of ``devc`` and its extensions."""
+    return sorted(_get_entry_point_index())
+
+
+def invalidate_entry_point_index() -> None:
+    """Drop the in-memory entry point index, it is reloaded on the next lookup."""
+    global _entry_point_index
+    _entry_point_index = None
+
+
+def _get_entry_point_index() -> dict[str, dict[str, tuple[str, str]]]:
+    global _entry_point_index
+    if _entry_point_index is not None:
+        return _entry_point_index
+
+    if not is_cache_enabled():
+        _entry_point_index = _build_entry_point_index()
+        return _entry_point_index
+
+    fingerprint = get_entry_points_fingerprint()
+    index_path = _get_index_path()
+    index = _read_entry_point_index(index_path, fingerprint)
+    if index is None:
+        logger.debug(f"Rebuilding entry point index at '{index_path}'")
+        index = _build_entry_point_index()
+        _write_entry_point_index(index_path, fingerprint, index)
+    _entry_point_index = index
+    return _entry_point_index
+
+
+def _build_entry_point_index() -> dict[str, dict[str, tuple[str, str]]]:
+    groups: dict[str, dict[str, tuple[str, str]]] = defaultdict(dict)
+    seen_distributions: set[str] = set()
+    for dist in importlib_metadata.distributions():
+        entry_points = list(dist.entry_points)
+        if not entry_points:
+            continue
+        dist_name = dist.name
+        # only the first distribution of a name on sys.path is effective,
+        # which matches the behavior of ``importlib.metadata.entry_points()``
+        normalized_name = dist_name.lower().replace("-", "_").replace(".", "_")
+        if normalized_name in seen_distributions:
+            continue
+        seen_distributions.add(normalized_name)
+        for ep in entry_points:
+            groups[ep.group].setdefault(ep.name, (ep.value, dist_name))
+
+    declared_groups = set(groups.get(EXTENSION_POINT_GROUP_NAME, {}))
+    return {
+        group_name: entry_points
+        for group_name, entry_points in groups.items()
+        if group_name.startswith(INDEXED_GROUP_PREFIXES) or group_name in declared_groups
+    }
+
+
+def _is_indexed_group(group_name: str, index: dict) -> bool:
+    if group_name.startswith(INDEXED_GROUP_PREFIXES):
+        return True
+    return group_name in index.get(EXTENSION_POINT_GROUP_NAME, {})
+
+
+def _get_index_path() -> Path:
+    # one index per interpreter and import path, e.g. per virtual environment
+    key = hashlib.sha256("\0".join([sys.executable, *sys.path]).encode()).hexdigest()[:16]
+    return get_cache_dir(f"entry_points-{key}.json")
+
+
+def _read_entry_point_index(
+    path: Path, fingerprint: str
+) -> dict[str, dict[str, tuple[str, str]]] | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != ENTRY_POINT_INDEX_VERSION
+        or data.get("fingerprint") != fingerprint
+    ):
+        return None
+    try:
+        index = {
+            group_name: {name: (value, dist_name) for name, (value, dist_name) in eps.items()}
+            for group_name, eps in data.get("groups", {}).items()
+        }
+    except (AttributeError, TypeError, ValueError):
+        # a corrupt index is rebuilt like an outdated one
+        return None
+    for eps in index.values():
+        for value, dist_name in eps.values():
+            if not isinstance(value, str) or not isinstance(dist_name, str):
+                return None
+    return index
+
+
+def _write_entry_point_index(
+    path: Path, fingerprint: str, index: dict[str, dict[str, tuple[str, str]]]
+) -> None:
+    data = {
+        "version": ENTRY_POINT_INDEX_VERSION,
+        "fingerprint": fingerprint,
+        "groups": index,
+    }
+    try:
+        atomic_write_text(path, json.dumps(data, indent=1, sort_keys=True))
+    except OSError as e:
+        logger.debug(f"Failed to write entry point index '{path}': {e}")
+
+
+def _find_distribution(dist_name: str) -> "importlib_metadata.Distribution | None":
+    try:
+        return importlib_metadata.distribution(dist_name)
+    except importlib_metadata.PackageNotFoundError:
+        return None
+
+
 def get_first_line_doc(any_type: Any) -> str:
     if not any_type.__doc__:
         return ""
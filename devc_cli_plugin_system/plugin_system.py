@@ -17,10 +17,12 @@
 from collections import OrderedDict
 from typing import Any
 import logging
+import threading
 
 from packaging.version import Version
 
 from devc_cli_plugin_system.entry_points import load_entry_points
+from devc.utils.profiling import span
 
 PLUGIN_SYSTEM_VERSION = "0.1"
 
@@ -34,35 +36,53 @@ class PluginException(Exception):
 
 
 _extension_instances: dict = {}
+# guards _extension_instances, so each extension is instantiated once by concurrent callers
+_extension_instances_lock = threading.RLock()
 
 
 def instantiate_extensions(
     group_name: str, *, exclude_names: set[str] | None = None, unique_instance: bool = False
 ) -> dict:
-    extension_types = load_entry_points(group_name, exclude_names=exclude_names)
-    extension_instances = {}
-    for extension_name, extension_class in extension_types.items():
-        extension_instance = instantiate_extension(
-            group_name,
-            extension_name,
-            extension_class,
-            unique_instance=unique_instance,
-        )
-        if extension_instance is None:
-            continue
-        extension_instances[extension_name] = extension_instance
+    with span(f"instantiate {group_name}"):
+        extension_types = load_entry_points(group_name, exclude_names=exclude_names)
+        extension_instances = {}
+        for extension_name, extension_class in extension_types.items():
+            extension_instance = instantiate_extension(
+                group_name,
+                extension_name,
+                extension_class,
+                unique_instance=unique_instance,
+            )
+            if extension_instance is None:
+                continue
+            extension_instances[extension_name] = extension_instance
     return extension_instances
 
 
 def instantiate_extension(
     group_name: str, extension_name: str, extension_class: Any, *, unique_instance: bool = False
 ) -> Any:
-    global _extension_instances
-    if not unique_instance and extension_class in _extension_instances:
-        return _extension_instances[extension_class]
+    if unique_instance:
+        return _create_extension_instance(group_name, extension_name, extension_class)
+
+    with _extension_instances_lock:
+        if extension_class in _extension_instances:
+            return _extension_instances[extension_class]
+        extension_instance = _create_extension_instance(group_name, extension_name, extension_class)
+        if extension_instance is not None:
+            _extension_instances[extension_class] = extension_instance
+    return extension_instance
+
 
+def clear_extension_instances() -> None:
+    """Drop the shared extension instances, they are instantiated again on the next lookup."""
+    with _extension_instances_lock:
+        _extension_instances.clear()
+
+
+def _create_extension_instance(group_name: str, extension_name: str, extension_class: Any) -> Any:
     try:
-        extension_instance = extension_class()
+        return extension_class()
     except PluginException as e:  # noqa: F841
         logger.warning(
             f"Failed to instantiate '{group_name}' extension " f"'{extension_name}': {e}"
@@ -71,9 +91,6 @@ def instantiate_extension(
     except Exception as e:  # noqa: F841
         logger.error(f"Failed to instantiate '{group_name}' extension " f"'{extension_name}': {e}")
         return None
-    if not unique_instance:
-        _extension_instances[extension_class] = extension_instance
-    return extension_instance
 
 
 def order_extensions(extensions: Any, key_function: Any, *, reverse: bool = False) -> dict:
@@ -0,0 +1,118 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import argparse
+import os
+import time
+from typing import override, TYPE_CHECKING
+
+from devc_cli_plugin_system.command import CommandExtension
+from devc_cli_plugin_system.interactive_creation.interaction_provider import InteractionProvider
+from devc.core.exceptions.batch_exceptions import BatchManifestError
+from devc.core.exceptions.devc_exceptions import DependencyMissing
+from devc.core.models.batch_manifest import load_batch_manifest
+from devc.utils.console import get_console, print_error
+from devc.utils.validators import argparse_validators
+
+if TYPE_CHECKING:
+    from devc.core.batch_service import BatchResult
+
+_STATUS_STYLES = {"ok": "green", "failed": "red", "skipped": "bright_black"}
+
+
+class BatchCommand(CommandExtension):
+    """Generate devcontainers for all targets of a manifest in one process."""
+
+    @override
+    def add_arguments(
+        self, parser: argparse.ArgumentParser, cli_name: str, *, argv: list[str] | None = None
+    ) -> None:
+        parser.add_argument(
+            "manifest",
+            help="JSON, TOML or YAML manifest listing the targets to generate.",
+            type=argparse_validators.ExistingFile(),
+        )
+        parser.add_argument(
+            "--fail-fast",
+            help="Skip the remaining targets after the first failure.",
+            action="store_true",
+            default=False,
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            help="Number of worker processes generating the targets, 0 uses all CPUs.",
+            type=argparse_validators.PositiveInt(),
+            default=1,
+        )
+
+    @override
+    def interactive_creation_hook(
+        self,
+        parser: argparse.ArgumentParser,
+        subparser: argparse._SubParsersAction | None,
+        cli_name: str,
+        interaction_provider: InteractionProvider,
+    ) -> list[str]:
+        manifest = interaction_provider.input_path("Path to the batch manifest:")
+        argv = [str(manifest)]
+        if interaction_provider.confirm("Stop at the first failing target?", default=False):
+            argv.append("--fail-fast")
+        if interaction_provider.confirm("Generate the targets in parallel?", default=False):
+            argv.extend(["--jobs", "0"])
+        return argv
+
+    @override
+    def main(self, *, parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+        # the process pool is only imported when running a batch, not for `devc --help`
+        from devc.core.batch_service import BatchService
+
+        try:
+            targets = load_batch_manifest(args.manifest)
+        except (BatchManifestError, DependencyMissing) as e:
+            print_error(title="Invalid Batch Manifest", message=str(e))
+            return 1
+
+        jobs = args.jobs or os.cpu_count() or 1
+        start = time.perf_counter()
+        results = BatchService().run(targets, fail_fast=args.fail_fast, jobs=jobs)
+        self._print_results(results, time.perf_counter() - start)
+        return 0 if all(result.status == "ok" for result in results) else 1
+
+    def _print_results(self, results: "list[BatchResult]", duration: float) -> None:
+        from rich.table import Table
+
+        table = Table(title="Batch Results")
+        table.add_column("Target")
+        table.add_column("Command")
+        table.add_column("Status")
+        table.add_column("Time", justify="right")
+        table.add_column("Error")
+        for result in results:
+            style = _STATUS_STYLES[result.status]
+            table.add_row(
+                result.target.name,
+                f"{result.target.command} {result.target.plugin}",
+                f"[{style}]{result.status}[/{style}]",
+                f"{result.duration * 1000:.0f} ms" if result.rc is not None else "",
+                result.error,
+            )
+        console = get_console()
+        console.print(table)
+        counts = {status: 0 for status in _STATUS_STYLES}
+        for result in results:
+            counts[result.status] += 1
+        console.print(
+            f"{len(results)} targets in {duration:.2f} s: "
+            + ", ".join(f"{count} {status}" for status, count in counts.items())
+        )
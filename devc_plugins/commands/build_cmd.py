@@ -0,0 +1,157 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import argparse
+from pathlib import Path
+from typing import override, TYPE_CHECKING
+
+from devc_cli_plugin_system.command import CommandExtension
+from devc_cli_plugin_system.interactive_creation.interaction_provider import InteractionProvider
+from devc.constants.build_constants import BUILD_CONSTANTS
+from devc.constants.templates import TEMPLATES
+from devc.core.exceptions.build_exceptions import BuildError
+from devc.core.exceptions.devc_exceptions import DependencyMissing
+from devc.utils.console import get_console, print_error
+from devc.utils.validators import argparse_validators
+
+if TYPE_CHECKING:
+    from devc.core.build_service import BuildResult
+
+
+class BuildCommand(CommandExtension):
+    """Build the image of a generated Dockerfile."""
+
+    @override
+    def add_arguments(
+        self, parser: argparse.ArgumentParser, cli_name: str, *, argv: list[str] | None = None
+    ) -> None:
+        parser.add_argument(
+            "--dockerfile",
+            help="Dockerfile to build. "
+            f"(Default: {TEMPLATES.get_target_default_path(TEMPLATES.BASE_DOCKERFILE)})",
+            type=argparse_validators.ExistingFile(),
+            default=str(TEMPLATES.get_target_default_path(TEMPLATES.BASE_DOCKERFILE)),
+        )
+        parser.add_argument(
+            "--context",
+            help="Build context, the devcontainer.json uses the project root. (Default: .)",
+            type=Path,
+            default=Path("."),
+        )
+        parser.add_argument(
+            "-t",
+            "--tag",
+            help="Name and tag of the image, e.g. my-project:latest.",
+            default="",
+        )
+        parser.add_argument(
+            "--build-arg",
+            help="Build arg KEY=VALUE, can be passed multiple times. Defaults to the user "
+            "build args of the generated devcontainer.json.",
+            type=argparse_validators.KeyValue(),
+            action="append",
+            default=[],
+            dest="build_args",
+            metavar="KEY=VALUE",
+        )
+        parser.add_argument(
+            "--cache-from",
+            help="Cache source, an image or e.g. type=local,src=DIR. Can be passed multiple times.",
+            action="append",
+            default=[],
+        )
+        parser.add_argument(
+            "--cache-to",
+            help="Cache export, e.g. type=local,dest=DIR,mode=max. Can be passed multiple times.",
+            action="append",
+            default=[],
+        )
+        parser.add_argument(
+            "--target",
+            help="Build stage to build, e.g. base of a --multi-stage Dockerfile.",
+            default="",
+        )
+        parser.add_argument(
+            "--no-cache",
+            help="Do not use the layer cache.",
+            action="store_true",
+            default=False,
+        )
+        parser.add_argument(
+            "--backend",
+            help="Build through the Docker SDK or docker buildx, auto uses buildx if a cache "
+            "is exported or the Dockerfile needs BuildKit. (Default: auto)",
+            choices=BUILD_CONSTANTS.BACKENDS,
+            default="auto",
+        )
+
+    @override
+    def interactive_creation_hook(
+        self,
+        parser: argparse.ArgumentParser,
+        subparser: argparse._SubParsersAction | None,
+        cli_name: str,
+        interaction_provider: InteractionProvider,
+    ) -> list[str]:
+        dockerfile = interaction_provider.input_path(
+            "Dockerfile to build:",
+            default=str(TEMPLATES.get_target_default_path(TEMPLATES.BASE_DOCKERFILE)),
+        )
+        argv = ["--dockerfile", str(dockerfile)]
+        tag = interaction_provider.input_text("Name and tag of the image (optional):")
+        if tag:
+            argv.extend(["--tag", tag])
+        return argv
+
+    @override
+    def main(self, *, parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+        from devc.core.build_service import BuildRequest, BuildService, get_default_build_args
+
+        console = get_console()
+        request = BuildRequest(
+            dockerfile=Path(args.dockerfile),
+            context=args.context,
+            tag=args.tag,
+            build_args={**get_default_build_args(), **dict(args.build_args)},
+            cache_from=args.cache_from,
+            cache_to=args.cache_to,
+            target=args.target,
+            no_cache=args.no_cache,
+            backend=args.backend,
+        )
+        service = BuildService(
+            output=lambda line: console.print(line, markup=False, highlight=False)
+        )
+        try:
+            result = service.build(request)
+        except (BuildError, DependencyMissing) as e:
+            print_error(title="Build Failed", message=str(e))
+            return 1
+        self._print_result(result)
+        return 0
+
+    def _print_result(self, result: "BuildResult") -> None:
+        from rich.table import Table
+        from rich.text import Text
+
+        table = Table(title=f"Build Steps ({result.backend})")
+        table.add_column("Step", no_wrap=True, overflow="ellipsis", max_width=80)
+        table.add_column("Time", justify="right")
+        for step in result.steps:
+            table.add_row(
+                Text(step.name),
+                "[bright_black]cached[/bright_black]" if step.cached else f"{step.duration:.1f} s",
+            )
+        console = get_console()
+        console.print(table)
+        console.print(f"Built {result.image_id or 'the image'} in {result.duration:.1f} s")
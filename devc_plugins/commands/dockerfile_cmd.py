@@ -40,6 +40,7 @@ class DockerfileCommand(CommandExtension):
             PLUGIN_ID,
             DOCKERFILE_PLUGINS,
             required=False,
+            argv=argv,
         )
 
     @override
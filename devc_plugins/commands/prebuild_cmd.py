@@ -0,0 +1,124 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import argparse
+from pathlib import Path
+from typing import override
+
+from devc_cli_plugin_system.command import CommandExtension
+from devc_cli_plugin_system.interactive_creation.interaction_provider import InteractionProvider
+from devc.constants.build_constants import BUILD_CONSTANTS
+from devc.constants.templates import TEMPLATES
+from devc.core.exceptions.build_exceptions import BuildError
+from devc.core.exceptions.devc_exceptions import DependencyMissing
+from devc.utils.console import get_console, print_error
+from devc.utils.validators import argparse_validators
+
+
+class PrebuildCommand(CommandExtension):
+    """Build the image of a generated devcontainer unless it exists and reference it."""
+
+    @override
+    def add_arguments(
+        self, parser: argparse.ArgumentParser, cli_name: str, *, argv: list[str] | None = None
+    ) -> None:
+        parser.add_argument(
+            "--devcontainer",
+            help="devcontainer.json building the Dockerfile. "
+            f"(Default: {TEMPLATES.get_target_default_path(TEMPLATES.DEVCONTAINER_JSON)})",
+            type=argparse_validators.ExistingFile(),
+            default=str(TEMPLATES.get_target_default_path(TEMPLATES.DEVCONTAINER_JSON)),
+        )
+        parser.add_argument(
+            "--extend-with",
+            help="JSON file the Dockerfile has been extended with, part of the content hash.",
+            type=argparse_validators.ExistingFile(),
+            default=None,
+        )
+        parser.add_argument(
+            "--build-arg",
+            help="Build arg KEY=VALUE overriding the args of the devcontainer.json, "
+            "can be passed multiple times.",
+            type=argparse_validators.KeyValue(),
+            action="append",
+            default=[],
+            dest="build_args",
+            metavar="KEY=VALUE",
+        )
+        parser.add_argument(
+            "--reference",
+            help="Reference the prebuilt image as image or as build.cacheFrom of the "
+            "devcontainer.json. (Default: cache-from)",
+            choices=BUILD_CONSTANTS.PREBUILD_REFERENCES,
+            default="cache-from",
+        )
+        parser.add_argument(
+            "--repository",
+            help="Repository of the prebuilt images. "
+            f"(Default: {BUILD_CONSTANTS.PREBUILD_REPOSITORY})",
+            default=BUILD_CONSTANTS.PREBUILD_REPOSITORY,
+        )
+        parser.add_argument(
+            "--backend",
+            help="Build through the Docker SDK or docker buildx, a cache-from reference "
+            "requires buildx. (Default: auto)",
+            choices=BUILD_CONSTANTS.BACKENDS,
+            default="auto",
+        )
+
+    @override
+    def interactive_creation_hook(
+        self,
+        parser: argparse.ArgumentParser,
+        subparser: argparse._SubParsersAction | None,
+        cli_name: str,
+        interaction_provider: InteractionProvider,
+    ) -> list[str]:
+        devcontainer = interaction_provider.input_path(
+            "devcontainer.json to prebuild:",
+            default=str(TEMPLATES.get_target_default_path(TEMPLATES.DEVCONTAINER_JSON)),
+        )
+        reference = interaction_provider.select_single(
+            "Reference the prebuilt image as",
+            choices=list(BUILD_CONSTANTS.PREBUILD_REFERENCES),
+            default="cache-from",
+        )
+        return ["--devcontainer", str(devcontainer), "--reference", reference]
+
+    @override
+    def main(self, *, parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+        from devc.core.build_service import BuildService
+        from devc.core.prebuild_service import PrebuildService
+
+        console = get_console()
+        service = PrebuildService(
+            BuildService(output=lambda line: console.print(line, markup=False, highlight=False))
+        )
+        try:
+            result = service.prebuild(
+                Path(args.devcontainer),
+                extend_with=Path(args.extend_with) if args.extend_with else None,
+                build_args=dict(args.build_args),
+                reference=args.reference,
+                repository=args.repository,
+                backend=args.backend,
+            )
+        except (BuildError, DependencyMissing) as e:
+            print_error(title="Prebuild Failed", message=str(e))
+            return 1
+        if result.build is None:
+            console.print(f"Reusing the prebuilt image {result.tag}")
+        else:
+            console.print(f"Built {result.tag} in {result.build.duration:.1f} s")
+        console.print(f"Referenced {result.tag} as {args.reference} in {args.devcontainer}")
+        return 0
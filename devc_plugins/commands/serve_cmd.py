@@ -0,0 +1,68 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import argparse
+from pathlib import Path
+from typing import override
+
+from devc_cli_plugin_system.command import CommandExtension
+from devc_cli_plugin_system.interactive_creation.interaction_provider import InteractionProvider
+from devc.core.exceptions.serve_exceptions import ServeError
+from devc.utils.console import print_error
+from devc.utils.profiling import span
+
+
+class ServeCommand(CommandExtension):
+    """Keep devc loaded and run the commands of other devc calls on a Unix socket."""
+
+    @override
+    def add_arguments(
+        self, parser: argparse.ArgumentParser, cli_name: str, *, argv: list[str] | None = None
+    ) -> None:
+        from devc.core.serve_client import get_socket_path
+
+        parser.add_argument(
+            "--socket",
+            help="Unix socket to listen on, clients use it if DEVC_SOCKET is set to it. "
+            f"(Default: {get_socket_path()})",
+            default=None,
+        )
+
+    @override
+    def interactive_creation_hook(
+        self,
+        parser: argparse.ArgumentParser,
+        subparser: argparse._SubParsersAction | None,
+        cli_name: str,
+        interaction_provider: InteractionProvider,
+    ) -> list[str]:
+        return []
+
+    @override
+    def main(self, *, parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+        from devc.core.serve_client import get_socket_path
+
+        # loads the plugin system, the templates and the Docker utils, not needed for the help
+        from devc.core.serve_service import ServeService
+
+        service = ServeService(Path(args.socket) if args.socket else get_socket_path())
+        with span("warm up"):
+            service.warm_up()
+        try:
+            service.serve()
+        except ServeError as e:
+            print_error(title="Serve Failed", message=str(e))
+            return 1
+        except KeyboardInterrupt:
+            pass
+        return 0
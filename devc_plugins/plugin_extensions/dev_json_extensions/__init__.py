@@ -36,7 +36,8 @@ from devc_cli_plugin_system.plugin_extensions import (
     PluginExtension,
     PluginExtensionContext,
 )
-from devc.utils.merge_dicts import MergeDictsStrategy, AppendListMerge
+from devc.utils.merge_dicts import MergeDictsStrategy, DevcontainerMerge
+from devc.utils.profiling import span
 
 
 class DevJsonPluginExtension(PluginExtension):
@@ -90,7 +91,7 @@ class DevJsonExtensionManager(ExtensionManager["DevJsonPluginExtension"]):
         self,
         context: PluginExtensionContext,
         cliargs: argparse.Namespace,
-        merge_updates_strategy: MergeDictsStrategy = AppendListMerge(),
+        merge_updates_strategy: MergeDictsStrategy = DevcontainerMerge(),
     ):
         """
         Initialize the DevJsonExtensionManager.
@@ -99,8 +100,8 @@ class DevJsonExtensionManager(ExtensionManager["DevJsonPluginExtension"]):
             context (PluginExtensionContext): Holds and manages all available plugin extensions.
             args: Parsed CLI arguments; used to determine which extensions are called.
             merge_updates_strategy (MergeDictsStrategy, optional): Strategy to merge multiple
-                update dictionaries returned by extensions. Defaults to AppendListMerge(),
-                which appends lists and merges dictionaries.
+                update dictionaries returned by extensions. Defaults to DevcontainerMerge(),
+                which merges dictionaries and drops duplicated runArgs, mounts and ports.
 
         Attributes
         ----------
@@ -115,8 +116,9 @@ class DevJsonExtensionManager(ExtensionManager["DevJsonPluginExtension"]):
     def get_combined_updates(self) -> dict[str, Any]:
         """Merge updates from all called extensions."""
         merged: dict = {}
-        for _, ext in self.called_extensions.items():
-            updates = ext.get_devcontainer_updates(vars(self.cliargs))
+        for name, ext in self.called_extensions.items():
+            with span(f"extension {name}"):
+                updates = ext.get_devcontainer_updates(vars(self.cliargs))
             merged = self._merge_updates(merged, updates)
         for update in self._additional_updates:
             merged = self._merge_updates(merged, update)
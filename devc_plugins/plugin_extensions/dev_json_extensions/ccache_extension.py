@@ -0,0 +1,97 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Any, override
+import argparse
+
+from devc_plugins.plugin_extensions.dev_json_extensions import (
+    DevJsonPluginExtension,
+)
+from devc_plugins.plugin_extensions.dockerfile_extensions.ccache_extension import (
+    format_ccache_size,
+)
+from devc.constants.defaults import DEFAULT_CCACHE
+from devc.utils.argparse_helpers import get_or_create_group
+from devc.constants.plugin_constants import PLUGIN_EXTENSION_ARGUMENT_GROUPS
+from devc_cli_plugin_system.interactive_creation.interaction_provider import InteractionProvider
+from devc.utils.validators import argparse_validators, input_provider_validators
+
+
+class CcacheExtension(DevJsonPluginExtension):
+
+    name = "ccache"
+    ccache_volume = "ccache_volume"
+
+    def _get_devcontainer_updates(self, cliargs: argparse.Namespace) -> dict[str, Any]:
+        size = cliargs.get(CcacheExtension.get_name())
+        if not size:
+            return {}
+
+        volume = cliargs.get(CcacheExtension.get_name(self.ccache_volume)) or DEFAULT_CCACHE.VOLUME
+        return {
+            "mounts": [f"source={volume},target={DEFAULT_CCACHE.DIR},type=volume"],
+            "containerEnv": {
+                "CCACHE_DIR": DEFAULT_CCACHE.DIR,
+                "CCACHE_MAXSIZE": format_ccache_size(size),
+                "CMAKE_C_COMPILER_LAUNCHER": "ccache",
+                "CMAKE_CXX_COMPILER_LAUNCHER": "ccache",
+            },
+            # a volume created by a container of another image may be owned by root
+            "postCreateCommand": {
+                "ccache": f"sudo chown $(id -u):$(id -g) {DEFAULT_CCACHE.DIR}",
+            },
+        }
+
+    def _register_arguments(self, parser: argparse.ArgumentParser, defaults: dict) -> None:
+        compiler_group = get_or_create_group(parser, PLUGIN_EXTENSION_ARGUMENT_GROUPS.COMPILER)
+        compiler_group.add_argument(
+            CcacheExtension.as_arg_name(),
+            type=argparse_validators.ByteSize(),
+            nargs="?",
+            const=DEFAULT_CCACHE.MAX_SIZE,
+            metavar="MAX_SIZE",
+            default=defaults.get(CcacheExtension.get_name(), None),
+            help="Keep the compiler cache in a named volume shared by the devcontainers of the "
+            "host, it keeps at most MAX_SIZE, e.g. 20g. Needs ccache in the image, e.g. from "
+            "'devc dockerfile --ccache'. (Default: 5g)",
+        )
+        compiler_group.add_argument(
+            CcacheExtension.as_arg_name(self.ccache_volume),
+            metavar="NAME",
+            default=defaults.get(CcacheExtension.get_name(self.ccache_volume), None),
+            help=f"Name of the compiler cache volume. (Default: {DEFAULT_CCACHE.VOLUME})",
+        )
+
+    @override
+    def interactive_creation_hook(
+        self,
+        parser: argparse.ArgumentParser,
+        subparser: argparse._SubParsersAction,
+        cli_name: str,
+        interaction_provider: InteractionProvider,
+    ) -> list[str]:
+        size = interaction_provider.input_text(
+            "Maximum size of the compiler cache:",
+            default="5g",
+            validate=input_provider_validators.ByteSize(),
+        )
+        volume = interaction_provider.input_text(
+            "Name of the compiler cache volume:",
+            default=DEFAULT_CCACHE.VOLUME,
+            validate=input_provider_validators.NotEmpty(),
+        )
+        return [
+            f"{CcacheExtension.as_arg_name()}={size.strip()}",
+            CcacheExtension.as_arg_name(self.ccache_volume),
+            volume.strip(),
+        ]
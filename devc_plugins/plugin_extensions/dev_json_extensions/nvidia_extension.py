@@ -18,7 +18,7 @@ import argparse
 from devc_plugins.plugin_extensions.dev_json_extensions import (
     DevJsonPluginExtension,
 )
-from devc.utils.docker_utils import get_docker_version
+from devc.utils.docker_utils import get_docker_daemon_facts
 from devc.utils.argparse_helpers import get_or_create_group
 from devc.constants.plugin_constants import PLUGIN_EXTENSION_ARGUMENT_GROUPS
 from devc.core.exceptions.devc_exceptions import EnvironmentValidationError
@@ -82,14 +82,12 @@ class NvidiaExtension(DevJsonPluginExtension):
         return self._auto_detect_flag()
 
     def _auto_detect_flag(self) -> str:
-        try:
-            version = get_docker_version()
-            if version >= Version("19.03"):
-                return "--gpus=all"
-            else:
-                return "--runtime=nvidia"
-        except Exception:
+        # the facts are cached, so generating many devcontainers only probes the daemon once
+        facts = get_docker_daemon_facts()
+        version = facts.parsed_version if facts is not None else None
+        if version is None or version >= Version("19.03"):
             return "--gpus=all"
+        return "--runtime=nvidia"
 
     def _capability_flag_from_arg(self, cliargs: argparse.Namespace) -> list[str]:
         capability = cliargs.get(NvidiaExtension.get_name(self.nvidia_capability), None)
@@ -0,0 +1,242 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Any, override
+import argparse
+import os
+
+from devc_plugins.plugin_extensions.dev_json_extensions import (
+    DevJsonPluginExtension,
+)
+from devc.utils.docker_utils import get_docker_daemon_facts
+from devc.utils.argparse_helpers import get_or_create_group
+from devc.constants.plugin_constants import PLUGIN_EXTENSION_ARGUMENT_GROUPS
+from devc.core.exceptions.devc_exceptions import EnvironmentValidationError
+from devc_cli_plugin_system.interactive_creation.interaction_provider import InteractionProvider
+from devc.utils.validators import argparse_validators, input_provider_validators
+
+# Docker rejects memory limits below 6 MB
+MIN_MEMORY = 6 * 1024**2
+
+
+class PerfExtension(DevJsonPluginExtension):
+
+    name = "perf"
+
+    def _get_devcontainer_updates(self, cliargs: argparse.Namespace) -> dict[str, Any]:
+        shm_size = cliargs.get("shm_size")
+        cpus = cliargs.get("cpus")
+        cpuset_cpus = cliargs.get("cpuset_cpus")
+        memory = cliargs.get("memory")
+
+        run_args = []
+        if shm_size:
+            run_args.append(f"--shm-size={_format_byte_size(shm_size)}")
+        if cliargs.get("ipc_host"):
+            run_args.append("--ipc=host")
+        for ulimit in cliargs.get("ulimit") or []:
+            run_args.append(f"--ulimit={ulimit}")
+        for tmpfs in cliargs.get("tmpfs") or []:
+            run_args.append(f"--tmpfs={tmpfs}")
+        if cpus:
+            run_args.append(f"--cpus={cpus:g}")
+        if cpuset_cpus:
+            run_args.append(f"--cpuset-cpus={_format_cpuset(cpuset_cpus)}")
+        if memory:
+            run_args.append(f"--memory={_format_byte_size(memory)}")
+
+        return {"runArgs": run_args} if run_args else {}
+
+    def validate_environment(self, cliargs: argparse.Namespace) -> None:
+        host_cpus, host_memory = _get_available_resources()
+        shm_size = cliargs.get("shm_size")
+        cpus = cliargs.get("cpus")
+        cpuset_cpus = cliargs.get("cpuset_cpus")
+        memory = cliargs.get("memory")
+
+        if shm_size and cliargs.get("ipc_host"):
+            raise EnvironmentValidationError(
+                "--shm-size has no effect with --ipc-host, the container uses /dev/shm of the host"
+            )
+        if host_cpus and cpus and cpus > host_cpus:
+            raise EnvironmentValidationError(
+                f"--cpus={cpus:g} exceeds the {host_cpus} CPUs of the host"
+            )
+        if host_cpus and cpuset_cpus and max(cpuset_cpus) >= host_cpus:
+            raise EnvironmentValidationError(
+                f"--cpuset-cpus={_format_cpuset(cpuset_cpus)} includes CPUs the "
+                f"host does not have, available are 0-{host_cpus - 1}"
+            )
+        if memory:
+            if memory < MIN_MEMORY:
+                raise EnvironmentValidationError(
+                    f"--memory={_format_byte_size(memory)} is below the minimum of 6m"
+                )
+            if host_memory and memory > host_memory:
+                raise EnvironmentValidationError(
+                    f"--memory={_format_byte_size(memory)} exceeds the "
+                    f"{_format_byte_size(host_memory)} of memory of the host"
+                )
+        # /dev/shm is accounted to the memory of the container
+        shm_limit = memory or host_memory
+        if shm_size and shm_limit and shm_size > shm_limit:
+            raise EnvironmentValidationError(
+                f"--shm-size={_format_byte_size(shm_size)} exceeds the "
+                f"{_format_byte_size(shm_limit)} of memory available to the container"
+            )
+
+    def _register_arguments(self, parser: argparse.ArgumentParser, defaults: dict) -> None:
+        perf_group = get_or_create_group(parser, PLUGIN_EXTENSION_ARGUMENT_GROUPS.PERFORMANCE)
+        perf_group.add_argument(
+            "--shm-size",
+            type=argparse_validators.ByteSize(),
+            metavar="SIZE",
+            default=defaults.get("shm_size", None),
+            help="Size of /dev/shm, e.g. 2g. Docker's 64m are too small for the shared memory "
+            "transport of ROS 2 and for Gazebo.",
+        )
+        perf_group.add_argument(
+            "--ipc-host",
+            action="store_const",
+            const=True,
+            default=defaults.get("ipc_host", None),
+            help="Share the IPC namespace and /dev/shm of the host (--ipc=host).",
+        )
+        perf_group.add_argument(
+            "--ulimit",
+            type=argparse_validators.Ulimit(),
+            action="append",
+            metavar="NAME=SOFT[:HARD]",
+            default=defaults.get("ulimit", None),
+            help="Ulimit of the container, e.g. nofile=1024:524288. Can be passed multiple times.",
+        )
+        perf_group.add_argument(
+            "--tmpfs",
+            type=argparse_validators.Tmpfs(),
+            action="append",
+            metavar="PATH[:OPTIONS]",
+            default=defaults.get("tmpfs", None),
+            help="Mount a tmpfs as scratch space, e.g. /tmp:size=2g. Can be passed multiple times.",
+        )
+        perf_group.add_argument(
+            "--cpus",
+            type=argparse_validators.Cpus(),
+            default=defaults.get("cpus", None),
+            help="Number of CPUs the container may use, e.g. 4 or 1.5.",
+        )
+        perf_group.add_argument(
+            "--cpuset-cpus",
+            type=argparse_validators.CpuSet(),
+            metavar="CPUS",
+            default=defaults.get("cpuset_cpus", None),
+            help="Pin the container to CPUs, e.g. 0-3,6.",
+        )
+        perf_group.add_argument(
+            "--memory",
+            type=argparse_validators.ByteSize(),
+            metavar="SIZE",
+            default=defaults.get("memory", None),
+            help="Memory limit of the container, e.g. 8g.",
+        )
+
+    @override
+    def interactive_creation_hook(
+        self,
+        parser: argparse.ArgumentParser,
+        subparser: argparse._SubParsersAction,
+        cli_name: str,
+        interaction_provider: InteractionProvider,
+    ) -> list[str]:
+        result: list[str] = []
+        if interaction_provider.confirm("Share the IPC namespace and /dev/shm of the host?"):
+            result.append("--ipc-host")
+        else:
+            shm_size = interaction_provider.input_text(
+                "Size of /dev/shm (e.g. 2g, empty for Docker's default of 64m):",
+                default="1g",
+                validate=input_provider_validators.ByteSize(optional=True),
+            )
+            if shm_size.strip():
+                result.append(f"--shm-size={shm_size.strip()}")
+
+        if interaction_provider.confirm("Mount /tmp as tmpfs?"):
+            result.append("--tmpfs=/tmp")
+
+        cpus = interaction_provider.input_text(
+            "Number of CPUs the container may use (empty for no limit):",
+            default="",
+            validate=input_provider_validators.Cpus(optional=True),
+        )
+        if cpus.strip():
+            result.append(f"--cpus={cpus.strip()}")
+
+        cpuset = interaction_provider.input_text(
+            "CPUs to pin the container to, e.g. 0-3 (empty for all):",
+            default="",
+            validate=input_provider_validators.CpuSet(optional=True),
+        )
+        if cpuset.strip():
+            result.append(f"--cpuset-cpus={cpuset.strip()}")
+
+        memory = interaction_provider.input_text(
+            "Memory limit, e.g. 8g (empty for no limit):",
+            default="",
+            validate=input_provider_validators.ByteSize(optional=True),
+        )
+        if memory.strip():
+            result.append(f"--memory={memory.strip()}")
+
+        return result
+
+
+def _get_available_resources() -> tuple[int, int]:
+    """
+    Return the CPUs and bytes of memory available to containers, 0 if unknown.
+
+    These are the resources of the Docker daemon, which may run in a VM with
+    less resources than the host, or of the host if the daemon is not reachable.
+    """
+    facts = get_docker_daemon_facts()
+    cpus = facts.cpus if facts is not None and facts.cpus else os.cpu_count() or 0
+    memory = facts.memory if facts is not None and facts.memory else _get_host_memory()
+    return cpus, memory
+
+
+def _get_host_memory() -> int:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        # not available on e.g. Windows
+        return 0
+
+
+def _format_byte_size(size: int) -> str:
+    """Return the ``size`` in the largest unit Docker accepts which keeps it exact."""
+    for unit, factor in (("t", 1024**4), ("g", 1024**3), ("m", 1024**2), ("k", 1024)):
+        if size % factor == 0:
+            return f"{size // factor}{unit}"
+    return str(size)
+
+
+def _format_cpuset(cpus: tuple[int, ...]) -> str:
+    """Return the CPU ids as list of ranges, e.g. ``0-3,6``."""
+    ranges: list[str] = []
+    start = previous = cpus[0]
+    for cpu in (*cpus[1:], None):
+        if cpu is not None and cpu == previous + 1:
+            previous = cpu
+            continue
+        ranges.append(str(start) if start == previous else f"{start}-{previous}")
+        if cpu is not None:
+            start = previous = cpu
+    return ",".join(ranges)
@@ -11,13 +11,22 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from typing import Any, override
 import argparse
-from devc_cli_plugin_system.plugin_extensions import PluginExtension
+
+from devc_cli_plugin_system.plugin_extensions import PluginExtension, PluginExtensionContext
+from devc_cli_plugin_system.plugin_extensions.extension_manager import ExtensionManager
+from devc.utils.merge_dicts import MergeDictsStrategy, AppendListMerge
+from devc.utils.profiling import span
 
 
 class DockerfilePluginExtension(PluginExtension):
     """The base class for plugin extension for the dockerfile plugin."""
 
+    def get_apt_packages(self, cliargs: argparse.Namespace) -> list[str]:
+        """Return the apt packages to install in addition to the ones of the plugin."""
+        return []
+
     def get_root_docker_snippet(self, cliargs: argparse.Namespace) -> str:
         """Return a dockerfile snippet which is executed as ROOT in the dockerfile."""
         return ""
@@ -25,3 +34,42 @@ class DockerfilePluginExtension(PluginExtension):
     def get_user_docker_snippet(self, cliargs: argparse.Namespace) -> str:
         """Return a dockerfile snippet which is executed after switching to the USER in the dockerfile."""  # noqa: E501
         return ""
+
+
+class DockerfileExtensionManager(ExtensionManager["DockerfilePluginExtension"]):
+    """Manages plugin extensions for the dockerfile plugins."""
+
+    def __init__(
+        self,
+        context: PluginExtensionContext,
+        cliargs: argparse.Namespace,
+        merge_updates_strategy: MergeDictsStrategy = AppendListMerge(),
+    ):
+        super().__init__(context, cliargs, merge_updates_strategy)
+        self._additional_updates: list[dict[str, Any]] = []
+
+    @override
+    def get_combined_updates(self) -> dict[str, Any]:
+        """Merge the packages and snippets of all called extensions into pre-defined extensions."""
+        merged: dict = {}
+        cliargs = vars(self.cliargs)
+        for name, ext in self.called_extensions.items():
+            with span(f"extension {name}"):
+                ext.precondition_environment(cliargs)
+                ext.validate_environment(cliargs)
+                updates = {
+                    "additional_apt_packages": ext.get_apt_packages(cliargs),
+                    "additional_sudo_commands": [ext.get_root_docker_snippet(cliargs)],
+                    "additional_user_commands": [ext.get_user_docker_snippet(cliargs)],
+                }
+            merged = self._merge_updates(
+                merged, {key: list(filter(None, value)) for key, value in updates.items()}
+            )
+        for update in self._additional_updates:
+            merged = self._merge_updates(merged, update)
+        return merged
+
+    @override
+    def add_update(self, update: dict[str, Any]) -> None:
+        """Add updates of pre-defined extensions merged with the plugin extension updates."""
+        self._additional_updates.append(update)
@@ -0,0 +1,85 @@
+# Copyright 2025 Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import override
+import argparse
+
+from devc_plugins.plugin_extensions.dockerfile_extensions import (
+    DockerfilePluginExtension,
+)
+from devc.constants.defaults import DEFAULT_CCACHE
+from devc.utils.argparse_helpers import get_or_create_group
+from devc.constants.plugin_constants import PLUGIN_EXTENSION_ARGUMENT_GROUPS
+from devc_cli_plugin_system.interactive_creation.interaction_provider import InteractionProvider
+from devc.utils.validators import argparse_validators, input_provider_validators
+
+
+class CcacheExtension(DockerfilePluginExtension):
+
+    name = "ccache"
+
+    def get_apt_packages(self, cliargs: argparse.Namespace) -> list[str]:
+        return ["ccache"] if cliargs.get(CcacheExtension.get_name()) else []
+
+    def get_root_docker_snippet(self, cliargs: argparse.Namespace) -> str:
+        size = cliargs.get(CcacheExtension.get_name())
+        if not size:
+            return ""
+
+        # the compilers in /usr/lib/ccache call ccache, the CMake launchers cover colcon builds
+        return "\n".join(
+            [
+                f"# Compiler cache - keep it in a volume mounted to {DEFAULT_CCACHE.DIR}",
+                f"RUN mkdir -p -m 1777 {DEFAULT_CCACHE.DIR}",
+                f"ENV CCACHE_DIR={DEFAULT_CCACHE.DIR}",
+                f"ENV CCACHE_MAXSIZE={format_ccache_size(size)}",
+                "ENV CMAKE_C_COMPILER_LAUNCHER=ccache",
+                "ENV CMAKE_CXX_COMPILER_LAUNCHER=ccache",
+                "ENV PATH=/usr/lib/ccache:$PATH",
+            ]
+        )
+
+    def _register_arguments(self, parser: argparse.ArgumentParser, defaults: dict) -> None:
+        compiler_group = get_or_create_group(parser, PLUGIN_EXTENSION_ARGUMENT_GROUPS.COMPILER)
+        compiler_group.add_argument(
+            CcacheExtension.as_arg_name(),
+            type=argparse_validators.ByteSize(),
+            nargs="?",
+            const=DEFAULT_CCACHE.MAX_SIZE,
+            metavar="MAX_SIZE",
+            default=defaults.get(CcacheExtension.get_name(), None),
+            help="Install ccache and let the C and C++ compilers use it, the cache keeps at "
+            "most MAX_SIZE, e.g. 20g. (Default: 5g)",
+        )
+
+    @override
+    def interactive_creation_hook(
+        self,
+        parser: argparse.ArgumentParser,
+        subparser: argparse._SubParsersAction,
+        cli_name: str,
+        interaction_provider: InteractionProvider,
+    ) -> list[str]:
+        size = interaction_provider.input_text(
+            "Maximum size of the compiler cache:",
+            default="5g",
+            validate=input_provider_validators.ByteSize(),
+        )
+        return [f"{CcacheExtension.as_arg_name()}={size.strip()}"]
+
+
+def format_ccache_size(size: int) -> str:
+    """Return ``size`` bytes with the binary suffix of ccache, e.g. ``5Gi``."""
+    if size % 1024**3 == 0:
+        return f"{size // 1024**3}Gi"
+    return f"{max(size // 1024**2, 1)}Mi"
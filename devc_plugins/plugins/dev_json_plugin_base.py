@@ -23,14 +23,17 @@ from devc_plugins.plugin_extensions.dev_json_extensions import (
     DevJsonExtensionManager,
 )
 from devc.constants.templates import TEMPLATES
+from devc.core.build_context import create_dockerignore
+from devc.core.exceptions.devc_exceptions import EnvironmentValidationError
 from devc.core.exceptions.devcontainer_json_exception import (
     DevJsonTemplateNotFoundError,
     DevJsonTemplateRenderError,
     DevJsonExistsError,
+    DevJsonMergeConflictError,
 )
 from devc.core.models.devcontainer_extension_json_scheme import DevJsonHandler
 from devc.core.models.options import DevContainerJsonOptions
-from devc.core.template_loader import TemplateLoader
+from devc.core.template_loader import get_default_template_loader
 from devc.core.template_machine import TemplateMachine
 from devc.core.devcontainer_json_creation_service import (
     DevcontainerJsonCreationService,
@@ -49,6 +52,8 @@ class DevJsonPluginBase(Plugin):
     DEFAULT_TEMPLATE = TEMPLATES.DEVCONTAINER_JSON
     PLUGIN_EXTENSION_GROUP = "devc_commands.dev_json.plugins.extensions"
     PLUGIN_EXTENSION_MANAGER = DevJsonExtensionManager
+    # patterns added to the generated .dockerignore
+    DOCKERIGNORE_PATTERNS: list[str] = []
 
     @override
     def add_arguments(self, parser: argparse.ArgumentParser, cli_name: str) -> None:
@@ -94,6 +99,33 @@ class DevJsonPluginBase(Plugin):
             action="store_true",
             default=False,
         )
+        base_group.add_argument(
+            "--incremental",
+            help="Skip the generation if the inputs are unchanged since the last incremental "
+            "run and the devcontainer.json has not been modified since.",
+            action="store_true",
+            default=False,
+        )
+        base_group.add_argument(
+            "--minimal-context",
+            help="Use the directory of the Dockerfile as build context instead of the project "
+            "root, if the Dockerfile does not copy files from the context.",
+            action="store_true",
+            default=False,
+        )
+        base_group.add_argument(
+            "--no-dockerignore",
+            help="Do not generate a .dockerignore in the project root.",
+            action="store_true",
+            default=False,
+        )
+        base_group.add_argument(
+            "--override-dockerignore",
+            help="Override an existing .dockerignore in the project root, which has not been "
+            "generated by devc.",
+            action="store_true",
+            default=False,
+        )
         self._extend_base_arguments(parser, cli_name)
 
     def _get_extend_file(self) -> Path:
@@ -208,9 +240,11 @@ class DevJsonPluginBase(Plugin):
         dev_json_handler = self._create_handler_from_args(context.args)
         self._apply_overrides_to_handler_content(dev_json_handler, context.args)
         options = self._create_options_from_args(context.args)
+        template_machine = TemplateMachine()
+        loader = get_default_template_loader()
         dev_json_creator = DevcontainerJsonCreationService(
-            template_machine=TemplateMachine(),
-            loader=TemplateLoader(template_dir=TEMPLATES.TEMPLATE_DIR),
+            template_machine=template_machine,
+            loader=loader,
             ext_manager=context.ext_manager,
         )
         try:
@@ -231,6 +265,25 @@ class DevJsonPluginBase(Plugin):
         except DevJsonTemplateRenderError as e:
             print_error(title="Template Render Error", message=str(e))
             return 1
+
+        except DevJsonMergeConflictError as e:
+            print_error(title="Conflicting Updates", message=str(e))
+            return 1
+
+        except EnvironmentValidationError as e:
+            print_error(title="Invalid Environment", message=str(e))
+            return 1
+
+        # nothing is built if the devcontainer.json uses an existing image
+        if not context.args.no_dockerignore and not context.args.image:
+            # the build context of the devcontainer.json is its parent directory
+            create_dockerignore(
+                Path(context.args.path).resolve().parent,
+                self.DOCKERIGNORE_PATTERNS,
+                template_machine=template_machine,
+                loader=loader,
+                override=context.args.override_dockerignore,
+            )
         return 0
 
     def _add_live_json_patch(
@@ -279,4 +332,6 @@ class DevJsonPluginBase(Plugin):
             path=args.path,
             extend_with=args.extend_with,
             override=args.override,
+            incremental=args.incremental,
+            minimal_context=args.minimal_context,
         )
@@ -16,16 +16,22 @@ from typing import override
 import argparse
 
 from devc_cli_plugin_system.plugin import Plugin
+from devc_plugins.plugin_extensions.dockerfile_extensions import DockerfileExtensionManager
 from devc.constants.defaults import DEFAULT_IMAGES
 from devc.constants.templates import TEMPLATES
+from devc.core.build_context import create_dockerignore
+from devc.core.exceptions.devc_exceptions import EnvironmentValidationError
 from devc.core.exceptions.dockerfile_exceptions import (
     DockerfileTemplateNotFoundError,
     DockerfileExistsError,
+    DockerfileExtensionError,
+    DockerfileInsertionError,
+    DockerfilePackageError,
     DockerfileTemplateRenderError,
 )
 from devc.core.models.dockerfile_extension_json_scheme import DockerfileHandler
 from devc.core.models.options import DockerfileOptions
-from devc.core.template_loader import TemplateLoader
+from devc.core.template_loader import get_default_template_loader
 from devc.core.template_machine import TemplateMachine
 from devc.core.dockerfile_creation_service import DockerfileCreationService
 from devc.utils.console import print_error, print_warning
@@ -39,6 +45,10 @@ class DockerfilePluginBase(Plugin):
 
     DEFAULT_IMAGE = DEFAULT_IMAGES.UBUNTU
     DEFAULT_TEMPLATE = TEMPLATES.BASE_DOCKERFILE
+    # patterns added to the generated .dockerignore
+    DOCKERIGNORE_PATTERNS: list[str] = []
+    PLUGIN_EXTENSION_GROUP = "devc_commands.dockerfile.plugins.extensions"
+    PLUGIN_EXTENSION_MANAGER = DockerfileExtensionManager
 
     @override
     def add_arguments(self, parser: argparse.ArgumentParser, cli_name: str) -> None:
@@ -68,6 +78,58 @@ class DockerfilePluginBase(Plugin):
             action="store_true",
             default=False,
         )
+        parser.add_argument(
+            "--buildkit-cache",
+            help="Cache the apt and pip downloads between builds with BuildKit cache mounts.",
+            action="store_true",
+            default=False,
+        )
+        parser.add_argument(
+            "--multi-stage",
+            help="Install the packages in a user independent base stage, which can be cached and "
+            "shared by all users of the host, and set up the user in a final stage.",
+            action="store_true",
+            default=False,
+        )
+        parser.add_argument(
+            "--split-apt-layers",
+            help="Install the additional apt packages in a layer of their own, so changing them "
+            "does not reinstall the base packages.",
+            action="store_true",
+            default=False,
+        )
+        parser.add_argument(
+            "--apt-lockfile",
+            help="File pinning the versions of the apt packages, one 'package=version' per line.",
+            type=ExistingFile(),
+            default=None,
+        )
+        parser.add_argument(
+            "--optimize-layers",
+            help="Merge adjacent RUN instructions to reduce the number of image layers.",
+            action="store_true",
+            default=False,
+        )
+        parser.add_argument(
+            "--no-dockerignore",
+            help="Do not generate a .dockerignore in the project root.",
+            action="store_true",
+            default=False,
+        )
+        parser.add_argument(
+            "--override-dockerignore",
+            help="Override an existing .dockerignore in the project root, which has not been "
+            "generated by devc.",
+            action="store_true",
+            default=False,
+        )
+        parser.add_argument(
+            "--incremental",
+            help="Skip the generation if the inputs are unchanged since the last incremental "
+            "run and the Dockerfile has not been modified since.",
+            action="store_true",
+            default=False,
+        )
         self._extend_base_arguments(parser, cli_name)
 
     @override
@@ -140,12 +202,19 @@ class DockerfilePluginBase(Plugin):
     def main(self, context: PluginContext) -> int:
         dockerfile_handler = self._create_handler_from_args(context.args)
         self._apply_overrides_to_handler_content(dockerfile_handler, context.args)
+        if context.args.buildkit_cache:
+            dockerfile_handler.enable_buildkit_cache()
+        if context.args.multi_stage:
+            dockerfile_handler.enable_multi_stage()
+        if context.args.split_apt_layers:
+            dockerfile_handler.enable_split_apt_layers()
         options = self._create_options_from_args(context.args)
-        creator = DockerfileCreationService(
-            template_machine=TemplateMachine(),
-            loader=TemplateLoader(template_dir=TEMPLATES.TEMPLATE_DIR),
-        )
+        template_machine = TemplateMachine()
+        loader = get_default_template_loader()
+        creator = DockerfileCreationService(template_machine=template_machine, loader=loader)
         try:
+            if context.ext_manager is not None:
+                dockerfile_handler.apply_updates(context.ext_manager.get_combined_updates())
             creator.create_dockerfile(
                 template_file=self.DEFAULT_TEMPLATE,
                 dockerfile_handler=dockerfile_handler,
@@ -160,6 +229,28 @@ class DockerfilePluginBase(Plugin):
         except DockerfileTemplateRenderError as e:
             print_error(title="Template Render Error", message=str(e))
             return 1
+        except DockerfileInsertionError as e:
+            print_error(title="Invalid Insertion", message=str(e))
+            return 1
+        except DockerfilePackageError as e:
+            print_error(title="Invalid Apt Packages", message=str(e))
+            return 1
+        except DockerfileExtensionError as e:
+            print_error(title="Invalid Extension Update", message=str(e))
+            return 1
+        except EnvironmentValidationError as e:
+            print_error(title="Invalid Environment", message=str(e))
+            return 1
+
+        if not context.args.no_dockerignore:
+            # the Dockerfile is built with the project root as context
+            create_dockerignore(
+                Path(context.args.path).resolve().parent,
+                self.DOCKERIGNORE_PATTERNS,
+                template_machine=template_machine,
+                loader=loader,
+                override=context.args.override_dockerignore,
+            )
         return 0
 
     def _apply_overrides_to_handler_content(
@@ -189,4 +280,7 @@ class DockerfilePluginBase(Plugin):
             path=args.path,
             extend_with=args.extend_with,
             override=args.override,
+            incremental=args.incremental,
+            optimize_layers=args.optimize_layers,
+            apt_lockfile=args.apt_lockfile,
         )
@@ -22,6 +22,9 @@ from devc_plugins.plugins.dev_json_plugin_base import DevJsonPluginBase
 class GodotDevJsonPlugin(DevJsonPluginBase):
     """Create a basic Godot devcontainer.json."""
 
+    # the import cache of the editor is not needed to build the image
+    DOCKERIGNORE_PATTERNS = [".godot/"]
+
     def _get_direct_json_patch(self, cliargs: argparse.Namespace) -> dict[str, Any]:
         """Add plugins used with Godot development to the extensions."""
         updates = {
@@ -27,6 +27,8 @@ class GodotDockerfilePlugin(DockerfilePluginBase):
 
     SUPPORTED_GODOT_VERSIONS = ("4.5.1-stable",)  # we need a comma here to make it a tuple
     SUPPORTED_GODOT_RUNTIMES = ("standard", "mono")
+    # the import cache of the editor is not needed to build the image
+    DOCKERIGNORE_PATTERNS = [".godot/"]
 
     @override
     def _extend_base_arguments(self, parser: argparse.ArgumentParser, cli_name: str) -> None:
@@ -28,6 +28,8 @@ class Ros2DesktopFullDockerfilePlugin(DockerfilePluginBase):
 
     DEFAULT_IMAGE = ""  # use default img from patch
     SUPPORTED_ROS_DISTROS = ("humble", "iron", "jazzy", "kilted", "rolling")
+    # caches and recorded bags are not needed to build the image
+    DOCKERIGNORE_PATTERNS = ["**/__pycache__", "**/*.db3", "**/*.mcap"]
 
     @override
     def _extend_base_arguments(self, parser: argparse.ArgumentParser, cli_name: str) -> None:
@@ -29,6 +29,12 @@ class Ros2DevJsonPlugin(DevJsonPluginBase):
 
     SUPPORTED_ROS_DISTROS = ("humble", "iron", "jazzy", "kilted", "rolling")
     SUPPORTED_DISCOVERY_RANGES = ("SUBNET", "LOCALHOST", "OFF", "SYSTEM_DEFAULT")
+    # caches and recorded bags are not needed to build the image
+    DOCKERIGNORE_PATTERNS = ["**/__pycache__", "**/*.db3", "**/*.mcap"]
+    # the workspaceFolder of the devcontainer.json template
+    WORKSPACE_FOLDER = "/home/${localEnv:USER}/workspace"
+    # directories colcon writes its artifacts to
+    ARTIFACT_DIRECTORIES = ("build", "install", "log")
 
     @override
     def _extend_base_arguments(self, parser: argparse.ArgumentParser, cli_name: str) -> None:
@@ -54,6 +60,20 @@ class Ros2DevJsonPlugin(DevJsonPluginBase):
             default="SUBNET",
             nargs="?",
         )
+        ros2_group.add_argument(
+            "--artifact-volumes",
+            help="Keep the build, install and log directories of the workspace in named volumes "
+            "per workspace instead of writing them through the bind mount.",
+            action="store_true",
+            default=False,
+        )
+        ros2_group.add_argument(
+            "--log-tmpfs",
+            help="Mount the log directory of the workspace as tmpfs, its content is lost when "
+            "the container stops.",
+            action="store_true",
+            default=False,
+        )
 
     @override
     def _extend_base_interactive_creation_hook(
@@ -75,6 +95,13 @@ class Ros2DevJsonPlugin(DevJsonPluginBase):
             default="SUBNET",
         )
 
+        artifact_volumes = interaction_provider.confirm(
+            "Keep build, install and log of the workspace in named volumes?", default=False
+        )
+        log_tmpfs = interaction_provider.confirm(
+            "Mount the log directory as tmpfs (lost when the container stops)?", default=False
+        )
+
         result: list[str] = []
 
         if ros_distro:
@@ -83,6 +110,10 @@ class Ros2DevJsonPlugin(DevJsonPluginBase):
             result.extend(["--ros-domain-id", ros_domain_id])
         if ros_automatic_discovery_range:
             result.extend(["--ros-automatic-discovery-range", ros_automatic_discovery_range])
+        if artifact_volumes:
+            result.append("--artifact-volumes")
+        if log_tmpfs:
+            result.append("--log-tmpfs")
         return result
 
     def _get_direct_json_patch(self, args: argparse.Namespace) -> dict[str, Any]:
@@ -123,6 +154,32 @@ class Ros2DevJsonPlugin(DevJsonPluginBase):
                 "ROS_LOCALHOST_ONLY": self._map_localhost_only(args.ros_automatic_discovery_range),
                 "ROS_DOMAIN_ID": f"{args.ros_domain_id}",
             }
+        updates.update(self._get_artifact_mounts(args))
+        return updates
+
+    def _get_artifact_mounts(self, args: argparse.Namespace) -> dict[str, Any]:
+        """Return the mounts keeping the colcon artifacts out of the workspace bind mount."""
+        mounts = []
+        volumes = []
+        for directory in self.ARTIFACT_DIRECTORIES:
+            target = f"{self.WORKSPACE_FOLDER}/{directory}"
+            if directory == "log" and args.log_tmpfs:
+                mounts.append(f"target={target},type=tmpfs")
+            elif args.artifact_volumes:
+                # ${devcontainerId} is stable per workspace, so each workspace gets its volumes
+                mounts.append(
+                    f"source=devc-${{devcontainerId}}-{directory},target={target},type=volume"
+                )
+                volumes.append(target)
+        if not mounts:
+            return {}
+
+        updates: dict[str, Any] = {"mounts": mounts}
+        if volumes:
+            # new volumes are owned by root, the tmpfs is writable by everyone
+            updates["postCreateCommand"] = {
+                "artifact-volumes": f"sudo chown $(id -u):$(id -g) {' '.join(volumes)}"
+            }
         return updates
 
     def _map_localhost_only(self, automatic_discovery_range: str) -> str:
@@ -0,0 +1,53 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from devc.core.apt_packages import normalize_apt_packages, read_apt_lockfile
+from devc.core.exceptions.dockerfile_exceptions import DockerfilePackageError
+
+
+class TestAptPackages(unittest.TestCase):
+    def test_packages_are_deduplicated_sorted_and_pinned(self) -> None:
+        packages = ["git", "vim curl", "cmake=3.28", "curl", "git", "cmake"]
+
+        self.assertEqual(
+            normalize_apt_packages(packages, pins={"git": "1:2.43", "cmake": "3.30"}),
+            ["cmake=3.28", "curl", "git=1:2.43", "vim"],
+        )
+        self.assertEqual(
+            normalize_apt_packages(reversed(packages)), ["cmake=3.28", "curl", "git", "vim"]
+        )
+
+    def test_conflicting_versions_are_rejected(self) -> None:
+        with self.assertRaises(DockerfilePackageError):
+            normalize_apt_packages(["cmake=3.28", "cmake=3.30"])
+
+    def test_lockfile_is_read(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            lockfile = Path(tmp_dir) / "apt.lock"
+            lockfile.write_text("# pinned packages\ngit=1:2.43 # from noble\n\ncmake = 3.28\n")
+            self.assertEqual(read_apt_lockfile(lockfile), {"git": "1:2.43", "cmake": "3.28"})
+
+            lockfile.write_text("git\n")
+            with self.assertRaises(DockerfilePackageError):
+                read_apt_lockfile(lockfile)
+
+
+if __name__ == "__main__":
+    unittest.main()
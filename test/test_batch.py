@@ -0,0 +1,150 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+from pathlib import Path
+import contextlib
+import io
+import json
+import multiprocessing
+import tempfile
+import typing
+import unittest
+
+from devc.core.batch_service import BatchService
+from devc.core.exceptions.batch_exceptions import BatchManifestError
+from devc.core.models.batch_manifest import load_batch_manifest
+from devc.utils.files import atomic_write_text, defer_writes, write_deferred
+
+MANIFEST = {
+    "defaults": {
+        "command": "dev-json",
+        "plugin": "base-setup",
+        "args": {"image": "ubuntu:24.04", "override": True},
+    },
+    "targets": [
+        {"path": "a", "args": {"name": "a"}, "extensions": {"privileged": True, "ssh": None}},
+        {"name": "b", "path": "b", "args": ["--name", "b", "--image", "debian:12"]},
+    ],
+}
+
+
+class TestBatchManifest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp = Path(tmp_dir.name)
+
+    def write_manifest(self, data: typing.Any, name: str = "manifest.json") -> Path:
+        path = self.tmp / name
+        path.write_text(json.dumps(data))
+        return path
+
+    def test_targets_combine_defaults_and_arguments(self) -> None:
+        first, second = load_batch_manifest(self.write_manifest(MANIFEST))
+
+        self.assertEqual(first.name, "a")
+        self.assertEqual(first.path, self.tmp / "a")
+        self.assertEqual(
+            first.to_argv(),
+            [
+                "dev-json",
+                "base-setup",
+                "--image",
+                "ubuntu:24.04",
+                "--override",
+                "--name",
+                "a",
+                "--privileged",
+                "--path",
+                str(self.tmp / "a"),
+            ],
+        )
+        # arguments of the target come last and take precedence
+        self.assertEqual(second.args[-2:], ["--image", "debian:12"])
+
+    def test_toml_manifest(self) -> None:
+        path = self.tmp / "manifest.toml"
+        path.write_text(
+            '[[targets]]\ncommand = "dockerfile"\nplugin = "godot"\npath = "x"\n'
+            'args = { godot-version = "4.4" }\n'
+        )
+        (target,) = load_batch_manifest(path)
+
+        self.assertEqual(target.to_argv()[:4], ["dockerfile", "godot", "--godot-version", "4.4"])
+
+    def test_invalid_manifests(self) -> None:
+        invalid = [
+            {},
+            {"targets": [{"plugin": "base-setup", "path": "a"}]},
+            {"targets": [{"command": "dev-json", "plugin": "base-setup", "path": "a", "foo": 1}]},
+            {"targets": [{"command": "dev-json", "plugin": "base-setup", "path": "a"}] * 2},
+        ]
+        for data in invalid:
+            with self.subTest(data=data), self.assertRaises(BatchManifestError):
+                load_batch_manifest(self.write_manifest(data))
+        with self.assertRaises(BatchManifestError):
+            load_batch_manifest(self.write_manifest(MANIFEST, name="manifest.ini"))
+
+
+class TestBatchService(unittest.TestCase):
+    def test_targets_are_generated_in_one_process(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            manifest = Path(tmp_dir, "manifest.json")
+            manifest.write_text(json.dumps(MANIFEST))
+            targets = load_batch_manifest(manifest)
+            targets[1].args.append("--unknown-flag")
+
+            with contextlib.redirect_stderr(io.StringIO()):
+                results = BatchService().run(targets)
+
+            self.assertEqual([result.status for result in results], ["ok", "failed"])
+            self.assertEqual(results[1].error, "invalid arguments")
+            data = json.loads(Path(tmp_dir, "a", "devcontainer.json").read_text())
+            self.assertEqual(data["name"], "a")
+            self.assertIn("--privileged", data["runArgs"])
+            self.assertFalse(Path(tmp_dir, "b").exists())
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "parallel batches require fork"
+    )
+    def test_parallel_run_matches_sequential_run(self) -> None:
+        outputs = []
+        for jobs in (1, 2):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                manifest = Path(tmp_dir, "manifest.json")
+                manifest.write_text(json.dumps(MANIFEST))
+                targets = load_batch_manifest(manifest)
+                targets[0].args.append("--unknown-flag")
+
+                with contextlib.redirect_stderr(io.StringIO()):
+                    results = BatchService().run(targets, jobs=jobs)
+
+                self.assertEqual([result.status for result in results], ["failed", "ok"])
+                self.assertFalse(Path(tmp_dir, "a").exists())
+                outputs.append(Path(tmp_dir, "b", "devcontainer.json").read_text())
+        self.assertEqual(outputs[0], outputs[1])
+
+
+class TestDeferWrites(unittest.TestCase):
+    def test_writes_are_collected(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir, "sub", "file.txt")
+            with defer_writes() as writes:
+                atomic_write_text(path, "content")
+            self.assertFalse(path.exists())
+
+            write_deferred(writes)
+            self.assertEqual(path.read_text(), "content")
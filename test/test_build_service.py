@@ -0,0 +1,137 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+from pathlib import Path
+from typing import Any, Iterator
+import tempfile
+import unittest
+
+from devc.core.build_service import (
+    BuildKitProgressParser,
+    BuildRequest,
+    BuildService,
+    BuildStep,
+    ClassicProgressParser,
+    select_backend,
+)
+from devc.core.exceptions.build_exceptions import BuildError, BuildFailedError
+
+BUILDKIT_LOG = """\
+#1 [internal] load build definition from Dockerfile
+#1 transferring dockerfile: 2.10kB done
+#1 DONE 0.0s
+#5 [2/4] RUN apt-get update
+#5 CACHED
+#6 [3/4] RUN make
+#6 0.512 compiling
+#6 DONE 12.3s
+#7 exporting cache to client directory
+#7 DONE 1.5s
+"""
+
+
+class FakeClient:
+    def __init__(self, chunks: list[dict[str, Any]]) -> None:
+        self.chunks = chunks
+        self.kwargs: dict[str, Any] = {}
+
+    def build(self, **kwargs: Any) -> Iterator[dict[str, Any]]:
+        self.kwargs = kwargs
+        yield from self.chunks
+
+
+class TestBuildService(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.dockerfile = Path(tmp_dir.name) / "Dockerfile"
+        self.dockerfile.write_text("FROM ubuntu\nRUN make\n")
+
+    def test_buildkit_progress_is_parsed(self) -> None:
+        parser = BuildKitProgressParser()
+        for line in BUILDKIT_LOG.splitlines():
+            parser.feed(line)
+
+        self.assertEqual(
+            parser.steps,
+            [
+                BuildStep("[internal] load build definition from Dockerfile", 0.0),
+                BuildStep("[2/4] RUN apt-get update", cached=True),
+                BuildStep("[3/4] RUN make", 12.3),
+                BuildStep("exporting cache to client directory", 1.5),
+            ],
+        )
+
+    def test_classic_progress_is_parsed(self) -> None:
+        clock = iter([1.0, 1.5, 4.0, 10.0])
+        parser = ClassicProgressParser(clock=lambda: next(clock))
+        for line in ["Step 1/2 : FROM ubuntu", " ---> Using cache", "Step 2/2 : RUN make", "ok"]:
+            parser.feed(line)
+        parser.finish()
+
+        self.assertEqual(
+            parser.steps,
+            [BuildStep("[1/2] FROM ubuntu", 0.5, cached=True), BuildStep("[2/2] RUN make", 6.0)],
+        )
+
+    def test_sdk_build_streams_the_log(self) -> None:
+        client = FakeClient(
+            [
+                {"stream": "Step 1/2 : FROM ubuntu\n ---> 123"},
+                {"stream": "\nStep 2/2 : RUN make\n"},
+                {"status": "Pulling fs layer", "progressDetail": {"current": 1}},
+                {"aux": {"ID": "sha256:abc"}},
+            ]
+        )
+        lines: list[str] = []
+        service = BuildService(output=lines.append, client_factory=lambda: client)
+        result = service.build(
+            BuildRequest(dockerfile=self.dockerfile, context=self.dockerfile.parent, tag="t")
+        )
+
+        self.assertEqual(lines, ["Step 1/2 : FROM ubuntu", " ---> 123", "Step 2/2 : RUN make"])
+        self.assertEqual(result.backend, "sdk")
+        self.assertEqual(result.image_id, "sha256:abc")
+        self.assertEqual(
+            [step.name for step in result.steps], ["[1/2] FROM ubuntu", "[2/2] RUN make"]
+        )
+        self.assertEqual(client.kwargs["tag"], "t")
+
+        client.chunks = [{"error": "failed", "errorDetail": {"message": "RUN make failed"}}]
+        with self.assertRaisesRegex(BuildFailedError, "RUN make failed"):
+            service.build(BuildRequest(dockerfile=self.dockerfile, context=self.dockerfile.parent))
+
+    def test_backend_selection(self) -> None:
+        def backend(**kwargs: Any) -> str:
+            return select_backend(
+                BuildRequest(dockerfile=self.dockerfile, context=Path("."), **kwargs)
+            )
+
+        self.assertEqual(backend(), "sdk")
+        self.assertEqual(backend(cache_from=["my-image:latest"]), "sdk")
+        self.assertEqual(backend(cache_from=["type=local,src=cache"]), "buildx")
+        self.assertEqual(backend(cache_to=["type=local,dest=cache"]), "buildx")
+        with self.assertRaises(BuildError):
+            backend(backend="sdk", cache_to=["type=local,dest=cache"])
+
+        self.dockerfile.write_text("# syntax=docker/dockerfile:1\nFROM ubuntu\n")
+        self.assertEqual(backend(), "buildx")
+        self.dockerfile.write_text("FROM ubuntu\nRUN --mount=type=cache,target=/c make\n")
+        self.assertEqual(backend(), "buildx")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+import argparse
+import typing
+import unittest
+
+from devc.constants.templates import TEMPLATES
+from devc.core.exceptions.dockerfile_exceptions import DockerfileExtensionError
+from devc.core.models.dockerfile_extension_json_scheme import DockerfileHandler
+from devc_cli_plugin_system.plugin_extensions import PluginExtensionContext
+from devc_plugins.plugin_extensions.dev_json_extensions import ccache_extension as dev_json
+from devc_plugins.plugin_extensions.dev_json_extensions import DevJsonExtensionManager
+from devc_plugins.plugin_extensions.dockerfile_extensions import DockerfileExtensionManager
+from devc_plugins.plugin_extensions.dockerfile_extensions import ccache_extension
+
+
+class TestCcacheExtension(unittest.TestCase):
+    def _parse(self, extension: typing.Any, *argv: str) -> argparse.Namespace:
+        parser = argparse.ArgumentParser()
+        extension.register_arguments_to_parser(parser, defaults={})
+        return parser.parse_args(argv)
+
+    def test_dockerfile_updates_are_applied_to_the_handler(self) -> None:
+        extension = ccache_extension.CcacheExtension()
+        context = PluginExtensionContext()
+        context.add_available_plugin_extension(extension)
+        args = self._parse(extension, "--ccache=20g")
+
+        updates = DockerfileExtensionManager(context, args).get_combined_updates()
+        handler = DockerfileHandler(
+            TEMPLATES.get_template_path(TEMPLATES.DOCKERFILE_EXTENSIONS_JSON)
+        )
+        handler.apply_updates(updates)
+
+        predefs = handler.content.pre_defined_extensions
+        self.assertIn("ccache", predefs.additional_apt_packages)
+        self.assertIn("ENV CCACHE_MAXSIZE=20Gi", predefs.additional_sudo_commands[-1])
+        self.assertEqual(updates["additional_user_commands"], [])
+        with self.assertRaises(DockerfileExtensionError):
+            handler.apply_updates({"unknown": []})
+
+    def test_dev_json_mounts_shared_volume(self) -> None:
+        extension = dev_json.CcacheExtension()
+        context = PluginExtensionContext()
+        context.add_available_plugin_extension(extension)
+
+        args = self._parse(extension, "--ccache")
+        updates = DevJsonExtensionManager(context, args).get_combined_updates()
+
+        self.assertEqual(updates["mounts"], ["source=devc-ccache,target=/ccache,type=volume"])
+        self.assertEqual(updates["containerEnv"]["CCACHE_MAXSIZE"], "5Gi")
+        args = self._parse(extension)
+        self.assertEqual(DevJsonExtensionManager(context, args).get_combined_updates(), {})
+
+    def test_format_ccache_size(self) -> None:
+        self.assertEqual(ccache_extension.format_ccache_size(2 * 1024**3), "2Gi")
+        self.assertEqual(ccache_extension.format_ccache_size(1536 * 1024**2), "1536Mi")
+        self.assertEqual(ccache_extension.format_ccache_size(10), "1Mi")
+
+
+if __name__ == "__main__":
+    unittest.main()
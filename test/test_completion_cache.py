@@ -0,0 +1,111 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+import argparse
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from devc_cli_plugin_system import completion_cache
+from devc_cli_plugin_system.completion_cache import mark_parser_loaded
+
+
+def create_parser(*, load_ros2: bool = True) -> argparse.ArgumentParser:
+    """Create a parser resembling `devc dev-json <plugin>` with only some branches loaded."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--log-level", choices=["ERROR", "INFO"])
+    commands = parser.add_subparsers(dest=" command")
+    dev_json = commands.add_parser("dev-json", help="Create a devcontainer.json")
+    commands.add_parser("dockerfile")
+    mark_parser_loaded(dev_json)
+
+    plugins = dev_json.add_subparsers(dest=" plugin", required=True)
+    ros2 = plugins.add_parser("ros2-desktop-full")
+    plugins.add_parser("godot")
+    if load_ros2:
+        ros2.add_argument("--ros-distro", choices=["humble", "jazzy"])
+        ros2.add_argument("--privileged", action="store_true")
+        mark_parser_loaded(ros2)
+    return parser
+
+
+class TestCompletionCache(unittest.TestCase):
+    def test_serialized_tree_tracks_loaded_branches(self) -> None:
+        tree = completion_cache._serialize_parser(create_parser(), loaded=True)
+
+        self.assertTrue(completion_cache._is_branch_cached(tree, []))
+        self.assertTrue(completion_cache._is_branch_cached(tree, ["dev-json"]))
+        self.assertTrue(
+            completion_cache._is_branch_cached(
+                tree, ["--log-level", "INFO", "dev-json", "ros2-desktop-full", "--privileged"]
+            )
+        )
+        self.assertFalse(completion_cache._is_branch_cached(tree, ["dockerfile"]))
+        self.assertFalse(completion_cache._is_branch_cached(tree, ["dev-json", "godot"]))
+
+    def test_option_values_are_not_taken_as_commands(self) -> None:
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--name")
+        commands = parser.add_subparsers(dest="command")
+        commands.add_parser("dockerfile")
+        tree = completion_cache._serialize_parser(parser, loaded=True)
+
+        self.assertTrue(completion_cache._is_branch_cached(tree, ["--name", "dockerfile"]))
+        self.assertFalse(completion_cache._is_branch_cached(tree, ["--name=x", "dockerfile"]))
+
+    def test_built_parser_matches_live_parser(self) -> None:
+        tree = completion_cache._serialize_parser(create_parser(), loaded=True)
+        parser = argparse.ArgumentParser()
+        completion_cache._build_parser(parser, tree)
+
+        args = parser.parse_args(
+            ["--log-level", "INFO", "dev-json", "ros2-desktop-full", "--ros-distro", "jazzy"]
+        )
+        self.assertEqual(args.ros_distro, "jazzy")
+        with mock.patch("sys.stderr"), self.assertRaises(SystemExit):
+            parser.parse_args(["dev-json", "ros2-desktop-full", "--ros-distro", "foxy"])
+        self.assertEqual(
+            completion_cache._serialize_parser(parser, loaded=True)["actions"], tree["actions"]
+        )
+
+    def test_merge_keeps_cached_branches(self) -> None:
+        cached = completion_cache._serialize_parser(create_parser(), loaded=True)
+        live = completion_cache._serialize_parser(create_parser(load_ros2=False), loaded=True)
+
+        merged = completion_cache._merge_trees(cached, live)
+
+        self.assertTrue(
+            completion_cache._is_branch_cached(merged, ["dev-json", "ros2-desktop-full"])
+        )
+        self.assertEqual(merged, cached)
+
+    def test_cache_is_dropped_if_a_source_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.dict(
+            os.environ, {"DEVC_CACHE_DIR": cache_dir, "DEVC_NO_CACHE": ""}
+        ):
+            completion_cache.update_completion_cache("devc-test", create_parser())
+            path = completion_cache._get_cache_path("devc-test")
+            self.assertIsNotNone(completion_cache._read_completion_cache(path))
+
+            source = os.path.join(cache_dir, "plugin.py")
+            with open(source, "w") as f:
+                f.write("")
+            data = json.loads(path.read_text())
+            data["sources"][source] = os.stat(source).st_mtime_ns - 1
+            path.write_text(json.dumps(data))
+            self.assertIsNone(completion_cache._read_completion_cache(path))
@@ -0,0 +1,140 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+from pathlib import Path
+import json
+import tempfile
+import typing
+import unittest
+from unittest import mock
+
+from devc.constants.templates import TEMPLATES
+from devc.core.devcontainer_json_creation_service import DevcontainerJsonCreationService
+from devc.core.exceptions.devcontainer_json_exception import (
+    DevJsonExistsError,
+    DevJsonTemplateRenderError,
+)
+from devc.core.models.devcontainer_extension_json_scheme import DevJsonHandler
+from devc.core.models.options import DevContainerJsonOptions
+from devc.core.template_loader import TemplateLoader
+from devc.core.template_machine import TemplateMachine
+from devc.utils.files import atomic_write_text
+
+
+class TestDevcontainerJsonCreationService(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp = Path(tmp_dir.name)
+        self.handler = DevJsonHandler(
+            TEMPLATES.get_template_path(TEMPLATES.DEVCONTAINER_EXTENSIONS_JSON)
+        )
+        self.handler.content.pre_defined_extensions.name = "demo"
+        self.handler.content.pre_defined_extensions.image = "ubuntu:24.04"
+        self.options = DevContainerJsonOptions(path=self.tmp / ".devcontainer")
+        self.target = self.options.path / "devcontainer.json"
+        self.ext_manager = mock.MagicMock()
+        self.ext_manager.get_combined_updates.return_value = {"runArgs": ["--privileged"]}
+        self.ext_manager.called_extensions = {"privileged": object()}
+
+    def create_service(self, template_dir: Path | None = None) -> typing.Any:
+        return DevcontainerJsonCreationService(
+            template_machine=TemplateMachine(),
+            loader=TemplateLoader(template_dir or TEMPLATES.TEMPLATE_DIR),
+            ext_manager=self.ext_manager,
+        )
+
+    def test_extension_updates_are_merged_into_single_write(self) -> None:
+        with mock.patch(
+            "devc.core.devcontainer_json_creation_service.atomic_write_text",
+            wraps=atomic_write_text,
+        ) as write:
+            self.create_service().create_devcontainer_json(
+                TEMPLATES.DEVCONTAINER_JSON, self.handler, self.options
+            )
+
+        write.assert_called_once()
+        data = json.loads(self.target.read_text())
+        self.assertEqual(data["name"], "demo")
+        self.assertIn("--privileged", data["runArgs"])
+
+    def test_no_file_is_left_if_merging_fails(self) -> None:
+        self.ext_manager.get_combined_updates.side_effect = RuntimeError("broken extension")
+
+        with self.assertRaises(RuntimeError):
+            self.create_service().create_devcontainer_json(
+                TEMPLATES.DEVCONTAINER_JSON, self.handler, self.options
+            )
+        self.assertFalse(self.target.exists())
+
+    def test_invalid_json_is_a_render_error(self) -> None:
+        template_dir = self.tmp / "templates"
+        template_dir.mkdir()
+        (template_dir / TEMPLATES.DEVCONTAINER_JSON).write_text('{"name": {{ name }}}')
+
+        with self.assertRaises(DevJsonTemplateRenderError):
+            self.create_service(template_dir).create_devcontainer_json(
+                TEMPLATES.DEVCONTAINER_JSON, self.handler, self.options
+            )
+        self.assertFalse(self.options.path.exists())
+
+    def test_incremental_run_skips_unchanged_targets(self) -> None:
+        self.options.incremental = True
+        service = self.create_service()
+        service.create_devcontainer_json(TEMPLATES.DEVCONTAINER_JSON, self.handler, self.options)
+
+        with mock.patch.object(service._template_machine, "render_template") as render:
+            service.create_devcontainer_json(
+                TEMPLATES.DEVCONTAINER_JSON, self.handler, self.options
+            )
+        render.assert_not_called()
+
+        # changed inputs regenerate the unmodified file without --override
+        self.ext_manager.get_combined_updates.return_value = {"runArgs": ["--init"]}
+        service.create_devcontainer_json(TEMPLATES.DEVCONTAINER_JSON, self.handler, self.options)
+        self.assertIn("--init", json.loads(self.target.read_text())["runArgs"])
+
+    def test_incremental_run_regenerates_if_the_dockerfile_starts_copying(self) -> None:
+        template_dir = self.tmp / "templates"
+        template_dir.mkdir()
+        (template_dir / TEMPLATES.DEVCONTAINER_JSON).write_text(
+            '{"name": "{{ name }}", "build": {"dockerfile": "Dockerfile", "context": ".."}}'
+        )
+        self.options.path.mkdir()
+        dockerfile = self.options.path / "Dockerfile"
+        dockerfile.write_text("FROM ubuntu:24.04\n")
+        self.options.incremental = True
+        self.options.minimal_context = True
+        service = self.create_service(template_dir)
+        service.create_devcontainer_json(TEMPLATES.DEVCONTAINER_JSON, self.handler, self.options)
+        self.assertEqual(json.loads(self.target.read_text())["build"]["context"], ".")
+
+        dockerfile.write_text("FROM ubuntu:24.04\nCOPY src /src\n")
+        service.create_devcontainer_json(TEMPLATES.DEVCONTAINER_JSON, self.handler, self.options)
+
+        self.assertEqual(json.loads(self.target.read_text())["build"]["context"], "..")
+
+    def test_incremental_run_keeps_modified_targets(self) -> None:
+        self.options.incremental = True
+        service = self.create_service()
+        service.create_devcontainer_json(TEMPLATES.DEVCONTAINER_JSON, self.handler, self.options)
+        self.target.write_text("{}")
+
+        with self.assertRaises(DevJsonExistsError):
+            service.create_devcontainer_json(
+                TEMPLATES.DEVCONTAINER_JSON, self.handler, self.options
+            )
+        self.assertEqual(self.target.read_text(), "{}")
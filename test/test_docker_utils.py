@@ -0,0 +1,88 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+import tempfile
+import unittest
+from unittest import mock
+
+from packaging.version import InvalidVersion, Version
+
+from devc.core.exceptions.devc_exceptions import DependencyMissing
+from devc.utils import docker_utils
+
+INFO = {
+    "ServerVersion": "27.3.1",
+    "Runtimes": {"runc": {}, "nvidia": {}},
+    "DefaultRuntime": "runc",
+    "CgroupDriver": "systemd",
+}
+
+
+class TestDockerDaemonFacts(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        env = {"DEVC_CACHE_DIR": tmp_dir.name, "DOCKER_HOST": "unix:///tmp/docker.sock"}
+        self.enterContext(mock.patch.dict("os.environ", env))
+        self.enterContext(mock.patch.dict(docker_utils._clients, clear=True))
+        self.enterContext(mock.patch.dict(docker_utils._facts, clear=True))
+        self.enterContext(mock.patch.object(docker_utils, "docker"))
+        self.from_env = docker_utils.docker.from_env
+        self.from_env.return_value.api.info.return_value = INFO
+
+    def test_facts_are_queried_once_and_cached_on_disk(self) -> None:
+        facts = docker_utils.get_docker_daemon_facts()
+
+        assert facts is not None
+        self.assertEqual(facts.parsed_version, Version("27.3.1"))
+        self.assertTrue(facts.has_nvidia_runtime)
+        self.assertEqual(facts.cgroup_driver, "systemd")
+        self.assertEqual(docker_utils.get_docker_version(), Version("27.3.1"))
+
+        # a new process reads the facts from disk
+        docker_utils._facts.clear()
+        docker_utils._clients.clear()
+        self.assertEqual(docker_utils.get_docker_daemon_facts(), facts)
+        self.from_env.assert_called_once()
+        self.from_env.return_value.api.info.assert_called_once()
+
+    def test_unreachable_daemon_is_cached(self) -> None:
+        docker_utils.docker.errors.DockerException = ConnectionError
+        docker_utils.docker.errors.APIError = ConnectionError
+        self.from_env.side_effect = ConnectionError("no daemon")
+
+        self.assertIsNone(docker_utils.get_docker_daemon_facts())
+        with self.assertRaises(DependencyMissing):
+            docker_utils.get_docker_version()
+        self.from_env.assert_called_once()
+
+    def test_facts_expire(self) -> None:
+        with mock.patch.dict("os.environ", {docker_utils.DOCKER_FACTS_TTL_ENV: "0"}):
+            docker_utils.get_docker_daemon_facts()
+            docker_utils.get_docker_daemon_facts()
+        self.assertEqual(self.from_env.return_value.api.info.call_count, 2)
+        # the client is shared nevertheless
+        self.from_env.assert_called_once()
+
+    def test_nonstandard_version_is_not_parsed(self) -> None:
+        self.from_env.return_value.api.info.return_value = {**INFO, "ServerVersion": "dev-build"}
+
+        facts = docker_utils.get_docker_daemon_facts()
+
+        assert facts is not None
+        self.assertIsNone(facts.parsed_version)
+        with self.assertRaises(InvalidVersion):
+            docker_utils.get_docker_version()
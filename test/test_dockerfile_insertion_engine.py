@@ -0,0 +1,54 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+import unittest
+
+from devc.core.dockerfile_insertion_engine import apply_insertions
+from devc.core.exceptions.dockerfile_exceptions import DockerfileInsertionError
+from devc.core.models.dockerfile_extension_json_scheme import Insertion
+
+DOCKERFILE = """FROM ubuntu:24.04
+RUN apt-get update
+USER dev
+WORKDIR /home/dev
+"""
+
+
+class TestInsertionEngine(unittest.TestCase):
+    def test_insertions_are_applied_in_order(self) -> None:
+        insertions = [
+            Insertion(anchor="USER", position="after", is_regex=False, lines=["ENV A=1"]),
+            Insertion(anchor="", position="", is_regex=False, lines=[""]),
+            Insertion(anchor=r"^RUN apt", position="replace", is_regex=True, lines=["RUN x"]),
+            Insertion(anchor="USER dev", position="before", is_regex=False, lines=["# user"]),
+            Insertion(anchor=r"(?i)user (\w+)", position="after", is_regex=True, lines=["ENV B"]),
+        ]
+
+        self.assertEqual(
+            apply_insertions(DOCKERFILE, insertions),
+            "FROM ubuntu:24.04\nRUN x\n# user\nUSER dev\nENV A=1\nENV B\nWORKDIR /home/dev\n",
+        )
+
+    def test_invalid_insertions(self) -> None:
+        invalid = [
+            [Insertion(anchor="NOT THERE", position="after", is_regex=False, lines=[])],
+            [Insertion(anchor="FROM", position="inside", is_regex=False, lines=[])],
+            [Insertion(anchor="(", position="after", is_regex=True, lines=[])],
+            [Insertion(anchor="USER", position="replace", is_regex=False, lines=[])] * 2,
+        ]
+        for insertions in invalid:
+            with self.subTest(insertions=insertions), self.assertRaises(DockerfileInsertionError):
+                apply_insertions(DOCKERFILE, insertions)
@@ -0,0 +1,109 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+import unittest
+
+from devc.core.dockerfile_layer_optimizer import optimize_layers
+
+
+class TestOptimizeLayers(unittest.TestCase):
+    def test_adjacent_runs_are_merged_keeping_comments(self) -> None:
+        dockerfile = "\n".join(
+            [
+                "FROM ubuntu",
+                "RUN apt-get update && \\",
+                "    apt-get install -y git",
+                "",
+                "# Create the user",
+                "RUN useradd dev",
+                "USER dev",
+                "RUN mkdir ws",
+                "RUN touch ws/a",
+            ]
+        )
+
+        self.assertEqual(
+            optimize_layers(dockerfile + "\n"),
+            "\n".join(
+                [
+                    "FROM ubuntu",
+                    "RUN apt-get update && \\",
+                    "    apt-get install -y git \\",
+                    "# Create the user",
+                    "    && useradd dev",
+                    "USER dev",
+                    "RUN mkdir ws \\",
+                    "    && touch ws/a",
+                ]
+            )
+            + "\n",
+        )
+
+    def test_runs_changing_their_meaning_are_not_merged(self) -> None:
+        dockerfile = "\n".join(
+            [
+                "RUN apt-get update",
+                "RUN rosdep update || true",
+                "RUN cd ws; make",
+                'RUN ["echo", "exec form"]',
+                "RUN --mount=type=cache,target=/root/.cache pip install black",
+                "RUN echo 'unbalanced",
+                "RUN echo a # comment",
+                "RUN echo b",
+                "ARG A",
+                "RUN if true; then echo a; fi",
+                "RUN [ -e a ] && echo a",
+            ]
+        )
+
+        self.assertEqual(
+            optimize_layers(dockerfile).splitlines(),
+            dockerfile.splitlines()[:-2]
+            + ["RUN if true; then echo a; fi \\", "    && [ -e a ] && echo a"],
+        )
+
+    def test_runs_after_shell_state_changes_are_not_merged(self) -> None:
+        dockerfile = "\n".join(
+            [
+                "RUN cd /opt/src && ./configure",
+                "RUN make install",
+                "RUN export CC=clang",
+                "RUN . /opt/ros/jazzy/setup.sh && colcon build",
+                "RUN if true; then umask 077; fi",
+                "RUN A=1",
+                "RUN A=1 make",
+                "RUN echo a",
+            ]
+        )
+
+        # each RUN instruction starts in the WORKDIR with the environment of the image
+        self.assertEqual(
+            optimize_layers(dockerfile).splitlines(),
+            [
+                "RUN cd /opt/src && ./configure",
+                "RUN make install \\",
+                "    && export CC=clang",
+                "RUN . /opt/ros/jazzy/setup.sh && colcon build",
+                "RUN if true; then umask 077; fi",
+                "RUN A=1",
+                "RUN A=1 make \\",
+                "    && echo a",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
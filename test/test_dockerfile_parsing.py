@@ -0,0 +1,49 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+import unittest
+
+from devc.utils.dockerfile_parsing import add_run_options, parse_instructions
+
+LINES = [
+    "# Install tools",
+    "RUN apt-get update && \\",
+    "    # comments do not end an instruction",
+    "    pip install black",
+    "",
+    "run echo done",
+    "ENV A=1",
+]
+
+
+class TestDockerfileParsing(unittest.TestCase):
+    def test_continuation_lines_belong_to_their_instruction(self) -> None:
+        instructions = parse_instructions(LINES)
+
+        self.assertEqual([i.keyword for i in instructions], ["", "RUN", "", "RUN", "ENV"])
+        self.assertEqual(instructions[1].lines, LINES[1:4])
+        self.assertEqual(instructions[1].arguments, "apt-get update && pip install black")
+        self.assertEqual(instructions[3].arguments, "echo done")
+
+    def test_add_run_options(self) -> None:
+        lines = add_run_options(
+            LINES, "--mount=type=cache,target=/root/.cache/pip", lambda i: "pip" in i.arguments
+        )
+
+        self.assertEqual(
+            lines[1], "RUN --mount=type=cache,target=/root/.cache/pip apt-get update && \\"
+        )
+        self.assertEqual(lines[2:], LINES[2:])
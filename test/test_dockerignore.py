@@ -0,0 +1,119 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+from pathlib import Path
+import contextlib
+import io
+import tempfile
+import unittest
+
+from devc.cli import main
+from devc.core.build_context import create_dockerignore, find_minimal_context
+from devc.core.template_loader import get_default_template_loader
+from devc.core.template_machine import TemplateMachine
+from devc.utils.dockerignore import ContextSize, DockerIgnore
+
+
+class TestDockerIgnore(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = Path(tmp_dir.name)
+        for path, size in [("build/lib/a.so", 100), ("src/a.py", 10), ("src/keep.db3", 5)]:
+            (self.root / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / path).write_bytes(b"x" * size)
+
+    def test_patterns_match_like_docker(self) -> None:
+        ignore = DockerIgnore(
+            ["# comment", "/build/", "**/*.db3", "!src/keep.db3", "log?", "*.s[!o]"]
+        )
+
+        self.assertTrue(ignore.is_ignored("build"))
+        self.assertTrue(ignore.is_ignored("build/lib/a.so"))
+        self.assertFalse(ignore.is_ignored("src/build"))
+        self.assertTrue(ignore.is_ignored("bags/a/b.db3"))
+        self.assertFalse(ignore.is_ignored("src/keep.db3"))
+        self.assertTrue(ignore.is_ignored("logs"))
+        self.assertFalse(ignore.is_ignored("src/logs"))
+        self.assertTrue(ignore.is_ignored("a.sh"))
+        self.assertFalse(ignore.is_ignored("a.so"))
+
+    def test_context_size_skips_ignored_files(self) -> None:
+        self.assertEqual(DockerIgnore([]).get_context_size(self.root), ContextSize(3, 115))
+        self.assertEqual(DockerIgnore(["build"]).get_context_size(self.root), ContextSize(2, 15))
+        self.assertEqual(
+            DockerIgnore(["build", "src", "!src/a.py"]).get_context_size(self.root),
+            ContextSize(1, 10),
+        )
+
+    def test_existing_dockerignore_is_kept(self) -> None:
+        def create() -> Path | None:
+            return create_dockerignore(
+                self.root,
+                ["**/*.db3"],
+                template_machine=TemplateMachine(),
+                loader=get_default_template_loader(),
+            )
+
+        path = create()
+        assert path is not None
+        self.assertIn("build/\n", path.read_text())
+        self.assertIn("**/*.db3\n", path.read_text())
+        path.write_text("src\n")
+        self.assertIsNone(create())
+        self.assertEqual(path.read_text(), "src\n")
+
+    def test_minimal_context_is_the_dockerfile_directory(self) -> None:
+        dockerfile = self.root / "docker" / "Dockerfile"
+        dockerfile.parent.mkdir()
+        dockerfile.write_text("FROM ubuntu AS base\nFROM base\nCOPY --from=base /a /b\n")
+        self.assertEqual(find_minimal_context(dockerfile), dockerfile.parent)
+
+        dockerfile.write_text("FROM ubuntu\nCOPY src/a.py /a.py\n")
+        self.assertIsNone(find_minimal_context(dockerfile))
+
+
+class TestDockerIgnorePlugins(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = Path(tmp_dir.name)
+        self.dockerignore = self.root / ".dockerignore"
+
+    def dev_json(self, *argv: str) -> None:
+        path = str(self.root / ".devcontainer")
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            rc = main(argv=["dev-json", "base-setup", "--name", "a", "--path", path, *argv])
+        self.assertEqual(rc, 0)
+
+    def test_override_keeps_a_handwritten_dockerignore(self) -> None:
+        self.dockerignore.write_text("src\n")
+
+        self.dev_json("--override")
+        self.assertEqual(self.dockerignore.read_text(), "src\n")
+
+        self.dev_json("--override", "--override-dockerignore")
+        self.assertIn("build/\n", self.dockerignore.read_text())
+
+    def test_no_dockerignore_for_an_existing_image(self) -> None:
+        self.dev_json("--image", "ubuntu:24.04")
+
+        self.assertTrue((self.root / ".devcontainer" / "devcontainer.json").exists())
+        self.assertFalse(self.dockerignore.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from devc_cli_plugin_system import entry_points
+
+INDEX = {"devc_commands.command": {"build": ("devc_plugins.commands.build_cmd:Build", "devc")}}
+
+
+class TestEntryPointIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.fingerprint = "a"
+        self.enterContext(
+            mock.patch.dict("os.environ", {"DEVC_CACHE_DIR": tmp_dir.name, "DEVC_NO_CACHE": ""})
+        )
+        self.enterContext(mock.patch.object(entry_points, "_entry_point_index", None))
+        self.enterContext(
+            mock.patch.object(
+                entry_points, "get_entry_points_fingerprint", side_effect=lambda: self.fingerprint
+            )
+        )
+        self.build: mock.MagicMock = self.enterContext(
+            mock.patch.object(entry_points, "_build_entry_point_index", return_value=INDEX)
+        )
+
+    def load_index(self) -> dict:
+        entry_points.invalidate_entry_point_index()
+        return entry_points._get_entry_point_index()
+
+    def test_index_is_rebuilt_if_the_fingerprint_changes(self) -> None:
+        self.assertEqual(self.load_index(), INDEX)
+        self.assertEqual(self.load_index(), INDEX)
+        self.build.assert_called_once()
+
+        self.fingerprint = "b"
+        self.assertEqual(self.load_index(), INDEX)
+        self.assertEqual(self.build.call_count, 2)
+
+    def test_no_cache_bypasses_the_index(self) -> None:
+        with mock.patch.dict("os.environ", {"DEVC_NO_CACHE": "1"}):
+            self.load_index()
+            self.load_index()
+
+        self.assertEqual(self.build.call_count, 2)
+        self.assertFalse(entry_points._get_index_path().exists())
+
+    def test_corrupt_index_is_ignored(self) -> None:
+        self.load_index()
+        path = entry_points._get_index_path()
+        data = json.loads(path.read_text())
+        groups: object
+        for groups in (
+            [],
+            {"devc_commands.command": []},
+            {"devc_commands.command": {"build": "devc"}},
+            {"devc_commands.command": {"build": [1, 2]}},
+        ):
+            data["groups"] = groups
+            path.write_text(json.dumps(data))
+            self.assertEqual(self.load_index(), INDEX)
+
+        self.assertEqual(self.build.call_count, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
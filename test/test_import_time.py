@@ -0,0 +1,74 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+import os
+import subprocess
+import sys
+import unittest
+
+# Budget for the summed up import time of a cold `devc --help`, can be raised
+# on slow machines with the environment variable.
+IMPORT_TIME_BUDGET_MS = float(os.environ.get("DEVC_IMPORT_TIME_BUDGET_MS", "200"))
+
+# Modules which must only be imported on the code paths that need them.
+LAZY_MODULES = (
+    "docker",
+    "jinja2",
+    "prompt_toolkit",
+    "questionary",
+    "devc.core.batch_service",
+    "devc.core.build_service",
+    "devc.core.prebuild_service",
+    "devc.core.serve_client",
+    "devc.core.serve_service",
+)
+
+
+def import_times_of_help() -> dict[str, int]:
+    """Run `devc --help` with `-X importtime` and return the self time in us per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "devc.cli", "--help"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, _, module = line.removeprefix("import time:").split("|")
+        if not self_time.strip().isdigit():
+            # header line
+            continue
+        times[module.strip()] = int(self_time)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_help_does_not_import_heavy_dependencies(self) -> None:
+        times = import_times_of_help()
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, times, f"'{module}' is imported by `devc --help`")
+
+    def test_help_import_time_within_budget(self) -> None:
+        times = import_times_of_help()
+        total_ms = sum(times.values()) / 1000
+        slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:5]
+        self.assertLessEqual(
+            total_ms,
+            IMPORT_TIME_BUDGET_MS,
+            f"Importing `devc --help` took {total_ms:.1f}ms, slowest modules (us): {slowest}",
+        )
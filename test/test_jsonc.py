@@ -0,0 +1,81 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+import json
+import unittest
+
+from devc.utils import jsonc
+
+DOCUMENT = """// generated by devc
+{
+    // the name of the container
+    "name": "ros2",
+    "postCreateCommand": "echo 'a,]' // not a comment",
+    "runArgs": [
+        "--net=host", /* the display */
+        "-e=DISPLAY",
+    ],
+}
+"""
+
+
+class TestJsonc(unittest.TestCase):
+    def test_comments_and_trailing_commas_are_ignored(self) -> None:
+        self.assertEqual(
+            jsonc.loads(DOCUMENT),
+            {
+                "name": "ros2",
+                "postCreateCommand": "echo 'a,]' // not a comment",
+                "runArgs": ["--net=host", "-e=DISPLAY"],
+            },
+        )
+
+    def test_strip_keeps_offsets(self) -> None:
+        stripped = jsonc.strip(DOCUMENT)
+
+        self.assertEqual(len(stripped), len(DOCUMENT))
+        self.assertEqual(stripped.count("\n"), DOCUMENT.count("\n"))
+
+    def test_errors_refer_to_the_original_text(self) -> None:
+        with self.assertRaises(json.JSONDecodeError) as error:
+            jsonc.loads('{\n    // comment\n    "a" 1\n}')
+        self.assertEqual((error.exception.lineno, error.exception.colno), (3, 9))
+
+        with self.assertRaises(json.JSONDecodeError) as error:
+            jsonc.loads('{"a": 1 /* comment')
+        self.assertEqual(error.exception.pos, 8)
+
+    def test_comments_are_written_back(self) -> None:
+        data, comments = jsonc.loads_with_comments(DOCUMENT)
+
+        self.assertEqual(comments[()], ["// generated by devc"])
+        self.assertEqual(comments[("name",)], ["// the name of the container"])
+        self.assertEqual(comments[("runArgs", 1)], ["/* the display */"])
+        text = jsonc.dumps(data, comments=comments)
+        self.assertIn('    // the name of the container\n    "name": "ros2"', text)
+        self.assertEqual(jsonc.loads_with_comments(text), (data, comments))
+
+    def test_dumps_without_comments_matches_json(self) -> None:
+        data = {"a": [1, {"b": None}, []], "c": {}, "d": "ä"}
+
+        self.assertEqual(jsonc.dumps(data), json.dumps(data, indent=4))
+        self.assertEqual(
+            jsonc.dumps(data, comments={("x",): ["// gone"]}), json.dumps(data, indent=4)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
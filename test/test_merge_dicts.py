@@ -0,0 +1,104 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+import copy
+import unittest
+
+from devc.core.exceptions.devcontainer_json_exception import DevJsonMergeConflictError
+from devc.utils.merge_dicts import AppendListMerge, DevcontainerMerge
+
+TEMPLATE = {
+    "runArgs": [
+        "-e",
+        "DISPLAY=${env:DISPLAY}",
+        "-v",
+        "/tmp/.X11-unix:/tmp/.X11-unix",
+        "--network=host",
+    ],
+    "forwardPorts": [],
+    "containerEnv": {"ROS_DOMAIN_ID": "0"},
+}
+
+
+class TestDevcontainerMerge(unittest.TestCase):
+    def test_duplicated_run_args_are_dropped(self) -> None:
+        updates = {
+            "runArgs": [
+                "--device=/dev/dri",
+                "--group-add",
+                "video",
+                "--gpus=all",
+                "--group-add",
+                "video",
+                "--net=host",
+                "--env=DISPLAY=${env:DISPLAY}",
+            ]
+        }
+
+        merged = DevcontainerMerge().merge_dicts(TEMPLATE, updates)
+
+        self.assertEqual(
+            merged["runArgs"],
+            [*TEMPLATE["runArgs"], "--device=/dev/dri", "--group-add", "video", "--gpus=all"],
+        )
+
+    def test_mounts_are_keyed_by_target_and_ports_are_a_set(self) -> None:
+        updates = {
+            "mounts": [
+                "source=/run/udev,target=/run/udev,type=bind",
+                {"source": "/run/udev", "target": "/run/udev", "type": "bind"},
+            ],
+            "forwardPorts": [3000, 8080, 3000],
+        }
+
+        merged = DevcontainerMerge().merge_dicts(TEMPLATE, updates)
+
+        self.assertEqual(merged["mounts"], ["source=/run/udev,target=/run/udev,type=bind"])
+        self.assertEqual(merged["forwardPorts"], [3000, 8080])
+        with self.assertRaises(DevJsonMergeConflictError):
+            DevcontainerMerge().merge_dicts(
+                merged, {"mounts": ["source=/dev,target=/run/udev,type=bind"]}
+            )
+
+    def test_conflicting_values_are_reported(self) -> None:
+        with self.assertRaisesRegex(DevJsonMergeConflictError, "--network=host.*--network"):
+            DevcontainerMerge().merge_dicts(TEMPLATE, {"runArgs": ["--network", "bridge"]})
+        with self.assertRaises(DevJsonMergeConflictError):
+            DevcontainerMerge().merge_dicts(TEMPLATE, {"runArgs": ["-e", "DISPLAY=:1"]})
+
+    def test_base_is_not_modified(self) -> None:
+        base = copy.deepcopy(TEMPLATE)
+
+        merged = DevcontainerMerge().merge_dicts(
+            base, {"runArgs": ["--privileged"], "containerEnv": {"ROS_DOMAIN_ID": "1"}}
+        )
+
+        self.assertEqual(base, TEMPLATE)
+        self.assertEqual(merged["containerEnv"], {"ROS_DOMAIN_ID": "1"})
+        self.assertIs(merged["forwardPorts"], base["forwardPorts"])
+
+    def test_other_lists_are_appended(self) -> None:
+        updates = {"postCreateCommand": ["echo", "a"]}
+        base = {"postCreateCommand": ["echo"]}
+
+        self.assertEqual(
+            DevcontainerMerge().merge_dicts(base, updates),
+            AppendListMerge().merge_dicts(copy.deepcopy(base), updates),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+from unittest import mock
+import argparse
+import unittest
+
+from devc.core.exceptions.devc_exceptions import EnvironmentValidationError
+from devc.utils.validators.core import (
+    validate_byte_size,
+    validate_cpuset,
+    validate_tmpfs,
+    validate_ulimit,
+)
+from devc_cli_plugin_system.plugin_extensions import PluginExtensionContext
+from devc_plugins.plugin_extensions.dev_json_extensions import DevJsonExtensionManager
+from devc_plugins.plugin_extensions.dev_json_extensions import perf_extension
+from devc_plugins.plugin_extensions.dev_json_extensions.perf_extension import PerfExtension
+
+GiB = 1024**3
+
+
+class TestPerfValidators(unittest.TestCase):
+    def test_byte_size(self) -> None:
+        self.assertEqual(validate_byte_size("2g"), 2 * GiB)
+        self.assertEqual(validate_byte_size("1.5G"), 1536 * 1024**2)
+        self.assertEqual(validate_byte_size("512mb"), 512 * 1024**2)
+        self.assertEqual(validate_byte_size("100"), 100)
+        for value in ("", "g", "-1g", "2x", "0"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                validate_byte_size(value)
+
+    def test_cpuset(self) -> None:
+        self.assertEqual(validate_cpuset("4,0-2,1"), (0, 1, 2, 4))
+        for value in ("", "a", "3-1", "-1"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                validate_cpuset(value)
+
+    def test_ulimit_and_tmpfs(self) -> None:
+        self.assertEqual(validate_ulimit("nofile= 1024:524288"), "nofile=1024:524288")
+        self.assertEqual(validate_ulimit("memlock=-1:-1"), "memlock=-1:-1")
+        for value in ("nofile", "files=1", "nofile=2:1", "nofile=a", "nofile=1:2:3"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                validate_ulimit(value)
+        self.assertEqual(validate_tmpfs("/tmp:size=1g,mode=1777"), "/tmp:size=1g,mode=1777")
+        with self.assertRaises(ValueError):
+            validate_tmpfs("tmp")
+        with self.assertRaises(ValueError):
+            validate_tmpfs("/tmp:size=big")
+
+
+class TestPerfExtension(unittest.TestCase):
+    def setUp(self) -> None:
+        self.extension = PerfExtension()
+        parser = argparse.ArgumentParser()
+        self.extension.register_arguments_to_parser(parser, defaults={})
+        self.parser = parser
+        patch = mock.patch.object(
+            perf_extension, "_get_available_resources", return_value=(8, 16 * GiB)
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def _updates(self, *argv: str) -> dict:
+        context = PluginExtensionContext()
+        context.add_available_plugin_extension(self.extension)
+        args = self.parser.parse_args(argv)
+        return DevJsonExtensionManager(context, args).get_combined_updates()
+
+    def test_run_args(self) -> None:
+        updates = self._updates(
+            "--shm-size=2048m",
+            "--ulimit=nofile=1024:524288",
+            "--tmpfs=/tmp",
+            "--cpus=1.5",
+            "--cpuset-cpus=0-3,5",
+            "--memory=8g",
+        )
+
+        self.assertEqual(
+            updates["runArgs"],
+            [
+                "--shm-size=2g",
+                "--ulimit=nofile=1024:524288",
+                "--tmpfs=/tmp",
+                "--cpus=1.5",
+                "--cpuset-cpus=0-3,5",
+                "--memory=8g",
+            ],
+        )
+        self.assertEqual(self._updates(), {})
+
+    def test_values_are_validated_against_the_host(self) -> None:
+        for argv in (
+            ["--cpus=9"],
+            ["--cpuset-cpus=8"],
+            ["--memory=17g"],
+            ["--memory=1m"],
+            ["--shm-size=4g", "--memory=2g"],
+            ["--shm-size=1g", "--ipc-host"],
+        ):
+            with self.subTest(argv=argv), self.assertRaises(EnvironmentValidationError):
+                self._updates(*argv)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+from pathlib import Path
+from typing import Any
+import json
+import tempfile
+import unittest
+
+from devc.core.build_service import BuildRequest, BuildResult
+from devc.core.exceptions.build_exceptions import PrebuildError
+from devc.core.prebuild_service import PREBUILD_LABEL, PrebuildService, get_content_hash
+
+
+class FakeClient:
+    def __init__(self, images: list[dict[str, Any]]) -> None:
+        self.images_by_label = images
+        self.tagged: list[tuple[str, str, str]] = []
+
+    def images(self, filters: dict[str, str]) -> list[dict[str, Any]]:
+        return [
+            image
+            for image in self.images_by_label
+            if f"{PREBUILD_LABEL}={image['Labels'][PREBUILD_LABEL]}" == filters["label"]
+        ]
+
+    def tag(self, image: str, repository: str, tag: str) -> None:
+        self.tagged.append((image, repository, tag))
+
+
+class FakeBuildService:
+    def __init__(self) -> None:
+        self.requests: list[BuildRequest] = []
+
+    def build(self, request: BuildRequest) -> BuildResult:
+        self.requests.append(request)
+        return BuildResult(backend="sdk", image_id="sha256:built", steps=[], duration=1.0)
+
+
+class TestPrebuildService(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = Path(tmp_dir.name)
+        (self.root / ".devcontainer").mkdir()
+        (self.root / ".devcontainer" / "Dockerfile").write_text("FROM ubuntu:24.04\n")
+        self.devcontainer = self.root / ".devcontainer" / "devcontainer.json"
+        self._write({"build": {"dockerfile": "Dockerfile", "context": "..", "args": {"A": "1"}}})
+
+    def _write(self, data: dict[str, Any]) -> None:
+        self.devcontainer.write_text(json.dumps(data))
+
+    def _prebuild(self, client: FakeClient, **kwargs: Any) -> tuple[Any, FakeBuildService]:
+        build_service = FakeBuildService()
+        service = PrebuildService(build_service, client_factory=lambda: client)  # type: ignore
+        return service.prebuild(self.devcontainer, **kwargs), build_service
+
+    def test_builds_missing_image_and_adds_cache_source(self) -> None:
+        result, build_service = self._prebuild(FakeClient([]))
+
+        self.assertIsNotNone(result.build)
+        request = build_service.requests[0]
+        self.assertEqual(request.dockerfile, self.root / ".devcontainer" / "Dockerfile")
+        self.assertEqual(request.context, self.root)
+        self.assertEqual(request.build_args, {"A": "1"})
+        self.assertEqual(request.labels, {PREBUILD_LABEL: result.content_hash})
+        # BuildKit only uses images with cache metadata as cache source
+        self.assertEqual(request.cache_to, ["type=inline"])
+        data = json.loads(self.devcontainer.read_text())
+        self.assertEqual(data["build"]["cacheFrom"], [result.tag])
+
+    def test_rejects_sdk_backend_for_cache_source(self) -> None:
+        with self.assertRaises(PrebuildError):
+            self._prebuild(FakeClient([]), backend="sdk")
+
+        result, build_service = self._prebuild(FakeClient([]), backend="sdk", reference="image")
+        self.assertEqual(build_service.requests[0].cache_to, [])
+
+    def test_reuses_image_with_same_content_hash(self) -> None:
+        content_hash = get_content_hash("FROM ubuntu:24.04\n", "", {"A": "1"})
+        client = FakeClient(
+            [{"Id": "sha256:old", "RepoTags": [], "Labels": {PREBUILD_LABEL: content_hash}}]
+        )
+
+        result, build_service = self._prebuild(client, reference="image")
+
+        self.assertIsNone(result.build)
+        self.assertEqual(build_service.requests, [])
+        self.assertEqual(client.tagged, [("sha256:old", "devc-prebuilt", content_hash[:16])])
+        data = json.loads(self.devcontainer.read_text())
+        self.assertEqual(data, {"image": result.tag})
+
+    def test_content_hash_changes_with_build_args(self) -> None:
+        first, _ = self._prebuild(FakeClient([]))
+        second, _ = self._prebuild(FakeClient([]), build_args={"A": "2"})
+
+        self.assertNotEqual(first.content_hash, second.content_hash)
+        # the cache source of the previous prebuild is replaced
+        data = json.loads(self.devcontainer.read_text())
+        self.assertEqual(data["build"]["cacheFrom"], [second.tag])
+
+    def test_content_hash_covers_copied_context_files(self) -> None:
+        (self.root / ".devcontainer" / "Dockerfile").write_text(
+            "FROM ubuntu:24.04\nCOPY requirements.txt /tmp/\n"
+        )
+        (self.root / ".dockerignore").write_text("build\n")
+        (self.root / "build").mkdir()
+        (self.root / "build" / "log").write_text("1")
+        (self.root / "requirements.txt").write_text("numpy\n")
+        first, _ = self._prebuild(FakeClient([]))
+
+        # ignored files are not sent to the daemon
+        (self.root / "build" / "log").write_text("2")
+        second, _ = self._prebuild(FakeClient([]))
+        self.assertEqual(first.content_hash, second.content_hash)
+
+        (self.root / "requirements.txt").write_text("numpy\nscipy\n")
+        third, _ = self._prebuild(FakeClient([]))
+        self.assertNotEqual(first.content_hash, third.content_hash)
+
+    def test_keeps_comments_of_devcontainer(self) -> None:
+        self.devcontainer.write_text(
+            '{\n    // built by devc prebuild\n    "build": {"dockerfile": "Dockerfile",},\n}'
+        )
+
+        self._prebuild(FakeClient([]))
+
+        text = self.devcontainer.read_text()
+        self.assertIn('    // built by devc prebuild\n    "build": {', text)
+
+    def test_rejects_devcontainer_without_build(self) -> None:
+        self._write({"image": "ubuntu:24.04"})
+
+        with self.assertRaises(PrebuildError):
+            self._prebuild(FakeClient([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+from pathlib import Path
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+from devc.utils import profiling
+
+
+class TestProfiling(unittest.TestCase):
+    def test_spans_are_only_recorded_if_enabled(self) -> None:
+        with mock.patch.object(profiling, "_profiler", None):
+            with profiling.span("disabled"):
+                pass
+            self.assertIsNone(profiling.get_profiler())
+
+            profiler = profiling.enable_profiling()
+            with profiling.span("outer"):
+                with profiling.span("inner"):
+                    pass
+
+        self.assertEqual([(s.name, s.depth) for s in profiler.spans], [("inner", 1), ("outer", 0)])
+        self.assertGreaterEqual(profiler.spans[1].duration, profiler.spans[0].duration)
+
+    def test_trace_report(self) -> None:
+        profiler = profiling.Profiler()
+        with profiler.span("outer"), profiler.span("inner"):
+            pass
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = Path(tmp_dir, "trace.json")
+            profiler.report("trace", str(output))
+            events = json.loads(output.read_text())["traceEvents"]
+
+        self.assertEqual([e["name"] for e in events], ["outer", "inner"])
+        self.assertTrue(all(e["ph"] == "X" for e in events))
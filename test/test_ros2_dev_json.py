@@ -0,0 +1,54 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+import argparse
+import unittest
+
+from devc_plugins.plugins.ros2.ros2_dev_json import Ros2DevJsonPlugin
+
+
+class TestRos2ArtifactMounts(unittest.TestCase):
+    def _get_mounts(self, **kwargs: bool) -> dict:
+        args = argparse.Namespace(**{"artifact_volumes": False, "log_tmpfs": False, **kwargs})
+        return Ros2DevJsonPlugin()._get_artifact_mounts(args)
+
+    def test_artifact_volumes_are_keyed_per_workspace(self) -> None:
+        updates = self._get_mounts(artifact_volumes=True, log_tmpfs=True)
+
+        workspace = Ros2DevJsonPlugin.WORKSPACE_FOLDER
+        self.assertEqual(
+            updates["mounts"],
+            [
+                f"source=devc-${{devcontainerId}}-build,target={workspace}/build,type=volume",
+                f"source=devc-${{devcontainerId}}-install,target={workspace}/install,type=volume",
+                f"target={workspace}/log,type=tmpfs",
+            ],
+        )
+        self.assertEqual(
+            updates["postCreateCommand"],
+            {
+                "artifact-volumes": "sudo chown $(id -u):$(id -g) "
+                f"{workspace}/build {workspace}/install"
+            },
+        )
+
+    def test_no_mounts_by_default(self) -> None:
+        self.assertEqual(self._get_mounts(), {})
+        self.assertNotIn("postCreateCommand", self._get_mounts(log_tmpfs=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
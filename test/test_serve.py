@@ -0,0 +1,124 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+from pathlib import Path
+from unittest import mock
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from devc.core.exceptions.serve_exceptions import ServeError, ServeRequestError
+from devc.core.serve_client import forward_to_server
+from devc.core.serve_service import ServeRequest, ServeService
+from devc.utils.forwarding import NO_SERVER_ENV
+
+CLIENT = (
+    "import sys; from pathlib import Path; "
+    "from devc.core.serve_client import forward_to_server; "
+    "print(forward_to_server(sys.argv[2:], socket_path=Path(sys.argv[1])))"
+)
+
+
+def write_argv(argv: list[str]) -> int:
+    """Record the command line in the working directory of the request."""
+    Path("argv.json").write_text(json.dumps(argv))
+    return 3
+
+
+class TestServeRequest(unittest.TestCase):
+    def test_plugin_is_inserted_after_the_command(self) -> None:
+        request = ServeRequest.from_json(
+            {"command": "dev-json", "plugin": "ros2", "argv": ["--gpu"], "cwd": "/tmp"}
+        )
+
+        self.assertEqual(request.to_argv(), ["dev-json", "ros2", "--gpu"])
+        self.assertIsNone(request.env)
+
+    def test_invalid_requests_are_rejected(self) -> None:
+        data: object
+        for data in (
+            [],
+            {"command": "dev-json", "cwd": "relative"},
+            {"command": "serve", "cwd": "/tmp"},
+            {"command": "dev-json", "cwd": "/tmp", "argv": "--gpu"},
+            {"command": "dev-json", "cwd": "/tmp", "env": {"A": 1}},
+        ):
+            with self.subTest(data=data), self.assertRaises(ServeRequestError):
+                ServeRequest.from_json(data)
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "devc serve forks a process per request")
+class TestServeService(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = Path(tmp_dir.name)
+        self.socket_path = self.root / "devc.sock"
+        self.fingerprint = "a"
+        self.service = ServeService(
+            self.socket_path, runner=write_argv, fingerprint=lambda: self.fingerprint
+        )
+        self.server = self.service.bind()
+        self.addCleanup(self.service.close)
+
+    def _forward(self, *argv: str) -> str:
+        client = subprocess.Popen(
+            [sys.executable, "-c", CLIENT, str(self.socket_path), *argv],
+            cwd=self.root,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.server.handle_request()
+        output, _ = client.communicate(timeout=30)
+        return output.strip()
+
+    def test_request_runs_in_the_working_directory_of_the_client(self) -> None:
+        self.assertEqual(oct(self.socket_path.stat().st_mode & 0o777), "0o600")
+
+        self.assertEqual(self._forward("dev-json", "ros2", "--gpu"), "3")
+
+        argv = json.loads((self.root / "argv.json").read_text())
+        self.assertEqual(argv, ["dev-json", "ros2", "--gpu"])
+
+    def test_client_falls_back_while_reloading(self) -> None:
+        self.fingerprint = "b"
+
+        self.assertEqual(self._forward("dev-json", "ros2"), "None")
+
+        self.assertTrue(self.service.reload_requested)
+        self.assertFalse((self.root / "argv.json").exists())
+
+    def test_second_daemon_is_rejected(self) -> None:
+        with self.assertRaises(ServeError):
+            ServeService(self.socket_path, fingerprint=lambda: "a").bind()
+
+
+class TestServeClient(unittest.TestCase):
+    def test_runs_in_process_without_daemon(self) -> None:
+        missing = Path(tempfile.gettempdir(), "devc-test-missing.sock")
+
+        self.assertIsNone(forward_to_server(["dev-json", "ros2"], socket_path=missing))
+        with mock.patch.dict(os.environ, {NO_SERVER_ENV: "1"}):
+            self.assertIsNone(forward_to_server(["dev-json"], socket_path=Path(__file__)))
+        self.assertIsNone(forward_to_server(["serve"], socket_path=Path(__file__)))
+        self.assertIsNone(forward_to_server(["--log-level", "DEBUG"], socket_path=Path(__file__)))
+
+
+if __name__ == "__main__":
+    unittest.main()
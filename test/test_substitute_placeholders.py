@@ -0,0 +1,69 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+from dataclasses import dataclass, field
+import unittest
+
+from devc.utils.substitute_placeholders import PlaceholderSubstitution, substitute_placeholders
+
+
+@dataclass
+class Content:
+    image: str = "ros:${ROS_DISTRO}"
+    commands: list[str] = field(
+        default_factory=lambda: ["source /opt/ros/${ROS_DISTRO}/setup.bash", "echo $$HOME"]
+    )
+    packages: list[str] = field(default_factory=lambda: ["git", "curl"])
+    options: dict[str, str] = field(default_factory=lambda: {"version": "$VERSION"})
+
+
+class TestSubstitutePlaceholders(unittest.TestCase):
+    def test_dataclasses_are_updated_in_place(self) -> None:
+        content = Content()
+
+        result = substitute_placeholders(content, {"ROS_DISTRO": "jazzy"})
+
+        self.assertIs(result, content)
+        self.assertEqual(content.image, "ros:jazzy")
+        self.assertEqual(content.commands, ["source /opt/ros/jazzy/setup.bash", "echo $HOME"])
+        self.assertEqual(content.options, {"version": "$VERSION"})
+        self.assertEqual(substitute_placeholders(["${A}", 1], {"A": "a"}), ["a", 1])
+
+    def test_substitute_many_copies_changed_values_only(self) -> None:
+        content = Content()
+        substitution = PlaceholderSubstitution(content)
+
+        jazzy, humble = substitution.substitute_many(
+            [{"ROS_DISTRO": "jazzy"}, {"ROS_DISTRO": "humble", "VERSION": "1"}]
+        )
+
+        self.assertEqual(content, Content())
+        self.assertEqual(jazzy.image, "ros:jazzy")
+        self.assertEqual(humble.image, "ros:humble")
+        self.assertEqual(humble.options, {"version": "1"})
+        self.assertIs(jazzy.packages, content.packages)
+        self.assertIsNot(jazzy.commands, content.commands)
+
+    def test_structure_without_placeholders_is_returned(self) -> None:
+        data = {"commands": ["apt-get update"], "count": 2}
+        substitution = PlaceholderSubstitution(data)
+
+        self.assertFalse(substitution.has_placeholders)
+        self.assertIs(substitution.substitute({"A": "a"}), data)
+
+
+if __name__ == "__main__":
+    unittest.main()
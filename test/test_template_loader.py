@@ -0,0 +1,129 @@
+# Copyright Manuel Muth
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Author: Manuel Muth
+
+from pathlib import Path
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from devc.core.template_bundle import compile_template_bundle
+from devc.core.template_loader import (
+    get_default_template_loader,
+    get_template_bytecode_cache,
+    TemplateLoader,
+)
+
+
+class TestTemplateLoader(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp = Path(tmp_dir.name)
+        self.template_dir = self.tmp / "templates"
+        self.template_dir.mkdir()
+        (self.template_dir / "hello.j2").write_text("Hello {{ name | required('name') }}!")
+        self.bundle = self.tmp / "bundle.zip"
+        compile_template_bundle(TemplateLoader(self.template_dir).env, self.bundle)
+
+    def test_unchanged_template_is_loaded_from_bundle(self) -> None:
+        loader = TemplateLoader(self.template_dir, precompiled=self.bundle)
+        template = loader.load_template("hello.j2")
+
+        self.assertTrue(str(template.filename).startswith(str(self.bundle)))
+        self.assertEqual(template.render(name="devc"), "Hello devc!")
+
+    def test_changed_template_is_compiled_from_source(self) -> None:
+        (self.template_dir / "hello.j2").write_text("Hi {{ name }}!")
+        loader = TemplateLoader(self.template_dir, precompiled=self.bundle)
+        template = loader.load_template("hello.j2")
+
+        self.assertEqual(template.filename, str(self.template_dir / "hello.j2"))
+        self.assertEqual(template.render(name="devc"), "Hi devc!")
+
+    def test_bytecode_cache_is_stored_in_cache_dir(self) -> None:
+        cache_dir = self.tmp / "cache"
+        with mock.patch.dict(os.environ, {"DEVC_CACHE_DIR": str(cache_dir), "DEVC_NO_CACHE": ""}):
+            bytecode_cache = get_template_bytecode_cache()
+        loader = TemplateLoader(self.template_dir, bytecode_cache=bytecode_cache)
+        loader.load_template("hello.j2")
+
+        cached_files = list(cache_dir.glob("jinja2-*/*.cache"))
+        self.assertEqual(len(cached_files), 1)
+        # a new loader renders from the cached bytecode
+        template = TemplateLoader(self.template_dir, bytecode_cache=bytecode_cache).load_template(
+            "hello.j2"
+        )
+        self.assertEqual(template.render(name="devc"), "Hello devc!")
+
+    def test_bytecode_cache_can_be_disabled(self) -> None:
+        with mock.patch.dict(os.environ, {"DEVC_NO_CACHE": "1"}):
+            self.assertIsNone(get_template_bytecode_cache())
+
+
+class TestDockerfileTemplate(unittest.TestCase):
+    def render(self, **predefs: object) -> list[str]:
+        context = {
+            "image": "ubuntu",
+            "pre_package_install": [],
+            "additional_apt_packages": [],
+            "apt_packages": ["curl"],
+            "extra_apt_packages": [],
+            "post_package_install": ["RUN install-engine"],
+            "additional_sudo_commands": [],
+            "additional_user_commands": [],
+            "buildkit_cache": False,
+            "multi_stage": False,
+        }
+        context.update(predefs)
+        template = get_default_template_loader().load_template("Dockerfile.j2")
+        return template.render(**context).splitlines()
+
+    def test_multi_stage_moves_the_user_setup_to_the_final_stage(self) -> None:
+        lines = self.render(multi_stage=True)
+
+        self.assertEqual(
+            [line for line in lines if line.startswith("FROM")],
+            [
+                "FROM ubuntu AS base",
+                "FROM base",
+            ],
+        )
+        final_stage = lines.index("FROM base")
+        self.assertLess(lines.index("RUN install-engine"), final_stage)
+        self.assertGreater(lines.index("ARG USER_NAME"), final_stage)
+        self.assertGreater(lines.index("ENV PATH=$PATH:/home/$USER/.local/bin"), final_stage)
+        # ARGs are reset by FROM
+        self.assertEqual(lines.count("ARG DEBIAN_FRONTEND=noninteractive"), 2)
+
+    def test_single_stage_by_default(self) -> None:
+        lines = self.render()
+
+        self.assertEqual([line for line in lines if line.startswith("FROM")], ["FROM ubuntu"])
+        self.assertLess(lines.index("ARG USER_NAME"), lines.index("RUN install-engine"))
+
+    def test_buildkit_syntax_directive_is_the_first_line(self) -> None:
+        lines = self.render(buildkit_cache=True)
+
+        # docker ignores parser directives after the first line
+        self.assertEqual(lines[0], "# syntax=docker/dockerfile:1")
+        self.assertNotEqual(self.render()[0], "# syntax=docker/dockerfile:1")
+        # the whitespace control of the keep-cache block must not join it to the timezone RUN
+        timezone = next(line for line in lines if "/etc/localtime" in line)
+        self.assertTrue(timezone.endswith("/etc/timezone"))
+        self.assertIn(
+            "# Packages - Keep downloaded packages, they are cached between builds", lines
+        )